@@ -1,57 +1,130 @@
-import streamlit as st
-import pandas as pd
-import joblib
-import os
-from datetime import datetime
+import startup
+
+with startup.phase('imports'):
+    import streamlit as st
+    import pandas as pd
+    import os
+    from datetime import datetime
+
+    import artifacts
+    import calibration
+    import columnar
+    import exports
+    import history_store
+    import ingest
+    import metrics
+    import model_watcher
+    import scoring
+    import shadow
+    import table_view
 
 # Konfigurasi Awal
 st.set_page_config(page_title="Prediksi Hiring Kandidat", page_icon="💼", layout="wide")
 
 # --- KONFIGURASI MODEL & FILE ---
-MODEL_PATH = 'random_forest_model.pkl'
-SCALER_PATH = 'scaler.pkl'
-FEATURES_PATH = 'feature_names.pkl'
-HISTORY_FILE = 'riwayat_prediksi.csv'
+PIPELINE_PATH = artifacts.PIPELINE_PATH
+MODEL_PATH = artifacts.MODEL_PATH
+SCALER_PATH = artifacts.SCALER_PATH
+FEATURES_PATH = artifacts.FEATURES_PATH
+HISTORY_DB = history_store.HISTORY_DB
+HISTORY_FILE = 'riwayat_prediksi.csv'  # riwayat CSV lama, diimpor sekali ke HISTORY_DB
+REGISTRY_DIR = shadow.REGISTRY_DIR  # model shadow: python registry.py shadow <nama>...
+HISTORY_PAGE_SIZE = 50
+DEFAULT_SHORTLIST_K = 200  # mode shortlist CSV: jumlah kandidat teratas
+METRICS_PORT = int(os.environ.get('METRICS_PORT', metrics.DEFAULT_PORT))  # 0 = nonaktif
+# DECISION_TABLE=1: scoring grid input manual sekali saat model dimuat (lihat decision_table.py)
+BUILD_DECISION_TABLE = os.environ.get('DECISION_TABLE') == '1'
+
+# Variabel what-if -> nilai yang dicoba (sesuai grid tabel keputusan)
+WHAT_IF_VALUES = {
+    'SkillScore': [i / 2 for i in range(21)],
+    'InterviewScore': [i / 2 for i in range(21)],
+    'PersonalityScore': [i / 2 for i in range(21)],
+    'ExperienceYears': list(range(21)),
+}
 
-# Fungsi untuk memuat model dan komponen
+# Label UI -> urutan query di history_store
+HISTORY_SORTS = {"Terbaru": 'newest', "Total Skor": 'total_score', "Kelayakan": 'eligibility'}
+
+# Fungsi untuk memuat model dan komponen (sekali per proses, dibagi antar sesi).
+# Watcher memuat artefak di thread latar (halaman dirender tanpa menunggu) dan
+# memuat ulang saat retrain.py menulis versi baru.
 @st.cache_resource
 def load_components():
+    return model_watcher.ModelWatcher(PIPELINE_PATH, model_path=MODEL_PATH,
+                                      scaler_path=SCALER_PATH, features_path=FEATURES_PATH,
+                                      build_table=BUILD_DECISION_TABLE)
+
+def get_bundle():
+    # Bundle aktif; hanya menunggu jika muat awal belum selesai (cold start)
     try:
-        model = joblib.load(MODEL_PATH)
-        scaler = joblib.load(SCALER_PATH)
-        feature_names = joblib.load(FEATURES_PATH)
-        return model, scaler, feature_names
+        return load_components().bundle
     except Exception as e:
         st.error(f"Gagal memuat komponen model: {e}")
         st.stop()
 
-model, scaler, feature_names = load_components()
+load_components()
+
+# Endpoint Prometheus /metrics lokal (sekali per proses)
+@st.cache_resource
+def start_metrics_server():
+    if not METRICS_PORT:
+        return None
+    try:
+        return metrics.serve(METRICS_PORT)
+    except OSError:
+        # Port sudah dipakai (mis. proses lain); metrics tetap tampil di panel admin
+        return None
+
+metrics_server = start_metrics_server()
+
+# Model shadow dari registry men-scoring batch yang sama di thread latar
+# (sekali per proses); hasil yang ditampilkan tetap dari model live
+@st.cache_resource
+def start_shadow_scoring():
+    return shadow.start_from_registry(REGISTRY_DIR)
+
+shadow_scorer = start_shadow_scoring()
+
+# File hasil streaming sisa proses sebelumnya (sesi aktif menghapus miliknya sendiri)
+@st.cache_resource
+def clean_stream_outputs():
+    return exports.remove_stale_files()
+
+clean_stream_outputs()
+
+# Payload unduhan (CSV/Parquet) dibuat saat tombol diklik, sekali per set hasil
+@st.cache_resource
+def get_export_cache():
+    return exports.ExportCache()
 
 # Fungsi untuk manajemen riwayat
+@st.cache_resource
+def get_history_store():
+    return history_store.HistoryStore(HISTORY_DB, legacy_csv=HISTORY_FILE)
+
 def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try:
-            history = pd.read_csv(HISTORY_FILE)
-            # Konversi ke dictionary dan pastikan CandidateName ada
-            history['CandidateName'] = history.get('CandidateName', 'Unknown')
-            return history.to_dict('records')
-        except Exception as e:
-            st.error(f"Error loading history: {e}")
-            return []
-    return []
+    # Seluruh riwayat sebagai frame bersama antar sesi (hanya dimuat saat ekspor diklik)
+    with metrics.timed('history_load') as timer:
+        frame = get_history_store().frame()
+        timer.rows = len(frame)
+    return frame
 
-def save_history(history):
+def save_history(records):
+    # Append record baru saja (list dict atau DataFrame), tidak menulis ulang seluruh riwayat
     try:
-        history_df = pd.DataFrame(history)
-        os.makedirs(os.path.dirname(HISTORY_FILE) or '.', exist_ok=True)
-        history_df.to_csv(HISTORY_FILE, index=False)
+        with metrics.timed('history_append') as timer:
+            timer.rows = get_history_store().append(records)
     except Exception as e:
         st.error(f"Gagal menyimpan riwayat: {e}")
 
-# Inisialisasi session state
-if 'history' not in st.session_state:
-    st.session_state.history = load_history()
+def clear_history():
+    try:
+        get_history_store().clear()
+    except Exception as e:
+        st.error(f"Gagal menghapus riwayat: {e}")
 
+# Inisialisasi session state
 if 'show_history' not in st.session_state:
     st.session_state.show_history = False
 
@@ -85,6 +158,26 @@ with st.sidebar:
     st.markdown("- Nama (name/nama/CandidateName)")
     st.markdown("- SkillScore, InterviewScore")
     st.markdown("- PersonalityScore, ExperienceYears")
+    
+    st.divider()
+    if st.checkbox("📊 Panel Admin (metrics)"):
+        stage_stats, cache_stats = metrics.snapshot()
+        watcher = load_components()
+        st.caption(f"Model: {watcher.version or 'memuat...'} "
+                   f"| reload: {watcher.reloads}")
+        if metrics_server is not None:
+            st.caption(f"Prometheus: http://127.0.0.1:{metrics_server.server_port}/metrics")
+        if stage_stats:
+            st.dataframe(pd.DataFrame.from_dict(stage_stats, orient='index').round(2))
+        for name, stats in cache_stats.items():
+            st.caption(f"Cache {name}: {stats['hit_rate']:.0%} hit "
+                       f"({stats['hits']}/{stats['hits'] + stats['misses']})")
+        if shadow_scorer.bundles:
+            st.caption(f"Shadow vs live ({shadow_scorer.dropped} batch dilewati)")
+            st.dataframe(pd.DataFrame.from_dict(shadow_scorer.snapshot(), orient='index')
+                         .drop(columns='last_error').round(3))
+        if shadow_scorer.last_error:
+            st.caption(f"Gagal memuat model shadow: {shadow_scorer.last_error}")
 
 # ======================== INPUT MANUAL ========================
 if mode == "Input Manual":
@@ -119,6 +212,8 @@ if mode == "Input Manual":
         personality_score = st.slider("🤝 Skor Kepribadian (0-10)*", 0.0, 10.0, 8.0)
         experience_years = st.slider("🗓️ Pengalaman (tahun)*", 0, 20, 3)
     
+    startup.mark('first_render')
+    
     # Validasi input
     if not candidate_name:
         st.warning("⚠️ Harap isi nama kandidat")
@@ -131,108 +226,176 @@ if mode == "Input Manual":
         'ExperienceYears': experience_years,
         'InterviewScore': interview_score,
         'PersonalityScore': personality_score,
+        'EducationLevel': education_level,
+        'RecruitmentStrategy': recruitment_strategy,
         'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
-    
-    # Encoding variabel kategori
-    for level in ["1", "2", "3", "4"]:
-        input_data[f'EducationLevel_{level}'] = 1 if education_level == level else 0
-    
-    for strategy in ["1", "2", "3"]:
-        input_data[f'RecruitmentStrategy_{strategy}'] = 1 if recruitment_strategy == strategy else 0
-    
-    input_df = pd.DataFrame([input_data])
 
 # ======================== CSV MODE ========================
 else:
     st.subheader("📂 Upload CSV Data Kandidat")
-    uploaded_file = st.file_uploader("Pilih file CSV*", type=["csv"], accept_multiple_files=False)
+    uploaded_files = st.file_uploader("Pilih file CSV* (boleh beberapa file, .csv.gz, .zip, "
+                                      "Parquet, atau Arrow)",
+                                      type=ingest.UPLOAD_TYPES, accept_multiple_files=True)
+    stream_mode = st.checkbox("⚡ Mode streaming (file besar)",
+                              help="Scoring per chunk dan tulis hasil langsung ke file unduhan "
+                                   "tanpa memuat seluruh data ke memori")
+    shortlist_mode = st.checkbox("🏆 Mode shortlist (Top-K)",
+                                 help="Hanya K kandidat dengan probabilitas DITERIMA tertinggi "
+                                      "yang disimpan dan ditampilkan (tanpa mengurutkan seluruh file)")
+    if shortlist_mode:
+        shortlist_k = st.number_input("Jumlah kandidat (K)", min_value=1,
+                                      value=DEFAULT_SHORTLIST_K, step=10)
+    startup.mark('first_render')
+    # Mode streaming/shortlist membaca satu file (CSV, .csv.gz, Parquet, Arrow) per chunk
+    uploaded_file = None
+    if uploaded_files:
+        bundle = get_bundle()
+        if stream_mode or shortlist_mode:
+            if len(uploaded_files) > 1 or uploaded_files[0].name.lower().endswith('.zip'):
+                st.warning("⚠️ Mode streaming/shortlist hanya untuk satu file; "
+                           "nonaktifkan mode tersebut untuk menggabungkan banyak file")
+                st.stop()
+            uploaded_file = uploaded_files[0]
+            compression = 'gzip' if uploaded_file.name.lower().endswith('.gz') else None
     
-    if uploaded_file is not None:
-        try:
-            # Baca file CSV
-            raw_df = pd.read_csv(uploaded_file)
-            
-            # Standarisasi nama kolom
-            column_mapping = {
-                'name': 'CandidateName',
-                'nama': 'CandidateName',
-                'Nama': 'CandidateName',
-                'nama_kandidat': 'CandidateName',
-                'NamaKandidat': 'CandidateName'
-            }
-            raw_df.rename(columns=column_mapping, inplace=True)
-            
-            # Cek kolom wajib
-            required_columns = ['SkillScore', 'InterviewScore', 'PersonalityScore', 'ExperienceYears']
-            missing_cols = [col for col in required_columns if col not in raw_df.columns]
-            
-            if missing_cols:
-                st.error(f"❌ Kolom wajib tidak ditemukan: {', '.join(missing_cols)}")
+    if uploaded_file is not None and shortlist_mode:
+        shortlist = st.session_state.get('shortlist_result')
+        shortlist_key = (uploaded_file.file_id, int(shortlist_k), bundle.fingerprint)
+        
+        if shortlist is None or shortlist['key'] != shortlist_key:
+            progress_bar = st.progress(0.0)
+            status = st.empty()
+            try:
+                uploaded_file.seek(0)
+                for progress in scoring.shortlist_csv_stream(uploaded_file, bundle, int(shortlist_k),
+                                                             compression=compression,
+                                                             name=uploaded_file.name):
+                    progress_bar.progress(min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0))
+                    status.text(f"{progress['rows']:,} baris | "
+                                f"{progress['rows_per_sec']:,.0f} baris/detik")
+            except Exception as e:
+                st.error(f"❌ Gagal memproses file: {str(e)}")
                 st.stop()
+            progress_bar.empty()
+            status.empty()
+            st.session_state.shortlist_result = shortlist = {
+                'key': shortlist_key,
+                'rows': progress['rows'],
+                'results': progress['results'],
+            }
+        
+        # Hanya K baris yang diteruskan ke tampilan, unduhan, dan riwayat
+        results_df = shortlist['results']
+        results_key = ('shortlist',) + shortlist_key
+        st.success(f"✅ Berhasil memproses {shortlist['rows']:,} kandidat, "
+                   f"menampilkan {len(results_df):,} teratas")
+    
+    elif uploaded_file is not None and stream_mode:
+        stream = st.session_state.get('stream_result')
+        
+        if stream is None or stream['file_id'] != uploaded_file.file_id:
+            if st.button("▶️ Mulai Scoring Streaming"):
+                # Hapus file hasil streaming sebelumnya
+                if stream is not None:
+                    stream['file'].remove()
+                
+                progress_bar = st.progress(0.0)
+                status = st.empty()
+                # File hasil dihapus bersama sesi (lihat exports.SessionFile)
+                output_file = exports.SessionFile('.csv')
+                output = open(output_file.path, 'w', newline='')
+                progress, preview_df = {'rows': 0, 'rows_per_sec': 0.0}, None
+                try:
+                    with output:
+                        for progress in scoring.score_csv_stream(uploaded_file, output, bundle,
+                                                                 compression=compression,
+                                                                 name=uploaded_file.name):
+                            if progress['preview'] is not None:
+                                preview_df = progress['preview'].head(100)
+                            progress_bar.progress(min(uploaded_file.tell() / max(uploaded_file.size, 1), 1.0))
+                            status.text(f"{progress['rows']:,} baris | "
+                                        f"{progress['rows_per_sec']:,.0f} baris/detik")
+                except Exception as e:
+                    output_file.remove()
+                    st.error(f"❌ Gagal memproses file: {str(e)}")
+                    st.stop()
+                if progress['rows'] == 0:
+                    # Header valid tanpa baris data: tidak ada hasil maupun pratinjau
+                    output_file.remove()
+                    st.error(f"❌ Gagal memproses file {uploaded_file.name}: "
+                             f"{ingest.EMPTY_FILE_MESSAGE}")
+                    st.stop()
+                
+                progress_bar.progress(1.0)
+                st.session_state.stream_result = stream = {
+                    'file_id': uploaded_file.file_id,
+                    'file': output_file,
+                    'path': output_file.path,
+                    'rows': progress['rows'],
+                    'rows_per_sec': progress['rows_per_sec'],
+                    'preview': preview_df,
+                }
+        
+        if stream is not None and stream['file_id'] == uploaded_file.file_id:
+            st.success(f"✅ Berhasil memproses {stream['rows']:,} kandidat "
+                       f"({stream['rows_per_sec']:,.0f} baris/detik)")
+            if stream['preview'] is not None:
+                st.caption("Pratinjau 100 baris pertama (urutan sesuai file input)")
+                table_view.render(stream['preview'], key='stream_preview')
             
-            # Handle kolom nama
-            if 'CandidateName' not in raw_df.columns:
-                raw_df['CandidateName'] = [f"Kandidat_{i+1}" for i in range(len(raw_df))]
-            
-            # Tambahkan timestamp
-            raw_df['Timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Handle kolom pendidikan
-            for level in ["1", "2", "3", "4"]:
-                if f'EducationLevel_{level}' not in raw_df.columns:
-                    raw_df[f'EducationLevel_{level}'] = 0
-            
-            # Handle kolom strategi rekrutmen
-            for strategy in ["1", "2", "3"]:
-                if f'RecruitmentStrategy_{strategy}' not in raw_df.columns:
-                    raw_df[f'RecruitmentStrategy_{strategy}'] = 0
-            
-            # Pastikan semua fitur model ada
-            for col in feature_names:
-                if col not in raw_df.columns and col != 'Timestamp':
-                    raw_df[col] = 0
-            
-            input_df = raw_df[feature_names + ['Timestamp', 'CandidateName']]
-            
-            st.success(f"✅ Berhasil memproses {len(input_df)} kandidat")
-            st.dataframe(input_df.head())
-            
+            # File hasil baru dibaca saat tombol diklik
+            st.download_button(
+                label="📥 Download Hasil Prediksi",
+                data=exports.file_downloader(stream['path']),
+                file_name="hasil_prediksi.csv",
+                mime="text/csv",
+                on_click="ignore"
+            )
+    
+    elif uploaded_files:
+        # Semua file di-parse paralel lalu di-scoring sekali; di-memo per isi file,
+        # rerun tidak men-scoring ulang
+        try:
+            combined_df, upload_errors = scoring.score_uploads(
+                [(f.name, f.getvalue()) for f in uploaded_files], bundle)
         except Exception as e:
             st.error(f"❌ Gagal memproses file: {str(e)}")
             st.stop()
+        
+        # File yang gagal dilaporkan satu per satu; file lain tetap diproses
+        for error in upload_errors:
+            st.error(f"❌ Gagal memproses file {error.name}: {error.message}")
+        if combined_df is None:
+            st.stop()
+        results_df = combined_df
+        results_key = ('uploads', tuple(f.file_id for f in uploaded_files), bundle.fingerprint)
+        st.success(f"✅ Berhasil memproses {len(results_df)} kandidat")
 
 # ======================== PROSES PREDIKSI ========================
-if 'input_df' in locals():
+if 'input_data' in locals() or 'results_df' in locals():
     st.markdown("---")
     st.subheader("🔍 Hasil Prediksi")
+    bundle = get_bundle()
     
     try:
-        # Pisahkan metadata dan fitur untuk scaling
-        if 'CandidateName' not in input_df.columns:
-            input_df['CandidateName'] = [f"Kandidat_{i+1}" for i in range(len(input_df))]
-        
-        metadata = input_df[['CandidateName', 'Timestamp']].copy()
-        features = input_df[scaler.feature_names_in_]
-        
-        # Scaling fitur
-        features_scaled = pd.DataFrame(scaler.transform(features), columns=features.columns)
-        
-        # Lakukan prediksi
-        predictions = model.predict(features_scaled)
-        
         # Mode Input Manual
         if mode == "Input Manual":
+            # Encoding + scaling + prediksi; input yang sama (dari sesi mana pun)
+            # diambil dari cache tanpa menyentuh model
+            result, proba = scoring.predict_cached(bundle, input_data)
+            probability = bundle.calibrate(proba[bundle.positive_index])
+            
             is_valid = st.checkbox("✅ Saya sudah memverifikasi data di atas benar")
             
             if st.button("🚀 Jalankan Prediksi", disabled=not is_valid):
-                result = predictions[0]
                 prediction_text = "DITERIMA" if result == 1 else "TIDAK DITERIMA"
                 color = "#4CAF50" if result == 1 else "#F44336"
                 
                 st.markdown(f"""
                 <div style='background-color:#E8F5E9; padding:15px; border-radius:10px; border-left:5px solid {color}'>
                     <h3 style='color:{color}; text-align:center'>Hasil Prediksi: <strong>{prediction_text}</strong></h3>
+                    <p style='text-align:center'>Probabilitas diterima: <strong>{probability:.2f}</strong></p>
                 </div>
                 """, unsafe_allow_html=True)
                 
@@ -255,65 +418,63 @@ if 'input_df' in locals():
                 }
                 
                 # Simpan ke riwayat
-                st.session_state.history.append(history_record)
-                save_history(st.session_state.history)
+                save_history([history_record])
                 st.success("✔️ Hasil prediksi telah disimpan")
+            
+            # Kurva probabilitas saat satu variabel diubah (input lain tetap)
+            if st.checkbox("🔎 Analisis What-if"):
+                what_if_col = st.selectbox("Variabel yang diubah", list(WHAT_IF_VALUES))
+                values, proba = scoring.what_if(bundle, input_data, what_if_col,
+                                                WHAT_IF_VALUES[what_if_col])
+                st.line_chart(pd.DataFrame({'Probabilitas DITERIMA': proba},
+                                           index=pd.Index(values, name=what_if_col)))
         
         # Mode CSV
         else:
-            # Gabungkan hasil prediksi dengan metadata
-            results_df = metadata.copy()
-            results_df['Prediction'] = ["DITERIMA" if p == 1 else "TIDAK DITERIMA" for p in predictions]
-            results_df['TotalScore'] = features[['SkillScore', 'InterviewScore', 
-                                              'PersonalityScore', 'ExperienceYears']].sum(axis=1)
-            
-            # Gabungkan dengan fitur asli jika diperlukan
-            results_df = pd.concat([results_df, features], axis=1)
-            
-            # Urutkan berdasarkan kelayakan
-            results_df = results_df.sort_values(by=['Prediction', 'TotalScore'], 
-                                              ascending=[False, False])
-            results_df.insert(0, 'No', range(1, len(results_df)+1))
+            # Tampilkan hasil (results_df sudah diurutkan oleh scoring.score_frame);
+            # hanya satu halaman yang diformat dan dikirim ke browser
+            with metrics.timed('styling') as timer:
+                timer.rows = len(table_view.render(results_df, key='results'))
             
-            # Tampilkan hasil
-            st.dataframe(results_df.style.applymap(
-                lambda x: 'color: green' if x == "DITERIMA" else 'color: red',
-                subset=['Prediction']
-            ))
+            # Jumlah kandidat lolos per threshold probabilitas (tanpa scoring ulang)
+            with st.expander("📈 Sweep threshold probabilitas"):
+                sweep = calibration.threshold_sweep(results_df['Probability'].to_numpy())
+                st.dataframe(sweep.rename(columns={'threshold': 'Threshold',
+                                                   'accepted': 'Jumlah lolos',
+                                                   'accepted_rate': 'Proporsi lolos'}),
+                             hide_index=True)
+                st.bar_chart(sweep.set_index('threshold')['accepted'])
             
             # Tombol aksi
             col1, col2 = st.columns(2)
             
             with col1:
+                # Diserialisasi saat diklik, sekali per set hasil (bukan setiap rerun)
+                export_cache = get_export_cache()
                 st.download_button(
                     label="📥 Download Hasil Prediksi",
-                    data=results_df.to_csv(index=False),
+                    data=exports.downloader(export_cache, results_key, 'csv', lambda: results_df),
                     file_name="hasil_prediksi.csv",
-                    mime="text/csv"
+                    mime=exports.MIME_TYPES['csv'],
+                    on_click="ignore"
                 )
+                if columnar.available():
+                    # Parquet bertipe (skema dari fitur model), jauh lebih kecil dari CSV
+                    st.download_button(
+                        label="📥 Download Hasil (Parquet)",
+                        data=exports.downloader(
+                            export_cache, results_key, 'parquet', lambda: results_df,
+                            lambda: columnar.results_schema(bundle.feature_names)),
+                        file_name="hasil_prediksi.parquet",
+                        mime=exports.MIME_TYPES['parquet'],
+                        on_click="ignore"
+                    )
             
             with col2:
                 if st.button("💾 Simpan Semua ke Riwayat"):
-                    # Format data untuk riwayat
-                    records_to_save = []
-                    for _, row in results_df.iterrows():
-                        record = {
-                            'CandidateName': row['CandidateName'],
-                            'Timestamp': row['Timestamp'],
-                            'Prediction': row['Prediction'],
-                            'TotalScore': row['TotalScore'],
-                            'SkillScore': row['SkillScore'],
-                            'InterviewScore': row['InterviewScore'],
-                            'PersonalityScore': row['PersonalityScore'],
-                            'ExperienceYears': row['ExperienceYears'],
-                            'EducationLevel': row.get('EducationLevel', None),
-                            'RecruitmentStrategy': row.get('RecruitmentStrategy', None)
-                        }
-                        records_to_save.append(record)
-                    
-                    st.session_state.history.extend(records_to_save)
-                    save_history(st.session_state.history)
-                    st.success(f"✔️ {len(records_to_save)} prediksi telah disimpan")
+                    # Kolom riwayat diproyeksikan langsung dari results_df (satu transaksi)
+                    save_history(results_df)
+                    st.success(f"✔️ {len(results_df)} prediksi telah disimpan")
     
     except Exception as e:
         st.error(f"❌ Terjadi kesalahan saat prediksi: {str(e)}")
@@ -323,79 +484,63 @@ if st.session_state.show_history:
     st.markdown("---")
     st.subheader("📜 Riwayat Prediksi")
     
-    if st.session_state.history:
-        history_df = pd.DataFrame(st.session_state.history)
-        
-        # Pastikan kolom yang diperlukan ada
-        if 'TotalScore' not in history_df.columns:
-            history_df['TotalScore'] = (
-                history_df.get('SkillScore', 0) + 
-                history_df.get('InterviewScore', 0) + 
-                history_df.get('PersonalityScore', 0) + 
-                history_df.get('ExperienceYears', 0)
-            )
-        
+    store = get_history_store()
+    
+    if store.count():
         # Filter UI
         st.markdown("### 🔍 Filter Riwayat")
         col1, col2 = st.columns(2)
         
         with col1:
             sort_by = st.selectbox("Urutkan berdasarkan", 
-                                 ["Terbaru", "Total Skor", "Kelayakan"])
+                                 list(HISTORY_SORTS))
         
         with col2:
             filter_by = st.selectbox("Tampilkan", 
                                    ["Semua", "DITERIMA", "TIDAK DITERIMA"])
         
-        # Apply filters
-        if filter_by == "DITERIMA":
-            history_df = history_df[history_df['Prediction'] == "DITERIMA"]
-        elif filter_by == "TIDAK DITERIMA":
-            history_df = history_df[history_df['Prediction'] == "TIDAK DITERIMA"]
-        
-        # Apply sorting
-        if sort_by == "Total Skor":
-            history_df = history_df.sort_values('TotalScore', ascending=False)
-        elif sort_by == "Kelayakan":
-            history_df = history_df.sort_values(['Prediction', 'TotalScore'], 
-                                             ascending=[False, False])
-        else:  # Terbaru
-            if 'Timestamp' in history_df.columns:
-                history_df = history_df.sort_values('Timestamp', ascending=False)
-            else:
-                history_df = history_df.sort_index(ascending=False)
-        
-        # Tampilkan data
-        history_df = history_df.reset_index(drop=True)
-        history_df.insert(0, 'No', range(1, len(history_df)+1))
+        # Filter, urut, dan paging (keyset) dikerjakan di store; hanya satu halaman
+        # yang diambil dan jumlah record di-cache per revisi riwayat
+        prediction_filter = None if filter_by == "Semua" else filter_by
         
         # Pilih kolom untuk ditampilkan
-        display_cols = ['No', 'CandidateName', 'Prediction', 'TotalScore']
-        if 'Timestamp' in history_df.columns:
-            display_cols.insert(1, 'Timestamp')
+        display_cols = ['CandidateName', 'Timestamp', 'Prediction', 'TotalScore']
+        history_df, offset = table_view.history_page(
+            store, 'history', prediction_filter, HISTORY_SORTS[sort_by],
+            page_size=HISTORY_PAGE_SIZE, columns=display_cols)
+        history_df.insert(0, 'No', range(offset + 1, offset + len(history_df) + 1))
         
-        # Tombol aksi
-        st.dataframe(
-            history_df[display_cols].style.applymap(
-                lambda x: 'color: green' if x == "DITERIMA" else 'color: red',
-                subset=['Prediction']
-            )
-        )
+        # Tampilkan data (penanda prediksi hanya untuk halaman ini)
+        with metrics.timed('styling', rows=len(history_df)):
+            table_view.render(history_df, key='history', page_size=HISTORY_PAGE_SIZE)
         
         col1, col2, col3 = st.columns([2, 1, 1])
         
         with col1:
+            # Seluruh riwayat dimuat dan diserialisasi hanya saat diklik; payload
+            # dipakai ulang sampai riwayat berubah (revisi store)
+            export_cache = get_export_cache()
+            history_key = ('history', HISTORY_DB, store.revision())
             st.download_button(
                 label="📤 Ekspor Riwayat Lengkap",
-                data=history_df.to_csv(index=False),
+                data=exports.downloader(export_cache, history_key, 'csv', load_history),
                 file_name="riwayat_prediksi_lengkap.csv",
-                mime="text/csv"
+                mime=exports.MIME_TYPES['csv'],
+                on_click="ignore"
             )
+            if columnar.available():
+                st.download_button(
+                    label="📥 Download Riwayat Lengkap (Parquet)",
+                    data=exports.downloader(export_cache, history_key, 'parquet', load_history,
+                                            columnar.history_schema),
+                    file_name="riwayat_prediksi_lengkap.parquet",
+                    mime=exports.MIME_TYPES['parquet'],
+                    on_click="ignore"
+                )
         
         with col3:
             if st.button("🗑️ Hapus Semua Riwayat", type="secondary"):
-                st.session_state.history = []
-                save_history(st.session_state.history)
+                clear_history()
                 st.rerun()
     
     else:
@@ -0,0 +1,206 @@
+"""Artefak model: satu Pipeline (encoder + StandardScaler + forest) berversi.
+
+retrain.py menyimpan ``hiring_pipeline.joblib`` di ``ARTIFACT_DIR`` (direktori
+yang sama yang dipantau ModelWatcher di aplikasi) tanpa kompresi sehingga
+array NumPy di dalamnya bisa dibuka dengan ``mmap_mode='r'``, ditambah
+``flat_forest.joblib`` (node forest dalam array datar, lihat flat_forest.py)
+dan opsional ``decision_table.joblib`` (grid input manual, lihat
+decision_table.py) serta ``calibration.joblib`` (lihat calibration.py).
+Jika artefak pipeline belum ada, loader memakai tiga pickle lama (model,
+scaler, fitur).
+"""
+import hashlib
+import os
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+from atomic import atomic_path
+from calibration import CALIBRATION_PATH, DECISION_THRESHOLD, Calibrator
+from decision_table import DECISION_TABLE_PATH, DecisionTable
+from flat_forest import FLAT_FOREST_PATH, MAX_FLAT_ROWS, FlatForest
+
+ARTIFACT_FORMAT = 1
+
+# Direktori artefak bersama: ditulis retrain.py/registry.py, dibaca dan dipantau aplikasi
+ARTIFACT_DIR = 'model'
+PIPELINE_FILE = 'hiring_pipeline.joblib'
+PIPELINE_PATH = os.path.join(ARTIFACT_DIR, PIPELINE_FILE)
+
+# Pickle lama di root repo (fallback jika artefak pipeline belum ada)
+MODEL_PATH = 'random_forest_model.pkl'
+SCALER_PATH = 'scaler.pkl'
+FEATURES_PATH = 'feature_names.pkl'
+
+
+class ModelBundle:
+    """Pipeline yang sudah dimuat beserta versi dan fingerprint-nya."""
+
+    def __init__(self, pipeline, version, fingerprint, source, flat_forest=None,
+                 decision_table=None, calibrator=None):
+        self.pipeline = pipeline
+        self.version = version
+        self.fingerprint = fingerprint
+        self.source = source
+        self.flat_forest = flat_forest
+        self.decision_table = decision_table
+        self.calibrator = calibrator
+
+    @property
+    def encoder(self):
+        return self.pipeline.named_steps['encoder']
+
+    @property
+    def scaler(self):
+        return self.pipeline.named_steps['scaler']
+
+    @property
+    def model(self):
+        return self.pipeline.named_steps['model']
+
+    @property
+    def feature_names(self):
+        return self.encoder.feature_names_out_
+
+    @property
+    def positive_index(self):
+        """Kolom kelas DITERIMA (1) di output ``predict_proba``."""
+        return int(np.flatnonzero(self.model.classes_ == 1)[0])
+
+    def _use_flat(self, X):
+        """Batch kecil memakai FlatForest, kecuali berisi NaN yang tidak bisa dirutekannya."""
+        flat = self.flat_forest
+        return (flat is not None and len(X) <= MAX_FLAT_ROWS
+                and (flat.supports_missing or not np.isnan(X).any()))
+
+    def predict_proba(self, X):
+        """Probabilitas kelas untuk matriks fitur yang sudah di-scaling.
+
+        Batch kecil (mis. input manual) memakai FlatForest jika tersedia.
+        """
+        if self._use_flat(X):
+            return self.flat_forest.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def calibrate(self, proba):
+        """Probabilitas DITERIMA mentah -> terkalibrasi (tanpa calibrator: apa adanya)."""
+        if self.calibrator is None:
+            return proba
+        return self.calibrator.transform(proba)
+
+    def decide(self, proba):
+        """(label 0/1, probabilitas DITERIMA) dari output ``predict_proba`` (1 atau 2 dimensi).
+
+        Label diambil dari probabilitas terkalibrasi dengan ``DECISION_THRESHOLD``,
+        bukan argmax probabilitas mentah, agar sesuai dengan probabilitas yang ditampilkan.
+        """
+        probability = self.calibrate(np.asarray(proba)[..., self.positive_index])
+        return (probability >= DECISION_THRESHOLD).astype(int), probability
+
+    def probability(self, X):
+        """Probabilitas DITERIMA (terkalibrasi jika ada) untuk matriks fitur ter-scaling."""
+        return self.calibrate(self.predict_proba(X)[:, self.positive_index])
+
+    def predict(self, X):
+        if self._use_flat(X):
+            return self.flat_forest.predict(X)
+        return self.model.predict(X)
+
+    def __repr__(self):
+        return f"ModelBundle(version={self.version!r}, source={self.source!r})"
+
+
+def build_pipeline(feature_names, scaler=None, model=None):
+    """Pipeline encoder -> scaler -> model; komponen default belum di-fit."""
+    # sklearn (~1,5 detik) diimpor saat dibutuhkan agar import modul ini murah
+    # di jalur startup aplikasi; unpickle artefak memuat sklearn sendiri.
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    from encoder import FeatureEncoder
+
+    return Pipeline([
+        ('encoder', FeatureEncoder(list(feature_names)).fit()),
+        ('scaler', scaler if scaler is not None else StandardScaler()),
+        ('model', model if model is not None else RandomForestClassifier(random_state=42)),
+    ])
+
+
+def artifact_path(name, directory=ARTIFACT_DIR):
+    """Path file artefak/pendamping ``name`` di direktori artefak."""
+    return os.path.join(directory, name)
+
+
+def new_version():
+    return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def save_artifact(pipeline, path=PIPELINE_PATH, version=None):
+    """Simpan pipeline ter-fit sebagai satu file berversi (tanpa kompresi, mmap-able)."""
+    payload = {
+        'format': ARTIFACT_FORMAT,
+        'version': version or new_version(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'feature_names': list(pipeline.named_steps['encoder'].feature_names_out_),
+        'pipeline': pipeline,
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    # Tulis ke file sementara unik lalu rename agar pembaca tidak melihat file setengah jadi
+    with atomic_path(path) as tmp_path:
+        joblib.dump(payload, tmp_path, compress=0)
+    return payload['version']
+
+
+def file_digest(*paths):
+    """SHA-256 gabungan isi beberapa file, dibaca per blok."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def load_bundle(path=PIPELINE_PATH, mmap_mode='r', model_path=MODEL_PATH,
+                scaler_path=SCALER_PATH, features_path=FEATURES_PATH):
+    """Muat artefak pipeline; fallback ke tiga pickle lama jika belum ada.
+
+    Dengan ``mmap_mode='r'`` array besar di artefak dipetakan dari file
+    (read-only) sehingga proses lain yang memuat file yang sama berbagi
+    halaman memori yang sama.
+    """
+    if os.path.exists(path):
+        payload = joblib.load(path, mmap_mode=mmap_mode)
+        if payload.get('format') != ARTIFACT_FORMAT:
+            raise ValueError(f"Format artefak tidak didukung: {payload.get('format')}")
+
+        # FlatForest, tabel keputusan, dan calibrator hanya dipakai jika dibuat dari
+        # versi artefak yang sama
+        directory = os.path.dirname(path)
+        flat_forest = _load_companion(FlatForest, os.path.join(directory, FLAT_FOREST_PATH),
+                                      payload['version'], mmap_mode)
+        decision_table = _load_companion(DecisionTable,
+                                         os.path.join(directory, DECISION_TABLE_PATH),
+                                         payload['version'], mmap_mode)
+        calibrator = _load_companion(Calibrator, os.path.join(directory, CALIBRATION_PATH),
+                                     payload['version'], mmap_mode)
+        return ModelBundle(payload['pipeline'], payload['version'], file_digest(path), path,
+                           flat_forest=flat_forest, decision_table=decision_table,
+                           calibrator=calibrator)
+
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    feature_names = joblib.load(features_path)
+    pipeline = build_pipeline(feature_names, scaler=scaler, model=model)
+    fingerprint = file_digest(model_path, scaler_path, features_path)
+    return ModelBundle(pipeline, 'legacy', fingerprint, model_path)
+
+
+def _load_companion(cls, path, version, mmap_mode):
+    if not os.path.exists(path):
+        return None
+    companion = cls.load(path, mmap_mode=mmap_mode)
+    return companion if companion.version == version else None
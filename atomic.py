@@ -0,0 +1,44 @@
+"""Penulisan file atomik untuk artefak dan file pendamping.
+
+File ditulis ke file sementara *unik* di direktori yang sama lalu
+di-``os.replace`` ke path tujuan. Nama unik (``tempfile.mkstemp``) penting
+karena beberapa proses bisa menulis file yang sama bersamaan (worker
+Streamlit yang membangun tabel keputusan, retrain.py, registry.py); dengan
+satu ``path.tmp`` bersama, tulisan mereka bisa bercampur lalu dipublikasikan
+sebagai file rusak. Dengan nama unik, pemenang terakhir menang utuh.
+"""
+import contextlib
+import os
+import tempfile
+
+# Izin file akhir (mkstemp membuat file 0600)
+FILE_MODE = 0o644
+
+
+def temp_path(path):
+    """Buat file sementara kosong yang unik di direktori ``path``; kembalikan path-nya."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp',
+                                    dir=directory)
+    os.close(fd)
+    os.chmod(tmp_path, FILE_MODE)
+    return tmp_path
+
+
+def discard(tmp_path):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(tmp_path)
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """Path sementara untuk ditulis di dalam blok ``with``; di-rename ke ``path``
+    jika blok selesai tanpa error, dihapus jika gagal."""
+    tmp_path = temp_path(path)
+    try:
+        yield tmp_path
+    except BaseException:
+        discard(tmp_path)
+        raise
+    os.replace(tmp_path, path)
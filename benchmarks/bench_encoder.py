@@ -0,0 +1,65 @@
+"""Benchmark encoder fitur: loop padding lama vs FeatureEncoder.
+
+Jalankan dari root repo:  python -m benchmarks.bench_encoder --rows 1000000
+"""
+import argparse
+import time
+
+import joblib
+import numpy as np
+
+from benchmarks.synthetic import make_candidates
+from encoder import FeatureEncoder
+
+
+def legacy_encode(raw_df, feature_names):
+    # Salinan alur lama FINALBANGET.py (padding kolom satu per satu)
+    raw_df = raw_df.copy()
+    for level in ["1", "2", "3", "4"]:
+        if f'EducationLevel_{level}' not in raw_df.columns:
+            raw_df[f'EducationLevel_{level}'] = 0
+    for strategy in ["1", "2", "3"]:
+        if f'RecruitmentStrategy_{strategy}' not in raw_df.columns:
+            raw_df[f'RecruitmentStrategy_{strategy}'] = 0
+    for col in feature_names:
+        if col not in raw_df.columns:
+            raw_df[col] = 0
+    return raw_df[feature_names].to_numpy(dtype=np.float64)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--features', default='feature_names.pkl')
+    args = parser.parse_args()
+
+    feature_names = joblib.load(args.features)
+    encoder = FeatureEncoder(feature_names).fit()
+    raw_df = make_candidates(args.rows)
+
+    legacy_time, legacy = best_of(lambda: legacy_encode(raw_df, feature_names), args.repeat)
+    encoder_time, encoded = best_of(lambda: encoder.transform(raw_df), args.repeat)
+    assert np.array_equal(legacy, encoded)
+
+    print(f"rows            : {args.rows:,}")
+    print(f"legacy loop     : {legacy_time * 1000:9.1f} ms")
+    print(f"FeatureEncoder  : {encoder_time * 1000:9.1f} ms  ({legacy_time / encoder_time:.1f}x)")
+
+    # Input kategori mentah (tidak didukung alur lama)
+    raw_categories = make_candidates(args.rows, raw_categories=True)
+    raw_time, _ = best_of(lambda: encoder.transform(raw_categories), args.repeat)
+    print(f"encoder (raw)   : {raw_time * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark "Simpan Semua ke Riwayat": iterrows + tulis ulang CSV vs bulk append.
+
+Jalankan dari root repo:  python -m benchmarks.bench_history_save --rows 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import artifacts
+import scoring
+from benchmarks.synthetic import make_candidates
+from history_store import HistoryStore
+
+
+def legacy_save(results_df, history, csv_path):
+    # Salinan alur lama FINALBANGET.py: dict per baris + tulis ulang seluruh CSV
+    records_to_save = []
+    for _, row in results_df.iterrows():
+        record = {
+            'CandidateName': row['CandidateName'],
+            'Timestamp': row['Timestamp'],
+            'Prediction': row['Prediction'],
+            'TotalScore': row['TotalScore'],
+            'SkillScore': row['SkillScore'],
+            'InterviewScore': row['InterviewScore'],
+            'PersonalityScore': row['PersonalityScore'],
+            'ExperienceYears': row['ExperienceYears'],
+            'EducationLevel': row.get('EducationLevel', None),
+            'RecruitmentStrategy': row.get('RecruitmentStrategy', None)
+        }
+        records_to_save.append(record)
+    history.extend(records_to_save)
+    pd.DataFrame(history).to_csv(csv_path, index=False)
+
+
+def scored_results(n_rows):
+    # Kolom results_df tanpa perlu file model: fitur + Prediction acak
+    raw = scoring.prepare_frame(make_candidates(n_rows))
+    encoder = artifacts.build_pipeline(joblib.load('feature_names.pkl')).named_steps['encoder']
+    features = encoder.to_frame(encoder.transform(raw))
+    results_df = features.assign(
+        CandidateName=raw['CandidateName'].to_numpy(),
+        Timestamp=raw['Timestamp'].to_numpy(),
+        Prediction=np.where(np.random.default_rng(0).random(n_rows) < 0.3,
+                            "DITERIMA", "TIDAK DITERIMA"),
+        TotalScore=features[scoring.REQUIRED_COLUMNS].sum(axis=1),
+    )
+    return results_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    results_df = scored_results(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        legacy_save(results_df, [], os.path.join(tmp, 'riwayat.csv'))
+        legacy_time = time.perf_counter() - started
+
+        store = HistoryStore(os.path.join(tmp, 'riwayat.db'), legacy_csv=None)
+        started = time.perf_counter()
+        store.append(results_df)
+        bulk_time = time.perf_counter() - started
+        assert store.count() == args.rows
+
+    print(f"rows                  : {args.rows:,}")
+    print(f"iterrows + CSV rewrite: {legacy_time:8.2f} s")
+    print(f"HistoryStore.append   : {bulk_time:8.2f} s  ({legacy_time / bulk_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
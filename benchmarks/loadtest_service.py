@@ -0,0 +1,81 @@
+"""Load test untuk service.py di localhost.
+
+Jalankan service dulu (python service.py), lalu dari root repo:
+    python -m benchmarks.loadtest_service --requests 5000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_candidates
+
+
+async def worker(host, port, payloads, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path, body in payloads:
+            started = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                         f"Content-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    records = make_candidates(args.requests * args.batch_size, raw_categories=True)
+    records = json.loads(records.to_json(orient='records'))
+
+    payloads = []
+    for i in range(args.requests):
+        batch = records[i * args.batch_size:(i + 1) * args.batch_size]
+        if args.batch_size == 1:
+            payloads.append(('/predict', json.dumps(batch[0]).encode()))
+        else:
+            payloads.append(('/predict/batch', json.dumps({'candidates': batch}).encode()))
+
+    latencies, failures = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        worker(args.host, args.port, payloads[i::args.concurrency], latencies, failures)
+        for i in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"requests    : {args.requests:,} ({len(failures)} gagal)")
+    print(f"throughput  : {args.requests / elapsed:,.0f} req/detik "
+          f"({args.requests * args.batch_size / elapsed:,.0f} kandidat/detik)")
+    print(f"latency     : p50 {p50:.1f} ms | p99 {p99:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test service.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help="Kandidat per request (>1 memakai /predict/batch)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Benchmark suite: scoring CSV, encoding, scaling+predict, dan riwayat.
+
+Data kandidat sintetis (skema ``feature_names.pkl``, seed tetap) pada
+beberapa ukuran; hasil ditulis ke JSON agar run bisa dibandingkan. Dengan
+``--baseline`` setiap kasus yang lebih lambat dari baseline melebihi
+``--tolerance`` ditandai REGRESI dan proses keluar dengan kode 1.
+
+Jalankan dari root repo:
+    python -m benchmarks.suite --sizes 1000,100000,1000000
+    python -m benchmarks.suite --baseline benchmarks/results/bench-20250101-120000.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+import artifacts
+import scoring
+from benchmarks.bench_encoder import best_of
+from benchmarks.synthetic import make_candidates
+from history_store import HistoryStore
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+
+
+def synthetic_bundle(feature_names, n_train=20_000, n_estimators=100):
+    """Pipeline yang dilatih pada data sintetis (seed tetap) agar run bisa diulang
+    tanpa artefak model asli."""
+    train = make_candidates(n_train, seed=7)
+    y = (train[scoring.REQUIRED_COLUMNS].sum(axis=1)
+         + np.random.default_rng(7).normal(0, 3, n_train) > 22).astype(int)
+    pipeline = artifacts.build_pipeline(feature_names)
+    pipeline.named_steps['model'].set_params(n_estimators=n_estimators)
+    pipeline.fit(train, y)
+    return artifacts.ModelBundle(pipeline, 'synthetic', 'synthetic', None)
+
+
+def run_size(bundle, n_rows, repeat):
+    """Semua kasus untuk satu ukuran data; kembalikan {kasus: detik terbaik}."""
+    raw_df = make_candidates(n_rows)
+    csv_bytes = raw_df.to_csv(index=False).encode()
+    results = {}
+
+    def csv_end_to_end():
+        scoring.clear_cache()
+        return scoring.score_csv(csv_bytes, bundle)
+    results['csv_end_to_end'], results_df = best_of(csv_end_to_end, repeat)
+
+    results['encode'], X = best_of(lambda: bundle.encoder.transform(raw_df), repeat)
+    results['scale_predict'], _ = best_of(
+        lambda: bundle.predict(scoring.scale_features(bundle.scaler, X.copy())), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def save_history():
+            path = os.path.join(tmp, f'riwayat-{time.perf_counter_ns()}.db')
+            HistoryStore(path, legacy_csv=None).append(results_df)
+            return path
+        results['history_save'], db_path = best_of(save_history, repeat)
+
+        # Store baru per percobaan: frame() membaca seluruh riwayat dari database
+        results['history_load'], _ = best_of(
+            lambda: HistoryStore(db_path, legacy_csv=None).frame(), repeat)
+
+        def history_sort_filter():
+            # Halaman riwayat setelah riwayat berubah: hitung record terfilter (store
+            # baru, tanpa cache count) + halaman pertama, berikutnya, dan terakhir
+            store = HistoryStore(db_path, legacy_csv=None)
+            n_rows = store.count('DITERIMA')
+            last_size = n_rows - (max(1, -(-n_rows // 50)) - 1) * 50
+            for sort in ('newest', 'total_score', 'eligibility'):
+                _, _, last = store.page('DITERIMA', sort, 50)
+                store.page('DITERIMA', sort, 50, after=last)
+                store.page('DITERIMA', sort, last_size, last=True)
+        results['history_sort_filter'], _ = best_of(history_sort_filter, repeat)
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """List (ukuran, kasus, detik baseline, detik sekarang) yang melambat > tolerance."""
+    regressions = []
+    for size, cases in results.items():
+        for case, seconds in cases.items():
+            previous = baseline.get(size, {}).get(case)
+            if previous is not None and seconds > previous * (1 + tolerance):
+                regressions.append((size, case, previous, seconds))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--features', default='feature_names.pkl')
+    parser.add_argument('--artifact', default=None,
+                        help="Pakai artefak model ini, bukan model sintetis")
+    parser.add_argument('--output', default=None,
+                        help=f"File JSON hasil (default: {RESULTS_DIR}/bench-<waktu>.json)")
+    parser.add_argument('--baseline', default=None, help="JSON hasil run sebelumnya")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Batas perlambatan relatif sebelum ditandai regresi")
+    args = parser.parse_args()
+
+    if args.artifact:
+        bundle = artifacts.load_bundle(args.artifact)
+    else:
+        bundle = synthetic_bundle(joblib.load(args.features))
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = {}
+    for n_rows in sizes:
+        results[str(n_rows)] = cases = run_size(bundle, n_rows, args.repeat)
+        for case, seconds in cases.items():
+            print(f"{n_rows:>9,} {case:<20} {seconds * 1000:10.1f} ms "
+                  f"{n_rows / seconds:14,.0f} baris/detik")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'model_version': bundle.version,
+        'repeat': args.repeat,
+        'environment': environment(),
+        'results': results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil disimpan ke {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.tolerance)
+        for size, case, previous, seconds in regressions:
+            print(f"REGRESI {int(size):,} {case}: {previous * 1000:.1f} ms -> "
+                  f"{seconds * 1000:.1f} ms (+{seconds / previous - 1:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"Tidak ada regresi (toleransi {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
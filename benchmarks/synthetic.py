@@ -0,0 +1,31 @@
+"""Generator data kandidat sintetis sesuai skema ``feature_names.pkl``."""
+import numpy as np
+import pandas as pd
+
+
+def make_candidates(n_rows, seed=42, raw_categories=False):
+    """DataFrame kandidat acak dengan kolom seperti file upload CSV.
+
+    ``raw_categories=True`` menghasilkan kolom mentah ``EducationLevel`` /
+    ``RecruitmentStrategy``; selain itu kolom one-hot ``EducationLevel_k`` dst.
+    """
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'CandidateName': np.char.add('Kandidat_', np.arange(1, n_rows + 1).astype(str)),
+        'SkillScore': rng.integers(0, 101, n_rows) / 10,
+        'ExperienceYears': rng.integers(0, 21, n_rows),
+        'InterviewScore': rng.integers(0, 101, n_rows) / 10,
+        'PersonalityScore': rng.integers(0, 101, n_rows) / 10,
+    })
+    education = rng.integers(1, 5, n_rows)
+    strategy = rng.integers(1, 4, n_rows)
+
+    if raw_categories:
+        df['EducationLevel'] = education
+        df['RecruitmentStrategy'] = strategy
+    else:
+        for level in range(1, 5):
+            df[f'EducationLevel_{level}'] = (education == level).astype(np.int64)
+        for k in range(1, 4):
+            df[f'RecruitmentStrategy_{k}'] = (strategy == k).astype(np.int64)
+    return df
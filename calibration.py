@@ -0,0 +1,165 @@
+"""Kalibrasi probabilitas DITERIMA dan laporan sweep threshold.
+
+Probabilitas mentah Random Forest (proporsi vote pohon) cenderung
+terkumpul di tengah dan tidak bisa dibaca sebagai peluang. ``Calibrator``
+memetakan probabilitas kelas positif mentah ke probabilitas terkalibrasi:
+
+    sigmoid   Platt scaling, regresi logistik pada logit probabilitas mentah
+    isotonic  fungsi monoton bertingkat (butuh data lebih banyak)
+
+Calibrator di-fit oleh retrain.py (``--calibrate``) pada probabilitas
+out-of-fold data latih dan disimpan sebagai ``calibration.joblib`` di
+samping artefak; hanya dipakai jika versinya sama dengan artefak pipeline.
+Label prediksi diturunkan dari probabilitas terkalibrasi yang sama dengan
+kolom ``Probability`` (DITERIMA jika >= ``DECISION_THRESHOLD``), sehingga
+keduanya tidak pernah bertentangan. Transformasi cukup NumPy (sklearn hanya
+saat fit).
+
+Sweep threshold menghitung jumlah kandidat lolos (dan precision/recall/F1
+jika label tersedia) untuk banyak threshold sekaligus dari satu array
+probabilitas terurut, tanpa menjalankan model per threshold.
+
+Laporan untuk data berlabel:
+    python calibration.py model/training_data.csv --artifact model/hiring_pipeline.joblib
+"""
+
+import numpy as np
+import joblib
+import pandas as pd
+
+from atomic import atomic_path
+
+CALIBRATION_PATH = 'calibration.joblib'
+CALIBRATION_METHODS = ('sigmoid', 'isotonic')
+
+# Jumlah fold untuk probabilitas out-of-fold (minimal baris per kelas)
+CV_SPLITS = 5
+
+# Threshold keputusan DITERIMA pada probabilitas terkalibrasi; semantik sama dengan
+# kolom ``threshold`` laporan sweep (lolos jika probabilitas >= threshold)
+DECISION_THRESHOLD = 0.5
+
+# Threshold default laporan sweep: 0.05, 0.10, ..., 0.95
+DEFAULT_THRESHOLDS = np.round(np.arange(0.05, 1.0, 0.05), 2)
+
+# Batas logit agar probabilitas 0/1 (semua pohon sepakat) tetap berhingga
+_EPS = 1e-6
+
+
+def _logit(p):
+    p = np.clip(p, _EPS, 1 - _EPS)
+    return np.log(p / (1 - p))
+
+
+class Calibrator:
+    """Pemetaan probabilitas kelas positif mentah -> terkalibrasi."""
+
+    def __init__(self, method, params, version=None):
+        self.method = method
+        self.params = params
+        self.version = version
+
+    @classmethod
+    def fit(cls, proba, y, method='sigmoid', version=None):
+        """Fit pada probabilitas positif mentah ``proba`` dan label 0/1 ``y``."""
+        proba = np.asarray(proba, dtype=np.float64)
+        y = np.asarray(y)
+        if method == 'sigmoid':
+            from sklearn.linear_model import LogisticRegression
+
+            lr = LogisticRegression(C=1e6).fit(_logit(proba)[:, None], y)
+            params = {'coef': float(lr.coef_[0, 0]), 'intercept': float(lr.intercept_[0])}
+        elif method == 'isotonic':
+            from sklearn.isotonic import IsotonicRegression
+
+            iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(proba, y)
+            params = {'x': np.asarray(iso.X_thresholds_, dtype=np.float64),
+                      'y': np.asarray(iso.y_thresholds_, dtype=np.float64)}
+        else:
+            raise ValueError(f"Metode kalibrasi tidak dikenal: {method!r} "
+                             f"(pilih {', '.join(CALIBRATION_METHODS)})")
+        return cls(method, params, version=version)
+
+    def transform(self, proba):
+        proba = np.asarray(proba, dtype=np.float64)
+        if self.method == 'sigmoid':
+            z = self.params['coef'] * _logit(proba) + self.params['intercept']
+            return 1.0 / (1.0 + np.exp(-z))
+        return np.interp(proba, self.params['x'], self.params['y'])
+
+    def save(self, path=CALIBRATION_PATH):
+        with atomic_path(path) as tmp_path:
+            joblib.dump({'method': self.method, 'params': self.params, 'version': self.version},
+                        tmp_path, compress=0)
+
+    @classmethod
+    def load(cls, path=CALIBRATION_PATH, mmap_mode=None):
+        return cls(**joblib.load(path, mmap_mode=mmap_mode))
+
+
+def out_of_fold_proba(pipeline, X, y, n_splits=CV_SPLITS, random_state=42):
+    """Probabilitas positif out-of-fold: setiap baris di-scoring oleh pipeline
+    (salinan belum di-fit) yang tidak melihat baris itu saat training."""
+    from sklearn.base import clone
+    from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    proba = cross_val_predict(clone(pipeline), X, y, cv=cv, method='predict_proba')
+    return proba[:, 1]
+
+
+def brier_score(proba, y):
+    return float(np.mean((np.asarray(proba, dtype=np.float64) - np.asarray(y)) ** 2))
+
+
+def threshold_sweep(proba, y=None, thresholds=DEFAULT_THRESHOLDS):
+    """Jumlah kandidat dengan probabilitas >= threshold untuk setiap threshold.
+
+    Dengan label ``y`` (0/1) ditambah precision, recall, dan F1. Cukup satu
+    sort + ``searchsorted``; biayanya O(n log n) berapa pun jumlah threshold.
+    """
+    proba = np.asarray(proba, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    n = len(proba)
+    accepted = n - np.searchsorted(np.sort(proba), thresholds, side='left')
+    report = pd.DataFrame({
+        'threshold': thresholds,
+        'accepted': accepted,
+        'accepted_rate': accepted / n if n else np.zeros(len(thresholds)),
+    })
+    if y is None:
+        return report
+
+    positive = np.sort(proba[np.asarray(y) == 1])
+    true_pos = len(positive) - np.searchsorted(positive, thresholds, side='left')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(accepted > 0, true_pos / accepted, np.nan)
+        recall = true_pos / len(positive) if len(positive) else np.full(len(thresholds), np.nan)
+        f1 = 2 * precision * recall / (precision + recall)
+    report['precision'] = precision
+    report['recall'] = recall
+    report['f1'] = f1
+    return report
+
+
+if __name__ == '__main__':
+    import argparse
+
+    import artifacts
+    import incremental
+    import scoring
+
+    parser = argparse.ArgumentParser(description="Laporan sweep threshold untuk data berlabel")
+    parser.add_argument('data', help=f"CSV berlabel (kolom {' atau '.join(incremental.LABEL_COLUMNS)})")
+    parser.add_argument('--artifact', default=artifacts.PIPELINE_PATH)
+    parser.add_argument('--step', type=float, default=0.05, help="Jarak antar threshold")
+    args = parser.parse_args()
+
+    bundle = artifacts.load_bundle(args.artifact)
+    X, y = incremental.load_labeled(args.data, bundle.encoder)
+    proba = bundle.probability(scoring.scale_features(bundle.scaler, X.to_numpy(dtype=np.float64)))
+    thresholds = np.round(np.arange(args.step, 1.0, args.step), 6)
+    calibrated = 'terkalibrasi' if bundle.calibrator is not None else 'mentah'
+    print(f"{len(y):,} baris, model versi {bundle.version}, probabilitas {calibrated}, "
+          f"Brier {brier_score(proba, y):.4f}")
+    print(threshold_sweep(proba, y, thresholds).to_string(index=False, float_format='%.3f'))
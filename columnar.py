@@ -0,0 +1,272 @@
+"""Format kolumnar (Parquet, Arrow IPC/Feather) untuk data kandidat dan hasil.
+
+Dipakai di samping CSV pada upload, unduhan hasil/riwayat, data latih
+retrain.py, dan CLI scoring. Format dipilih dari ekstensi file:
+
+    .parquet / .pq             Parquet
+    .arrow / .feather / .ipc   Arrow IPC (Feather v2)
+    lainnya                    CSV (pandas)
+
+Skema bertipe diturunkan dari daftar fitur model (``feature_names.pkl``):
+skor dan pengalaman float64, indikator one-hot int8, label int8. File
+lokal dibaca dengan memory map sehingga kolom tidak disalin ke heap
+sebelum dibutuhkan.
+
+pyarrow bersifat opsional dan diimpor saat dipakai; tanpa pyarrow semua
+jalur CSV tetap berjalan dan fungsi di sini raise ImportError.
+
+Konversi:  python columnar.py model/training_data.csv model/training_data.parquet
+"""
+import io
+import os
+
+import pandas as pd
+
+import atomic
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+UPLOAD_TYPES = ['parquet', 'pq', 'arrow', 'feather']
+
+# Kolom numerik kontinu; fitur lain dari feature_names.pkl adalah indikator one-hot
+CONTINUOUS_FEATURES = ['SkillScore', 'ExperienceYears', 'InterviewScore', 'PersonalityScore']
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Format Parquet/Arrow butuh pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def available():
+    try:
+        _pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def file_format(name):
+    """'parquet', 'arrow', atau 'csv' berdasarkan ekstensi ``name``."""
+    lower = os.fspath(name).lower()
+    if lower.endswith(PARQUET_SUFFIXES):
+        return 'parquet'
+    if lower.endswith(ARROW_SUFFIXES):
+        return 'arrow'
+    return 'csv'
+
+
+def is_columnar(name):
+    return file_format(name) != 'csv'
+
+
+def feature_schema(feature_names, label=False):
+    """Skema Arrow untuk matriks fitur one-hot (format training_data.csv)."""
+    pa = _pyarrow()
+    fields = [pa.field(name, pa.float64() if name in CONTINUOUS_FEATURES else pa.int8())
+              for name in feature_names]
+    if label:
+        fields.append(pa.field('label', pa.int8()))
+    return pa.schema(fields)
+
+
+def results_schema(feature_names):
+    """Skema Arrow untuk hasil ``scoring.score_frame``."""
+    pa = _pyarrow()
+    return pa.schema([
+        pa.field('No', pa.int64()),
+        pa.field('CandidateName', pa.string()),
+        pa.field('Timestamp', pa.string()),
+        pa.field('Prediction', pa.string()),
+        pa.field('Probability', pa.float64()),
+        pa.field('TotalScore', pa.float64()),
+    ] + list(feature_schema(feature_names)))
+
+
+def history_schema():
+    """Skema Arrow untuk riwayat (tipe SQLite dari ``history_store.HISTORY_COLUMNS``)."""
+    from history_store import HISTORY_COLUMNS
+
+    pa = _pyarrow()
+    types = {'TEXT': pa.string(), 'REAL': pa.float64()}
+    return pa.schema([pa.field(name, types[sql_type])
+                      for name, sql_type in HISTORY_COLUMNS.items()])
+
+
+def to_table(frame, schema=None):
+    """DataFrame -> Table; kolom yang ada di ``schema`` di-cast ke tipenya."""
+    pa = _pyarrow()
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if schema is None:
+        return table
+    types = {field.name: field.type for field in schema}
+    fields = [pa.field(field.name, types.get(field.name, field.type)) for field in table.schema]
+    return table.cast(pa.schema(fields))
+
+
+def _source(source, memory_map):
+    """Path -> memory map (jika diminta), bytes -> buffer Arrow, file-like apa adanya."""
+    pa = _pyarrow()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(source)
+    if isinstance(source, (str, os.PathLike)) and memory_map:
+        return pa.memory_map(os.fspath(source), 'r')
+    return source
+
+
+def read_table(source, fmt, columns=None, memory_map=True):
+    """Baca Parquet/Arrow (path, bytes, atau file-like) sebagai ``pyarrow.Table``."""
+    _pyarrow()
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if fmt == 'parquet':
+        return pq.read_table(_source(source, memory_map), columns=columns)
+    return feather.read_table(_source(source, memory_map), columns=columns,
+                              memory_map=False)
+
+
+def read_frame(source, fmt=None, columns=None, memory_map=True):
+    """Baca file kandidat/hasil sebagai DataFrame; format dari ekstensi jika ``fmt`` None."""
+    fmt = fmt or file_format(source)
+    if fmt == 'csv':
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        return pd.read_csv(source, usecols=columns)
+    return read_table(source, fmt, columns=columns, memory_map=memory_map).to_pandas()
+
+
+def iter_frames(source, fmt, chunksize):
+    """DataFrame per batch ``chunksize`` baris dari Parquet/Arrow (mode streaming)."""
+    pa = _pyarrow()
+    import pyarrow.parquet as pq
+
+    if fmt == 'parquet':
+        for batch in pq.ParquetFile(_source(source, True)).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    reader = pa.ipc.open_file(_source(source, True))
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        for start in range(0, batch.num_rows, chunksize):
+            yield batch.slice(start, chunksize).to_pandas()
+
+
+def to_bytes(frame, fmt='parquet', schema=None):
+    """DataFrame -> isi file Parquet/Arrow (mis. untuk tombol unduh)."""
+    sink = io.BytesIO()
+    write_stream(frame, sink, fmt, schema)
+    return sink.getvalue()
+
+
+def write_stream(frame, sink, fmt='parquet', schema=None, block_rows=100_000):
+    """Tulis ``frame`` ke file biner ``sink`` per blok baris (tanpa Table penuh di memori)."""
+    pa = _pyarrow()
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for start in range(0, max(len(frame), 1), block_rows):
+            table = to_table(frame.iloc[start:start + block_rows], schema)
+            if writer is None:
+                writer = (pq.ParquetWriter(sink, table.schema) if fmt == 'parquet'
+                          else pa.ipc.new_file(sink, table.schema))
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_frame(frame, path, schema=None):
+    """Simpan DataFrame sesuai ekstensi ``path`` (CSV/Parquet/Arrow), atomik untuk kolumnar."""
+    fmt = file_format(path)
+    if fmt == 'csv':
+        frame.to_csv(path, index=False)
+        return
+    with atomic.atomic_path(path) as tmp_path:
+        _write_table(to_table(frame, schema), tmp_path, fmt)
+
+
+def _write_table(table, sink, fmt):
+    _pyarrow()
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    if fmt == 'parquet':
+        pq.write_table(table, sink)
+    else:
+        feather.write_feather(table, sink, compression='uncompressed')
+
+
+class TableWriter:
+    """Penulis Parquet/Arrow bertahap (satu row group/batch per ``write``).
+
+    Dipakai mode streaming: setiap chunk hasil ditulis lalu dilepas dari
+    memori. File ditulis ke file sementara unik dan di-rename saat ``close``.
+    """
+
+    def __init__(self, path, schema=None):
+        self.path = path
+        self.fmt = file_format(path)
+        self.schema = schema
+        self._tmp_path = None
+        self._writer = None
+
+    def write(self, frame):
+        pa = _pyarrow()
+        import pyarrow.parquet as pq
+
+        table = to_table(frame, self.schema)
+        if self._writer is None:
+            self._tmp_path = atomic.temp_path(self.path)
+            if self.fmt == 'parquet':
+                self._writer = pq.ParquetWriter(self._tmp_path, table.schema)
+            else:
+                self._writer = pa.ipc.new_file(self._tmp_path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp_path, self.path)
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._writer is not None:
+            self._writer.close()
+            atomic.discard(self._tmp_path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Konversi data kandidat/training antar CSV, "
+                                                 "Parquet, dan Arrow (format dari ekstensi)")
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--kind', choices=['training', 'results', 'history', 'raw'],
+                        default='training', help="Skema bertipe yang dipakai saat menulis")
+    parser.add_argument('--features', default='feature_names.pkl')
+    args = parser.parse_args()
+
+    frame = read_frame(args.input)
+    schema = None
+    if args.kind == 'training':
+        feature_names = joblib.load(args.features)
+        schema = feature_schema(feature_names, label='label' in frame.columns)
+    elif args.kind == 'results':
+        schema = results_schema(joblib.load(args.features))
+    elif args.kind == 'history':
+        schema = history_schema()
+    write_frame(frame, args.output, schema if is_columnar(args.output) else None)
+    print(f"{len(frame):,} baris: {args.input} ({os.path.getsize(args.input) / 1e6:.1f} MB) -> "
+          f"{args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB)")
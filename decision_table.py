@@ -0,0 +1,161 @@
+"""Tabel keputusan untuk grid input manual yang sudah di-scoring di muka.
+
+Form input manual hanya menghasilkan nilai diskret: pendidikan 1-4,
+strategi 1-3, pengalaman 0-20 tahun, dan tiga skor 0-10. Grid tersebut
+(skor dengan step ``score_step``) di-scoring sekali dalam batch besar dan
+disimpan sebagai array ``proba[pendidikan, strategi, tahun, skill,
+interview, kepribadian, kelas]`` + label, sehingga prediksi manual menjadi
+satu index lookup dan kurva "what-if" cukup satu slice array. Input di
+luar grid (mis. skor 7.25 dengan step 0.5) tidak ditemukan dan dikembalikan
+None agar pemanggil memakai model.
+
+File disimpan tanpa kompresi di samping artefak (bisa di-mmap) dan hanya
+dipakai jika versinya sama dengan artefak pipeline.
+
+Bangun manual:  python decision_table.py --artifact model/hiring_pipeline.joblib
+"""
+import os
+
+import numpy as np
+import joblib
+import pandas as pd
+
+from atomic import atomic_path
+
+DECISION_TABLE_PATH = 'decision_table.joblib'
+
+# Step skor default: 21 nilai per skor -> 4*3*21*21^3 = 2,3 juta sel (~20 MB)
+DEFAULT_SCORE_STEP = 0.5
+
+SCORE_AXES = ['SkillScore', 'InterviewScore', 'PersonalityScore']
+
+
+def grid_axes(score_step=DEFAULT_SCORE_STEP):
+    """Urutan sumbu tabel dan nilai-nilainya (semua berjarak seragam)."""
+    scores = np.round(np.arange(0, 10 + score_step / 2, score_step), 6)
+    return [
+        ('EducationLevel', np.arange(1, 5, dtype=np.float64)),
+        ('RecruitmentStrategy', np.arange(1, 4, dtype=np.float64)),
+        ('ExperienceYears', np.arange(0, 21, dtype=np.float64)),
+    ] + [(name, scores) for name in SCORE_AXES]
+
+
+class DecisionTable:
+    """Probabilitas kelas + label untuk setiap titik grid input manual."""
+
+    def __init__(self, axes, proba, labels, classes, version=None):
+        self.axes = [(name, np.asarray(values)) for name, values in axes]
+        self.proba = proba
+        self.labels = labels
+        self.classes_ = classes
+        self.version = version
+
+    @classmethod
+    def build(cls, bundle, score_step=DEFAULT_SCORE_STEP):
+        """Scoring seluruh grid, satu batch per (pendidikan, strategi)."""
+        from scoring import transform
+
+        axes = grid_axes(score_step)
+        shape = tuple(len(values) for _, values in axes)
+        model = bundle.model
+        proba = np.empty(shape + (len(model.classes_),), dtype=np.float32)
+        labels = np.empty(shape, dtype=np.int8)
+
+        (edu_name, edu_values), (strategy_name, strategy_values) = axes[:2]
+        inner = np.meshgrid(*(values for _, values in axes[2:]), indexing='ij')
+        block = pd.DataFrame({name: grid.ravel() for (name, _), grid in zip(axes[2:], inner)})
+        for i, education in enumerate(edu_values):
+            for j, strategy in enumerate(strategy_values):
+                frame = block.assign(**{edu_name: education, strategy_name: strategy})
+                # predict_proba sklearn langsung: batch besar, bukan jalur FlatForest
+                block_proba = model.predict_proba(transform(bundle, frame))
+                proba[i, j] = block_proba.reshape(shape[2:] + (-1,))
+                labels[i, j] = np.argmax(block_proba, axis=1).reshape(shape[2:])
+        return cls(axes, proba, labels, model.classes_, version=bundle.version)
+
+    def _index(self, data, skip=None):
+        """Tuple index grid untuk satu kandidat (dict), atau None jika di luar grid."""
+        index = []
+        for name, values in self.axes:
+            if name == skip:
+                index.append(slice(None))
+                continue
+            try:
+                value = float(data[name])
+            except (KeyError, TypeError, ValueError):
+                return None
+            position = (value - values[0]) / (values[1] - values[0])
+            k = int(round(position))
+            if abs(position - k) > 1e-6 or not 0 <= k < len(values):
+                return None
+            index.append(k)
+        return tuple(index)
+
+    def lookup(self, data):
+        """(label, probabilitas per kelas) atau None jika input tidak tepat di grid."""
+        index = self._index(data)
+        if index is None:
+            return None
+        return self.classes_[self.labels[index]], self.proba[index]
+
+    def what_if(self, data, column, values, positive_class=1):
+        """Probabilitas kelas positif di ``values`` untuk ``column``, input lain tetap.
+
+        Kembalikan (probabilitas, mask ``values`` yang ada di grid) atau None
+        jika input lain tidak tepat di grid. Probabilitas untuk nilai di luar
+        grid bernilai NaN; pemanggil mengisinya dari model.
+        """
+        index = self._index(data, skip=column)
+        if index is None:
+            return None
+        axis = dict(self.axes)[column]
+        values = np.asarray(values, dtype=np.float64)
+        position = (values - axis[0]) / (axis[1] - axis[0])
+        k = np.rint(position).astype(np.intp)
+        found = (np.abs(position - k) <= 1e-6) & (k >= 0) & (k < len(axis))
+
+        positive = int(np.flatnonzero(self.classes_ == positive_class)[0])
+        proba = np.full(len(values), np.nan)
+        proba[found] = self.proba[index][k[found], positive]
+        return proba, found
+
+    def save(self, path=DECISION_TABLE_PATH):
+        # Tulis ke file sementara unik lalu rename agar watcher tidak membaca file setengah
+        # jadi, dan build bersamaan (worker lain, retrain.py) tidak saling menimpa
+        with atomic_path(path) as tmp_path:
+            joblib.dump({'axes': [(name, np.asarray(values)) for name, values in self.axes],
+                         'proba': self.proba, 'labels': self.labels, 'classes': self.classes_,
+                         'version': self.version}, tmp_path, compress=0)
+
+    @classmethod
+    def load(cls, path=DECISION_TABLE_PATH, mmap_mode='r'):
+        return cls(**joblib.load(path, mmap_mode=mmap_mode))
+
+    @staticmethod
+    def stored_version(path=DECISION_TABLE_PATH):
+        """Versi tabel di ``path`` tanpa membaca grid; None jika tidak ada/tidak terbaca."""
+        try:
+            return joblib.load(path, mmap_mode='r')['version']
+        except Exception:
+            return None
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    import artifacts
+
+    parser = argparse.ArgumentParser(description="Bangun tabel keputusan input manual")
+    parser.add_argument('--artifact', default=artifacts.PIPELINE_PATH)
+    parser.add_argument('--step', type=float, default=DEFAULT_SCORE_STEP,
+                        help="Step nilai skor 0-10 di grid")
+    args = parser.parse_args()
+
+    bundle = artifacts.load_bundle(args.artifact)
+    started = time.perf_counter()
+    table = DecisionTable.build(bundle, args.step)
+    path = os.path.join(os.path.dirname(args.artifact), DECISION_TABLE_PATH)
+    table.save(path)
+    print(f"{table.labels.size:,} sel di-scoring dalam {time.perf_counter() - started:.1f} detik, "
+          f"disimpan ke {path} ({table.proba.nbytes / 1e6:.1f} MB)")
@@ -0,0 +1,78 @@
+"""Encoder fitur kandidat -> matriks float untuk scaler/model.
+
+Menggantikan loop one-hot dan padding kolom satu per satu di aplikasi
+Streamlit. Layout kolom dibentuk dari ``feature_names.pkl``: kolom dengan
+pola ``<Prefix>_<level>`` (mis. ``EducationLevel_3``) dianggap indikator
+one-hot, sisanya numerik. Input boleh berisi kolom one-hot yang sudah jadi
+atau kolom mentah ``EducationLevel`` / ``RecruitmentStrategy`` (1-4 / 1-3).
+"""
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+CATEGORICAL_COLUMNS = ['EducationLevel', 'RecruitmentStrategy']
+
+
+class FeatureEncoder(TransformerMixin, BaseEstimator):
+    """Transformer stateless yang di-fit dari daftar ``feature_names``."""
+
+    def __init__(self, feature_names=None):
+        self.feature_names = feature_names
+
+    def fit(self, X=None, y=None):
+        feature_names = self.feature_names
+        if feature_names is None:
+            feature_names = list(X.columns)
+        self.feature_names_out_ = list(feature_names)
+
+        # Kelompokkan indikator one-hot per kolom kategori mentah
+        self.indicators_ = {}
+        for j, name in enumerate(self.feature_names_out_):
+            prefix, _, level = name.rpartition('_')
+            if prefix in CATEGORICAL_COLUMNS and level.isdigit():
+                self.indicators_.setdefault(prefix, []).append((j, float(level)))
+        return self
+
+    def transform(self, X):
+        """DataFrame atau dict (satu kandidat) -> ndarray float64 (n, n_fitur).
+
+        Kolom yang tidak ada di input diisi 0, sama seperti padding lama.
+        """
+        if not hasattr(self, 'feature_names_out_'):
+            self.fit(X)
+
+        n_rows = 1 if isinstance(X, Mapping) else len(X)
+        out = np.zeros((n_rows, len(self.feature_names_out_)), dtype=np.float64)
+
+        for j, name in enumerate(self.feature_names_out_):
+            if name in X:
+                out[:, j] = _numeric(X[name])
+
+        # Kolom kategori mentah -> indikator, hanya untuk indikator yang belum ada di input
+        for prefix, indicators in self.indicators_.items():
+            pending = [(j, level) for j, level in indicators if self.feature_names_out_[j] not in X]
+            if pending and prefix in X:
+                codes = _numeric(X[prefix])
+                for j, level in pending:
+                    np.equal(codes, level, out=out[:, j], casting='unsafe')
+        return out
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(self.feature_names_out_, dtype=object)
+
+    def to_frame(self, X, index=None):
+        """Matriks hasil ``transform`` -> DataFrame, indikator one-hot sebagai int8."""
+        indicator_cols = {j for indicators in self.indicators_.values() for j, _ in indicators}
+        return pd.DataFrame({
+            name: X[:, j].astype(np.int8) if j in indicator_cols else X[:, j]
+            for j, name in enumerate(self.feature_names_out_)
+        }, index=index)
+
+
+def _numeric(values):
+    values = np.asarray(values)
+    if values.dtype.kind in 'biuf':
+        return values
+    return pd.to_numeric(pd.Series(values.ravel()), errors='coerce').to_numpy(dtype=np.float64)
@@ -0,0 +1,213 @@
+"""Payload unduhan (CSV/Parquet) yang dibuat sekali per set hasil, saat diminta.
+
+``st.download_button`` menerima callable sebagai ``data``; callable baru
+dijalankan saat tombol diklik, sehingga rerun biasa tidak menserialisasi
+apa pun. ``ExportCache`` menyimpan hasil serialisasi per (kunci set hasil,
+format): payload kecil disimpan sebagai bytes, payload besar ditulis ke
+file sementara (``SpooledTemporaryFile`` yang tumpah ke disk) dan dibaca
+dari sana saat diunduh. CSV ditulis per blok baris sehingga string CSV
+lengkap tidak pernah dibangun di memori.
+
+File hasil mode streaming (``SessionFile``) ditulis di ``STREAM_OUTPUT_DIR``
+dan dihapus saat sesi yang memilikinya dibuang Streamlit (sesi ditutup atau
+kedaluwarsa); sisa proses yang berhenti mendadak dihapus saat start
+berikutnya oleh ``remove_stale_files``.
+"""
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import columnar
+import metrics
+
+# Payload di atas batas ini disimpan di file sementara, bukan di memori
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+# Jumlah payload yang disimpan (dibagi antar sesi); yang paling lama dibuang
+MAX_EXPORTS = 16
+
+# Jumlah baris per blok saat menulis CSV
+CSV_BLOCK_ROWS = 100_000
+
+# Direktori file hasil streaming dan umur maksimal sisa file dari proses sebelumnya
+STREAM_OUTPUT_DIR = os.path.join(tempfile.gettempdir(), 'hiring_stream_outputs')
+STREAM_OUTPUT_MAX_AGE = 24 * 60 * 60
+
+MIME_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def write_csv(frame, sink, block_rows=CSV_BLOCK_ROWS):
+    """Tulis ``frame`` sebagai CSV UTF-8 ke file biner ``sink``, per blok baris."""
+    text = io.TextIOWrapper(sink, encoding='utf-8', newline='', write_through=True)
+    try:
+        for start in range(0, max(len(frame), 1), block_rows):
+            frame.iloc[start:start + block_rows].to_csv(text, index=False, header=start == 0)
+    finally:
+        # Lepas wrapper tanpa menutup sink
+        text.detach()
+
+
+def write_parquet(frame, sink, schema=None):
+    columnar.write_stream(frame, sink, 'parquet', schema)
+
+
+class _Payload:
+    """Hasil serialisasi: bytes di memori atau path file sementara."""
+
+    def __init__(self, data=None, path=None, size=0):
+        self.data = data
+        self.path = path
+        self.size = size
+
+    def read(self):
+        if self.data is not None:
+            return self.data
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def discard(self):
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class ExportCache:
+    """Payload unduhan per (kunci, format), dibuat sekali oleh fungsi ``write``."""
+
+    def __init__(self, max_entries=MAX_EXPORTS, spool_max_bytes=SPOOL_MAX_BYTES):
+        self.max_entries = max_entries
+        self.spool_max_bytes = spool_max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Satu lock per kunci: klik bersamaan tidak menserialisasi dua kali
+        self._building = {}
+
+    def get(self, key, fmt, write):
+        """Isi file untuk (``key``, ``fmt``); ``write(sink)`` dipanggil hanya saat belum ada."""
+        entry_key = (key, fmt)
+        with self._lock:
+            payload = self._entries.get(entry_key)
+            metrics.count_cache('export', payload is not None)
+            if payload is not None:
+                self._entries.move_to_end(entry_key)
+                return payload.read()
+            build_lock = self._building.setdefault(entry_key, threading.Lock())
+
+        with build_lock:
+            with self._lock:
+                payload = self._entries.get(entry_key)
+            if payload is None:
+                try:
+                    payload = self._build(fmt, write)
+                except BaseException:
+                    with self._lock:
+                        self._building.pop(entry_key, None)
+                    raise
+                # Entri disimpan sebelum lock build dilepas (satu blok): pemanggil
+                # berikutnya menemukan entri, bukan lock baru tanpa entri
+                with self._lock:
+                    self._entries[entry_key] = payload
+                    self._building.pop(entry_key, None)
+                    while len(self._entries) > self.max_entries:
+                        _, evicted = self._entries.popitem(last=False)
+                        evicted.discard()
+        return payload.read()
+
+    def _build(self, fmt, write):
+        with metrics.timed(f'export_{fmt}'), \
+                tempfile.SpooledTemporaryFile(max_size=self.spool_max_bytes) as spool:
+            write(spool)
+            size = spool.tell()
+            spool.seek(0)
+            if size <= self.spool_max_bytes:
+                return _Payload(data=spool.read(), size=size)
+            # Sudah tumpah ke disk: salin ke file bernama yang bertahan setelah spool ditutup
+            with tempfile.NamedTemporaryFile('wb', suffix=f'.{fmt}', delete=False) as out:
+                shutil.copyfileobj(spool, out)
+            return _Payload(path=out.name, size=size)
+
+    def clear(self):
+        with self._lock:
+            for payload in self._entries.values():
+                payload.discard()
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def downloader(cache, key, fmt, frame_fn, schema_fn=None):
+    """Callable tanpa argumen untuk ``st.download_button(data=...)``.
+
+    ``frame_fn`` (dan ``schema_fn`` untuk Parquet) baru dipanggil saat tombol
+    diklik dan payload untuk ``key`` belum ada di cache.
+    """
+    def write(sink):
+        frame = frame_fn()
+        if fmt == 'csv':
+            write_csv(frame, sink)
+        else:
+            write_parquet(frame, sink, schema_fn() if schema_fn else None)
+    return lambda: cache.get(key, fmt, write)
+
+
+class SessionFile:
+    """File hasil milik satu sesi di ``directory``.
+
+    Simpan objek ini di ``st.session_state``: file dihapus saat objek
+    dibuang (session state sesi yang ditutup/kedaluwarsa ikut dibuang) atau
+    saat ``remove`` dipanggil.
+    """
+
+    def __init__(self, suffix='.csv', directory=STREAM_OUTPUT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(suffix=suffix, dir=directory)
+        os.close(fd)
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+
+    def remove(self):
+        self._finalizer()
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def remove_stale_files(directory=STREAM_OUTPUT_DIR, max_age=STREAM_OUTPUT_MAX_AGE):
+    """Hapus file di ``directory`` yang lebih tua dari ``max_age`` detik; kembalikan jumlahnya."""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            # Sudah dihapus sesi/proses lain
+            pass
+    return removed
+
+
+def file_downloader(path):
+    """Callable yang membaca file hasil (mis. mode streaming) hanya saat diunduh."""
+    def read():
+        with open(path, 'rb') as f:
+            return f.read()
+    return read
@@ -1,11 +1,18 @@
-import streamlit as st
-import pandas as pd
-import joblib
+import startup
 
-# Load model, scaler, dan fitur
-model = joblib.load('random_forest_model.pkl')
-scaler = joblib.load('scaler.pkl')
-feature_names = joblib.load('feature_names.pkl')  # list kolom saat training
+with startup.phase('imports'):
+    import streamlit as st
+
+    import model_watcher
+    import scoring
+
+# Load model, scaler, dan fitur (sekali per proses, dibagi antar sesi).
+# Dimuat di thread latar; form dirender tanpa menunggu model siap.
+@st.cache_resource
+def load_components():
+    return model_watcher.ModelWatcher()
+
+load_components()
 
 st.title("💼 Prediksi Keputusan Hiring Kandidat")
 
@@ -18,52 +25,30 @@ interview_score = st.slider("Skor Interview (0-10)", 0.0, 10.0, 5.0)
 personality_score = st.slider("Skor Kepribadian (0-10)", 0.0, 10.0, 5.0)
 experience_years = st.slider("Pengalaman Kerja (tahun)", 0, 20, 2)
 
-# Buat dataframe kosong dulu
+# Data input, one-hot + urutan fitur ditangani encoder
 input_data = {
     'SkillScore': skill_score,
     'ExperienceYears': experience_years,
     'InterviewScore': interview_score,
     'PersonalityScore': personality_score,
+    'EducationLevel': education_level,
+    'RecruitmentStrategy': recruitment_strategy,
 }
 
-# Tambahkan semua kemungkinan one-hot
-for level in ["1", "2", "3", "4"]:
-    input_data[f'EducationLevel_{level}'] = 1 if education_level == level else 0
-
-for strategy in ["1", "2", "3"]:
-    input_data[f'RecruitmentStrategy_{strategy}'] = 1 if recruitment_strategy == strategy else 0
-
-input_df = pd.DataFrame([input_data])
-
-# Tambahkan kolom kosong (0) jika ada yang hilang dari feature_names
-for col in feature_names:
-    if col not in input_df.columns:
-        input_df[col] = 0
-
-# Urutkan sesuai urutan training
-input_df = input_df[feature_names]
-
-# Scaling numerik
-numerical_cols = ['SkillScore', 'ExperienceYears', 'InterviewScore', 'PersonalityScore']
-input_df = pd.DataFrame(scaler.transform(input_df), columns=input_df.columns)
+startup.mark('first_render')
+bundle = load_components().bundle
 
 # Prediksi
-# if st.button("🔍 Prediksi Sekarang"):
-#     prediction = model.predict(input_df)[0]
-#     prob = model.predict_proba(input_df)[0][prediction]
-
-#     if prediction == 1:
-#         st.success(f"✅ Kandidat kemungkinan **DITERIMA** dengan probabilitas {prob:.2f}")
-#     else:
-#         st.error(f"❌ Kandidat kemungkinan **TIDAK diterima** dengan probabilitas {prob:.2f}")
-
 if st.button("🔍 Prediksi Sekarang"):
-    prediction = model.predict(input_df)[0]
+    # Encoding + scaling + prediksi, di-cache per input dan versi model
+    prediction, proba = scoring.predict_cached(bundle, input_data)
+    # Probabilitas DITERIMA (terkalibrasi jika retrain.py --calibrate)
+    prob = bundle.calibrate(proba[bundle.positive_index])
 
     if prediction == 1:
-        st.success("✅ Kandidat kemungkinan **DITERIMA**")
+        st.success(f"✅ Kandidat kemungkinan **DITERIMA** dengan probabilitas {prob:.2f}")
     else:
-        st.error("❌ Kandidat kemungkinan **TIDAK DITERIMA**")
+        st.error(f"❌ Kandidat kemungkinan **TIDAK DITERIMA** (probabilitas diterima {prob:.2f})")
 
 
 # st.write("Kolom input ke scaler:", input_df.columns.tolist())
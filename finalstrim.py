@@ -1,43 +1,47 @@
-import streamlit as st
-import pandas as pd
-import joblib
-import os
-from datetime import datetime
+import startup
 
-# Load model, scaler, dan fitur
-model = joblib.load('random_forest_model.pkl')
-scaler = joblib.load('scaler.pkl')
-feature_names = joblib.load('feature_names.pkl')
+with startup.phase('imports'):
+    import streamlit as st
+    from datetime import datetime
+
+    import exports
+    import history_store
+    import model_watcher
+    import scoring
+    import table_view
 
 st.set_page_config(page_title="Prediksi Hiring Kandidat", page_icon="💼", layout="wide")
 
+# Load model, scaler, dan fitur (sekali per proses, dibagi antar sesi).
+# Dimuat di thread latar; halaman dirender tanpa menunggu model siap.
+@st.cache_resource
+def load_components():
+    return model_watcher.ModelWatcher()
+
+load_components()
+
 # --- KONFIGURASI FILE RIWAYAT ---
-HISTORY_FILE = 'riwayat_prediksi.csv'
+HISTORY_DB = history_store.HISTORY_DB
+HISTORY_FILE = 'riwayat_prediksi.csv'  # riwayat CSV lama, diimpor sekali ke HISTORY_DB
+HISTORY_PAGE_SIZE = 50
 
-# Fungsi untuk memuat history
-def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try:
-            return pd.read_csv(HISTORY_FILE).to_dict('records')
-        except Exception as e:
-            st.error(f"Error loading history: {e}")
-            return []
-    return []
+# Payload unduhan dibuat saat tombol diklik, sekali per set hasil
+@st.cache_resource
+def get_export_cache():
+    return exports.ExportCache()
 
-# Fungsi untuk menyimpan history
-def save_history():
+@st.cache_resource
+def get_history_store():
+    return history_store.HistoryStore(HISTORY_DB, legacy_csv=HISTORY_FILE)
+
+# Fungsi untuk menyimpan history (append record baru saja, list dict atau DataFrame)
+def save_history(records):
     try:
-        history_df = pd.DataFrame(st.session_state.history)
-        # Buat direktori jika belum ada
-        os.makedirs(os.path.dirname(HISTORY_FILE) or '.', exist_ok=True)
-        history_df.to_csv(HISTORY_FILE, index=False)
+        get_history_store().append(records)
     except Exception as e:
         st.error(f"Gagal menyimpan riwayat: {e}")
 
 # Inisialisasi session state
-if 'history' not in st.session_state:
-    st.session_state.history = load_history()
-
 if 'show_history' not in st.session_state:
     st.session_state.show_history = False
 
@@ -93,77 +97,53 @@ if mode == "Input Manual":
         personality_score = st.slider("🤝 Skor Kepribadian", 0.0, 10.0, 5.0)
         experience_years = st.slider("📅 Pengalaman (tahun)", 0, 20, 2)
 
-    # One-hot encode input
+    # Data input (one-hot dilakukan oleh encoder)
     input_data = {
         'CandidateName': candidate_name,
         'SkillScore': skill_score,
         'ExperienceYears': experience_years,
         'InterviewScore': interview_score,
         'PersonalityScore': personality_score,
+        'EducationLevel': education_level,
+        'RecruitmentStrategy': recruitment_strategy,
         'Timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
 
-    for level in ["1", "2", "3", "4"]:
-        input_data[f'EducationLevel_{level}'] = 1 if education_level == level else 0
-
-    for strategy in ["1", "2", "3"]:
-        input_data[f'RecruitmentStrategy_{strategy}'] = 1 if recruitment_strategy == strategy else 0
-
-    input_df = pd.DataFrame([input_data])
-
 # ======================== CSV MODE ========================
 else:
     st.subheader("📂 Upload CSV Data Kandidat")
     uploaded_file = st.file_uploader("📄 Upload CSV berisi data kandidat", type=["csv"])
 
     if uploaded_file is not None:
+        bundle = load_components().bundle
         try:
-            raw_df = pd.read_csv(uploaded_file)
+            # Scoring di-memo per isi file, rerun tidak men-scoring ulang
+            results_df = scoring.score_csv(uploaded_file.getvalue(), bundle)
             st.success("✅ File berhasil dibaca. Menampilkan beberapa data pertama:")
-            st.dataframe(raw_df.head())
-
-            input_df = raw_df.copy()
-
-            # Pastikan semua kolom yang dibutuhkan ada
-            for level in ["1", "2", "3", "4"]:
-                if f'EducationLevel_{level}' not in input_df.columns:
-                    input_df[f'EducationLevel_{level}'] = 0
-            
-            for strategy in ["1", "2", "3"]:
-                if f'RecruitmentStrategy_{strategy}' not in input_df.columns:
-                    input_df[f'RecruitmentStrategy_{strategy}'] = 0
-            
-            # Tambahkan timestamp
-            input_df['Timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Pastikan semua feature ada
-            for col in feature_names:
-                if col not in input_df.columns and col != 'Timestamp':
-                    input_df[col] = 0
-
-            input_df = input_df[feature_names + ['Timestamp']]
+            st.dataframe(results_df.head())
 
         except Exception as e:
             st.error(f"❌ Error processing CSV file: {e}")
             st.stop()
 
+startup.mark('first_render')
+
 # ======================== PREDIKSI ========================
-if 'input_df' in locals():
+if 'input_data' in locals() or 'results_df' in locals():
     st.markdown("---")
     st.subheader("🔍 Proses Prediksi")
+    bundle = load_components().bundle
 
     try:
-        # Pastikan urutan kolom sesuai dengan scaler
-        input_df = input_df[scaler.feature_names_in_]
-        input_scaled = pd.DataFrame(scaler.transform(input_df), columns=input_df.columns)
-        predictions = model.predict(input_scaled)
-
         if mode == "Input Manual":
+            # Encoding + scaling + prediksi, di-cache per input dan versi model
+            result, proba = scoring.predict_cached(bundle, input_data)
+            probability = bundle.calibrate(proba[bundle.positive_index])
+
             is_valid = st.checkbox("Saya sudah memastikan data di atas benar dan siap diprediksi.")
 
             if st.button("🚀 Jalankan Prediksi"):
                 if is_valid:
-                    result = predictions[0]
                     prediction_text = "DITERIMA" if result == 1 else "TIDAK DITERIMA"
                     color = "#DFF2BF" if result == 1 else "#FFBABA"
                     font_color = "#4F8A10" if result == 1 else "#D8000C"
@@ -171,37 +151,38 @@ if 'input_df' in locals():
                     st.markdown(f"""
                         <div style='background-color:{color};padding:20px;border-radius:10px'>
                             <h3 style='color:{font_color}'>✅ Kandidat kemungkinan <u>{prediction_text}</u></h3>
+                            <p style='color:{font_color}'>Probabilitas diterima: {probability:.2f}</p>
                         </div>
                     """, unsafe_allow_html=True)
 
                     # Simpan ke history
                     input_data['Prediction'] = prediction_text
-                    st.session_state.history.append(input_data)
-                    save_history()
+                    save_history([input_data])
                     st.success("✅ Hasil prediksi disimpan ke riwayat.")
 
                 else:
                     st.warning("⚠️ Silakan centang validasi sebelum melanjutkan.")
 
         else:  # Mode CSV
-            input_df['Prediction'] = ["DITERIMA" if p == 1 else "TIDAK DITERIMA" for p in predictions]
             st.success("✅ Hasil prediksi siap ditinjau:")
-            st.dataframe(input_df)
+            table_view.render(results_df, key='results')
 
             # Tombol download
+            # Diserialisasi saat diklik, sekali per file hasil (bukan setiap rerun)
+            results_key = ('upload', uploaded_file.file_id, bundle.fingerprint)
             st.download_button(
                 label="📥 Download Hasil Prediksi",
-                data=input_df.to_csv(index=False),
+                data=exports.downloader(get_export_cache(), results_key, 'csv',
+                                        lambda: results_df),
                 file_name="hasil_prediksi.csv",
-                mime="text/csv"
+                mime=exports.MIME_TYPES['csv'],
+                on_click="ignore"
             )
 
             # Tombol simpan semua ke history
             if st.button("💾 Simpan Semua ke Riwayat"):
-                records = input_df.to_dict('records')
-                st.session_state.history.extend(records)
-                save_history()
-                st.success(f"✅ {len(records)} prediksi disimpan ke riwayat.")
+                save_history(results_df)
+                st.success(f"✅ {len(results_df)} prediksi disimpan ke riwayat.")
 
     except Exception as e:
         st.error(f"❌ Terjadi kesalahan saat memproses data: {e}")
@@ -211,28 +192,32 @@ if st.session_state.show_history:
     st.markdown("---")
     st.subheader("🗂️ Riwayat Prediksi Kandidat")
     
-    if st.session_state.history:
-        history_df = pd.DataFrame(st.session_state.history)
-        
+    store = get_history_store()
+    n_rows = store.count()
+
+    if n_rows:
         # Tampilkan kolom yang relevan saja
         display_cols = ['Timestamp', 'CandidateName', 'Prediction', 'SkillScore', 
                        'ExperienceYears', 'InterviewScore', 'PersonalityScore']
-        display_cols = [col for col in display_cols if col in history_df.columns]
-        
-        st.dataframe(history_df[display_cols].sort_values('Timestamp', ascending=False))
+        # Paging (keyset) dikerjakan di store; hanya satu halaman yang diambil
+        history_df, _ = table_view.history_page(store, 'history', sort='newest',
+                                                page_size=HISTORY_PAGE_SIZE,
+                                                columns=display_cols)
+        st.dataframe(history_df)
         
-        # Tombol download
+        # Tombol download: seluruh riwayat dimuat dan diserialisasi hanya saat diklik
         st.download_button(
             label="📥 Download Riwayat Lengkap",
-            data=history_df.to_csv(index=False),
+            data=exports.downloader(get_export_cache(), ('history', HISTORY_DB, store.revision()),
+                                    'csv', store.frame),
             file_name="riwayat_prediksi_lengkap.csv",
-            mime="text/csv"
+            mime=exports.MIME_TYPES['csv'],
+            on_click="ignore"
         )
         
         # Tombol hapus riwayat
         if st.button("🗑️ Hapus Semua Riwayat"):
-            st.session_state.history = []
-            save_history()
+            get_history_store().clear()
             st.success("Riwayat telah dihapus")
     else:
         st.info("Belum ada riwayat prediksi yang disimpan.")
@@ -0,0 +1,182 @@
+"""Inferensi RandomForest dari array node datar (tanpa overhead sklearn).
+
+Semua tree dari forest digabung menjadi array kontigu: ``feature``,
+``threshold``, ``left``, ``right`` dan ``value`` (proporsi kelas per node).
+Leaf menunjuk ke dirinya sendiri sehingga evaluasi cukup ``max_depth``
+langkah gather NumPy untuk semua baris x semua tree sekaligus, tanpa loop
+Python per tree. File ekspor disimpan tanpa kompresi agar bisa di-mmap dan
+dibagi antar proses worker.
+
+Nilai NaN dirutekan seperti sklearn (``tree_.missing_go_to_left`` per
+node). File ekspor lama tanpa array tersebut tidak bisa merutekan NaN;
+``supports_missing`` bernilai False dan pemanggil memakai sklearn untuk
+baris berisi NaN.
+"""
+import numpy as np
+import joblib
+
+from atomic import atomic_path
+
+FLAT_FOREST_PATH = 'flat_forest.joblib'
+
+# Di atas jumlah baris ini predict_proba sklearn (Cython, multi-thread) lebih cepat
+MAX_FLAT_ROWS = 256
+
+# Jumlah baris per blok evaluasi (membatasi matriks node n_baris x n_tree)
+BLOCK_ROWS = 2048
+
+
+class FlatForest:
+    """Forest dalam bentuk array node datar; API mirip ``predict_proba``/``predict``."""
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes,
+                 max_depth, version=None, missing_left=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.version = version
+        self.missing_left = missing_left
+
+    @classmethod
+    def from_model(cls, model, version=None):
+        """Ratakan ``RandomForestClassifier`` (atau ``DecisionTreeClassifier``) ter-fit."""
+        trees = [est.tree_ for est in getattr(model, 'estimators_', [model])]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        feature, threshold, left, right, value, missing_left = [], [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            is_leaf = tree.children_left < 0
+            node_ids = np.arange(tree.node_count)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+            left.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            right.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            # Normalisasi ke proporsi kelas (sama seperti predict_proba per tree)
+            counts = tree.value[:, 0, :]
+            value.append(counts / counts.sum(axis=1, keepdims=True))
+            # Arah NaN per node (sklearn >= 1.3); tanpa itu NaN tidak bisa dirutekan
+            missing = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(None if missing is None else np.asarray(missing, dtype=bool))
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(left), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(right), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+            roots=offsets.astype(np.intp),
+            classes=np.asarray(model.classes_),
+            max_depth=max(tree.max_depth for tree in trees),
+            version=version,
+            missing_left=(None if any(m is None for m in missing_left)
+                          else np.ascontiguousarray(np.concatenate(missing_left))),
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def supports_missing(self):
+        """True jika NaN dirutekan sama seperti sklearn."""
+        return self.missing_left is not None
+
+    def _leaves(self, X):
+        # sklearn membandingkan fitur sebagai float32
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat_X = X.ravel()
+        row_base = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        has_missing = self.supports_missing and np.isnan(flat_X).any()
+        for _ in range(self.max_depth):
+            values = flat_X.take(row_base + self.feature.take(node))
+            go_left = values <= self.threshold.take(node)
+            if has_missing:
+                # Seperti sklearn: NaN ke anak kiri/kanan sesuai missing_go_to_left node
+                go_left |= np.isnan(values) & self.missing_left.take(node)
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+        return node
+
+    def predict_proba(self, X):
+        X = np.atleast_2d(X)
+        proba = np.empty((len(X), len(self.classes_)), dtype=np.float64)
+        for start in range(0, len(X), BLOCK_ROWS):
+            stop = start + BLOCK_ROWS
+            proba[start:stop] = self.value[self._leaves(X[start:stop])].mean(axis=1)
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, path=FLAT_FOREST_PATH):
+        arrays = {name: getattr(self, name) for name in
+                  ('feature', 'threshold', 'left', 'right', 'value', 'roots', 'missing_left')}
+        with atomic_path(path) as tmp_path:
+            joblib.dump(dict(arrays, classes=self.classes_, max_depth=self.max_depth,
+                             version=self.version), tmp_path, compress=0)
+
+    @classmethod
+    def load(cls, path=FLAT_FOREST_PATH, mmap_mode='r'):
+        return cls(**joblib.load(path, mmap_mode=mmap_mode))
+
+
+def with_missing(X, max_rows=256):
+    """Salinan baris ``X`` dengan satu fitur diganti NaN (bergiliran per kolom)."""
+    X = np.array(X[:max_rows], dtype=np.float64)
+    if X.size:
+        X[np.arange(len(X)), np.arange(len(X)) % X.shape[1]] = np.nan
+    return X
+
+
+def check_parity(flat, model, X, atol=1e-9):
+    """Bandingkan ``flat.predict_proba`` dengan ``model.predict_proba`` pada ``X``.
+
+    ``X`` ditambah baris berisi NaN (lihat ``with_missing``) jika FlatForest
+    bisa merutekan NaN. Raise AssertionError jika ada selisih; kembalikan
+    selisih absolut maksimum.
+    """
+    if flat.supports_missing:
+        X = np.vstack([X, with_missing(X)])
+    expected = model.predict_proba(X)
+    actual = flat.predict_proba(X)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+    if max_diff > atol:
+        raise AssertionError(f"FlatForest tidak sama dengan model (selisih maks {max_diff:.3g})")
+    if not np.array_equal(flat.predict(X), model.predict(X)):
+        raise AssertionError("Prediksi label FlatForest berbeda dengan model")
+    return max_diff
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    import artifacts
+    import columnar
+    import scoring
+
+    parser = argparse.ArgumentParser(description="Cek parity FlatForest vs model.predict_proba")
+    parser.add_argument('data', help="Data training CSV/Parquet/Arrow (kolom fitur + label)")
+    parser.add_argument('--artifact', default=artifacts.PIPELINE_PATH)
+    args = parser.parse_args()
+
+    bundle = artifacts.load_bundle(args.artifact)
+    X = scoring.transform(bundle, columnar.read_frame(args.data).drop(columns='label', errors='ignore'))
+    flat = FlatForest.from_model(bundle.model)
+    print(f"parity OK, selisih maks {check_parity(flat, bundle.model, X):.3g}")
+
+    for name, predict in [('sklearn', bundle.model.predict_proba), ('flat', flat.predict_proba)]:
+        started = time.perf_counter()
+        for _ in range(200):
+            predict(X[:1])
+        single = (time.perf_counter() - started) / 200
+        started = time.perf_counter()
+        predict(X)
+        batch = time.perf_counter() - started
+        print(f"{name:8s} 1 baris: {single * 1e6:8.1f} us | {len(X):,} baris: {batch * 1000:8.1f} ms")
@@ -0,0 +1,308 @@
+"""Penyimpanan riwayat prediksi berbasis SQLite (mode WAL, append-only).
+
+Menggantikan penulisan ulang seluruh ``riwayat_prediksi.csv`` pada setiap
+simpan: record baru hanya di-INSERT dalam satu transaksi. Mode WAL dan
+busy timeout membuat beberapa sesi Streamlit aman menulis bersamaan.
+Riwayat CSV lama diimpor sekali saat database pertama kali dibuat.
+``export`` menulis seluruh riwayat ke CSV, Parquet, atau Arrow.
+"""
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+import columnar
+
+HISTORY_DB = 'riwayat_prediksi.db'
+LEGACY_HISTORY_CSV = 'riwayat_prediksi.csv'
+
+# Kolom riwayat (urutan tampilan/ekspor) dan tipe SQLite-nya
+HISTORY_COLUMNS = {
+    'CandidateName': 'TEXT',
+    'Timestamp': 'TEXT',
+    'Prediction': 'TEXT',
+    'TotalScore': 'REAL',
+    'SkillScore': 'REAL',
+    'InterviewScore': 'REAL',
+    'PersonalityScore': 'REAL',
+    'ExperienceYears': 'REAL',
+    'EducationLevel': 'TEXT',
+    'RecruitmentStrategy': 'TEXT',
+}
+
+SCORE_COLUMNS = ['SkillScore', 'InterviewScore', 'PersonalityScore', 'ExperienceYears']
+
+# Index tunggal + gabungan (filter Prediction lalu urut) untuk query halaman riwayat;
+# filter Prediction saja tercakup oleh prefix index gabungan
+INDEXES = [
+    ['Timestamp'],
+    ['TotalScore'],
+    ['Prediction', 'TotalScore'],
+    ['Prediction', 'Timestamp'],
+]
+
+# Kolom urut (semua DESC) yang didukung query()/page(); id ditambahkan sebagai
+# tie-breaker agar halaman stabil. Hanya kolom pertama yang boleh NULL (riwayat
+# CSV lama tanpa Timestamp/Prediction); TotalScore selalu dilengkapi _project.
+SORT_KEYS = {
+    'newest': ['Timestamp'],
+    'total_score': ['TotalScore'],
+    'eligibility': ['Prediction', 'TotalScore'],
+}
+SORT_ORDERS = {sort: ', '.join(f'"{column}" DESC' for column in keys) + ', id DESC'
+               for sort, keys in SORT_KEYS.items()}
+
+
+class HistoryStore:
+    """Riwayat prediksi di satu file SQLite; satu koneksi per thread."""
+
+    def __init__(self, path=HISTORY_DB, legacy_csv=LEGACY_HISTORY_CSV):
+        self.path = path
+        self._local = threading.local()
+
+        # Frame bersama untuk pembaca riwayat penuh, diperbarui secara inkremental
+        self._frame = None
+        self._frame_revision = None
+        self._frame_lock = threading.Lock()
+
+        # Hasil count() per filter untuk satu revisi (dibagi antar sesi)
+        self._counts = {}
+        self._count_revision = None
+        self._count_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        is_new = not os.path.exists(path)
+        self._create_schema()
+        if is_new and legacy_csv and os.path.exists(legacy_csv):
+            self.append(columnar.read_frame(legacy_csv))
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        columns = ', '.join(f'"{name}" {sql_type}' for name, sql_type in HISTORY_COLUMNS.items())
+        with self.conn:
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})")
+            for indexed in INDEXES:
+                name = '_'.join(column.lower() for column in indexed)
+                quoted = ', '.join(f'"{column}"' for column in indexed)
+                self.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS idx_history_{name} ON history ({quoted})')
+
+    def append(self, records):
+        """Tambahkan record dalam satu transaksi; kembalikan jumlahnya.
+
+        ``records`` boleh list dict atau DataFrame (mis. ``results_df`` hasil
+        scoring apa adanya). Proyeksi kolom dikerjakan secara vektor; kolom
+        di luar HISTORY_COLUMNS diabaikan.
+        """
+        frame = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(records)
+        if frame.empty:
+            return 0
+        rows = self._project(frame).itertuples(index=False, name=None)
+        columns = ', '.join(f'"{name}"' for name in HISTORY_COLUMNS)
+        placeholders = ', '.join('?' for _ in HISTORY_COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO history ({columns}) VALUES ({placeholders})", rows)
+        return len(frame)
+
+    @staticmethod
+    def _project(frame):
+        projected = frame.reindex(columns=list(HISTORY_COLUMNS))
+        for name, sql_type in HISTORY_COLUMNS.items():
+            if sql_type == 'REAL':
+                projected[name] = pd.to_numeric(projected[name], errors='coerce')
+
+        # Lengkapi TotalScore seperti tampilan riwayat lama
+        total_score = projected[SCORE_COLUMNS].fillna(0).sum(axis=1)
+        projected['TotalScore'] = projected['TotalScore'].fillna(total_score)
+
+        # NaN -> NULL; dtype object agar nilai terikat sebagai tipe Python
+        return projected.astype(object).where(projected.notna(), None)
+
+    def revision(self):
+        """(id pertama, id terakhir); berubah setiap append/clear.
+
+        id AUTOINCREMENT tidak pernah dipakai ulang, sehingga clear() selalu
+        mengubah id pertama dan append selalu menaikkan id terakhir.
+        """
+        # Dua subquery: MIN dan MAX dalam satu SELECT memindai seluruh tabel,
+        # masing-masing sendiri cukup satu lookup di ujung primary key
+        return self.conn.execute(
+            "SELECT (SELECT MIN(id) FROM history), (SELECT MAX(id) FROM history)").fetchone()
+
+    def frame(self):
+        """Seluruh riwayat sebagai DataFrame kolumnar yang dibagi antar sesi.
+
+        Hanya record baru yang dibaca dari database; seluruh frame dimuat ulang
+        hanya setelah clear(). Frame yang dikembalikan jangan dimodifikasi.
+        """
+        with self._frame_lock:
+            # revision() dibaca di dalam lock: panggilan yang selesai belakangan
+            # tidak bisa menimpa frame dengan revisi yang lebih lama
+            revision = self.revision()
+            if self._frame is not None and _not_newer(revision, self._frame_revision):
+                return self._frame
+
+            # Dibatasi id <= last_id: record yang di-append setelah revision() dibaca
+            # pada panggilan berikutnya, bukan dua kali
+            columns = ', '.join(f'"{name}"' for name in HISTORY_COLUMNS)
+            first_id, last_id = revision
+            if self._frame is None or first_id is None or first_id != self._frame_revision[0]:
+                frame = pd.read_sql_query(
+                    f"SELECT {columns} FROM history WHERE id <= ? ORDER BY id", self.conn,
+                    params=(last_id,))
+            else:
+                new_rows = pd.read_sql_query(
+                    f"SELECT {columns} FROM history WHERE id > ? AND id <= ? ORDER BY id",
+                    self.conn, params=(self._frame_revision[1], last_id))
+                frame = pd.concat([self._frame, new_rows], ignore_index=True)
+
+            self._frame, self._frame_revision = frame, revision
+            return frame
+
+    def export(self, path):
+        """Simpan seluruh riwayat ke ``path`` (format dari ekstensi; kolumnar bertipe)."""
+        schema = columnar.history_schema() if columnar.is_columnar(path) else None
+        columnar.write_frame(self.frame(), path, schema)
+
+    def query(self, prediction=None, sort='newest', limit=None, offset=0, columns=None):
+        """Satu halaman riwayat: filter + urut + LIMIT/OFFSET dikerjakan SQLite.
+
+        ``prediction`` None berarti semua; ``sort`` salah satu kunci SORT_ORDERS.
+        """
+        columns = ', '.join(f'"{name}"' for name in (columns or HISTORY_COLUMNS))
+        where, params = self._where(prediction)
+        sql = f"SELECT {columns} FROM history{where} ORDER BY {SORT_ORDERS[sort]}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += (limit, offset)
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def page(self, prediction=None, sort='newest', limit=50, after=None, before=None,
+             last=False, columns=None):
+        """Satu halaman dengan keyset pagination; kembalikan (frame, cursor awal, cursor akhir).
+
+        Tanpa argumen posisi: halaman pertama. ``after``: cursor akhir halaman
+        sebelumnya (halaman berikutnya); ``before``: cursor awal halaman
+        sesudahnya (halaman sebelumnya); ``last``: ``limit`` baris terakhir.
+        Cursor adalah tuple nilai kolom urut + id. Setiap halaman dicari lewat
+        index (O(log n + limit)), berbeda dengan OFFSET yang melewati semua
+        baris sebelumnya.
+        """
+        keys = SORT_KEYS[sort] + ['id']
+        columns = list(columns or HISTORY_COLUMNS)
+        selected = ', '.join(f'"{name}"' for name in dict.fromkeys(columns + keys))
+
+        # Urutan tampilan DESC menaruh NULL di akhir; arah mundur memakai ASC
+        forward = before is None and not last
+        cursor = after if after is not None else before
+        segments = [([], ())]
+        if cursor is not None:
+            lead, rest = keys[0], keys[1:]
+            if cursor[0] is None:
+                # Cursor di bagian NULL: sisa bagian NULL, lalu (mundur) seluruh non-NULL
+                segments = [([f'"{lead}" IS NULL', _row_compare(rest, forward)], cursor[1:])]
+                if not forward:
+                    segments.append(([f'"{lead}" IS NOT NULL'], ()))
+            else:
+                segments = [([_row_compare(keys, forward)], tuple(cursor))]
+                if forward:
+                    segments.append(([f'"{lead}" IS NULL'], ()))
+
+        direction = 'DESC' if forward else 'ASC'
+        order = ', '.join(f'"{name}" {direction}' for name in keys)
+        frames, remaining = [], limit
+        for conditions, cursor_params in segments:
+            if remaining <= 0:
+                break
+            where, params = self._where(prediction, *conditions)
+            sql = f"SELECT {selected} FROM history{where} ORDER BY {order} LIMIT ?"
+            frame = pd.read_sql_query(sql, self.conn,
+                                      params=params + tuple(cursor_params) + (remaining,))
+            if len(frame) or not frames:
+                frames.append(frame)
+            remaining -= len(frame)
+
+        frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if not forward:
+            frame = frame.iloc[::-1].reset_index(drop=True)
+        if frame.empty:
+            return frame[columns], None, None
+        return frame[columns], _cursor(frame, keys, 0), _cursor(frame, keys, -1)
+
+    def count(self, prediction=None):
+        """Jumlah record (terfilter), di-cache per revisi: rerun tanpa append
+        tidak menjalankan COUNT(*) lagi."""
+        revision = self.revision()
+        with self._count_lock:
+            if self._count_revision != revision:
+                self._counts, self._count_revision = {}, revision
+            if prediction in self._counts:
+                return self._counts[prediction]
+
+        if revision[1] is None:
+            n_rows = 0
+        else:
+            # Dibatasi id <= last_id agar hitungan sesuai revisi yang menjadi kuncinya
+            where, params = self._where(prediction, 'id <= ?')
+            n_rows = self.conn.execute(f"SELECT COUNT(*) FROM history{where}",
+                                       params + (revision[1],)).fetchone()[0]
+        with self._count_lock:
+            if self._count_revision == revision:
+                self._counts[prediction] = n_rows
+        return n_rows
+
+    @staticmethod
+    def _where(prediction, *conditions):
+        """Klausa WHERE filter Prediction + kondisi tambahan; kembalikan (sql, params filter)."""
+        clauses = [condition for condition in conditions if condition]
+        params = ()
+        if prediction is not None:
+            clauses.insert(0, '"Prediction" = ?')
+            params = (prediction,)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM history")
+
+
+def _not_newer(revision, cached):
+    """True jika ``revision`` tidak menambah record di atas frame ``cached``."""
+    if revision == cached:
+        return True
+    return (revision[0] is not None and revision[0] == cached[0]
+            and revision[1] <= cached[1])
+
+
+def _row_compare(columns, forward):
+    """Perbandingan row value kolom urut vs cursor (searchable lewat index)."""
+    if not columns:
+        return None
+    quoted = ', '.join(f'"{name}"' for name in columns)
+    placeholders = ', '.join('?' for _ in columns)
+    return f"({quoted}) {'<' if forward else '>'} ({placeholders})"
+
+
+def _cursor(frame, keys, position):
+    """Cursor baris ``position`` untuk page(): nilai Python (sqlite3 tidak bisa
+    mengikat skalar NumPy), NaN -> None."""
+    cursor = []
+    for value in frame[keys].iloc[position]:
+        if pd.isna(value):
+            value = None
+        elif hasattr(value, 'item'):
+            value = value.item()
+        cursor.append(value)
+    return tuple(cursor)
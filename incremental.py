@@ -0,0 +1,103 @@
+"""Retrain inkremental dari data berlabel baru (mis. riwayat prediksi yang
+hasil rekrutmennya sudah diketahui).
+
+Dua mode, keduanya biayanya sebanding dengan data baru, bukan total data:
+
+* ``grow_forest``: forest ditambah pohon baru (``warm_start``) yang hanya
+  dilatih pada baris baru. Scaler lama tetap dipakai (tidak di-``partial_fit``)
+  sehingga split pohon lama tidak berubah sama sekali; pohon tidak
+  terpengaruh skala fitur, jadi pohon baru pun tidak dirugikan.
+* ``refit_window``: pipeline (termasuk scaler) dilatih ulang hanya pada
+  ``window`` baris terakhir; dipakai juga untuk model non-forest (SVC/KNN).
+"""
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+
+import columnar
+from scoring import COLUMN_MAPPING
+
+# Nama kolom label yang diterima; HiringDecision sesuai dataset asli
+LABEL_COLUMNS = ['label', 'HiringDecision']
+
+
+def load_labeled(path, encoder):
+    """CSV kandidat berlabel (format upload/riwayat) -> (X one-hot, y)."""
+    raw_df = columnar.read_frame(path).rename(columns=COLUMN_MAPPING)
+    label_col = next((col for col in LABEL_COLUMNS if col in raw_df.columns), None)
+    if label_col is None:
+        raise ValueError(f"Kolom label tidak ditemukan: {' / '.join(LABEL_COLUMNS)}")
+
+    # Riwayat menyimpan label teks; sisanya dianggap 0/1
+    labels = raw_df[label_col].replace({'DITERIMA': 1, 'TIDAK DITERIMA': 0})
+    y = pd.to_numeric(labels, errors='raise').astype(int).rename('label')
+    X = encoder.to_frame(encoder.transform(raw_df))
+    return X, y.reset_index(drop=True)
+
+
+def append_training_data(path, X, y):
+    """Tambahkan baris baru ke akhir CSV training tanpa menulis ulang isinya."""
+    frame = X.assign(label=y.to_numpy())
+    exists = os.path.exists(path)
+    if columnar.is_columnar(path):
+        # Parquet/Arrow tidak bisa di-append di tempat: tulis ulang dengan skema bertipe
+        if exists:
+            existing = columnar.read_frame(path, memory_map=False)
+            if existing.columns.tolist() != frame.columns.tolist():
+                raise ValueError(f"Kolom {path} tidak cocok dengan fitur model")
+            frame = pd.concat([existing, frame], ignore_index=True)
+        columnar.write_frame(frame, path, columnar.feature_schema(X.columns, label=True))
+        return
+    if exists:
+        header = pd.read_csv(path, nrows=0).columns.tolist()
+        if header != frame.columns.tolist():
+            raise ValueError(f"Kolom {path} tidak cocok dengan fitur model")
+    frame.to_csv(path, mode='a', header=not exists, index=False)
+
+
+def grow_forest(pipeline, X_new, y_new, n_new_trees=20):
+    """Tambahkan ``n_new_trees`` pohon yang dilatih pada data baru (scaler tetap)."""
+    scaler = pipeline.named_steps['scaler']
+    model = pipeline.named_steps['model']
+    if not hasattr(model, 'estimators_'):
+        raise ValueError(f"{type(model).__name__} tidak mendukung penambahan pohon; "
+                         "gunakan --window")
+    if len(np.unique(y_new)) < len(model.classes_):
+        raise ValueError("Data baru harus memuat semua kelas label untuk melatih pohon baru")
+
+    X_encoded = pipeline.named_steps['encoder'].transform(X_new)
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
+    model.fit(scaler.transform(X_encoded), y_new)
+    model.set_params(warm_start=False)
+    return pipeline
+
+
+def grown_out_of_fold_proba(pipeline, X_new, y_new, n_new_trees=20, n_splits=5,
+                            random_state=42):
+    """Probabilitas positif out-of-fold untuk forest yang ditambah pohon.
+
+    Setiap fold ``X_new`` di-scoring oleh salinan ``pipeline`` (sebelum
+    ``grow_forest``) yang pohon barunya dilatih pada fold lain; pohon lama
+    tidak pernah melihat data baru. Dipakai untuk fit ulang calibrator,
+    karena rata-rata forest berubah setelah pohon baru ditambahkan.
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    proba = np.empty(len(X_new), dtype=np.float64)
+    for train, test in cv.split(X_new, y_new):
+        grown = grow_forest(copy.deepcopy(pipeline), X_new.iloc[train], y_new.iloc[train],
+                            n_new_trees)
+        positive = list(grown.named_steps['model'].classes_).index(1)
+        proba[test] = grown.predict_proba(X_new.iloc[test])[:, positive]
+    return proba
+
+
+def refit_window(pipeline, data_path, window):
+    """Latih ulang pipeline pada ``window`` baris terakhir; kembalikan (pipeline, X, y)."""
+    df = columnar.read_frame(data_path).tail(window)
+    X, y = df.drop("label", axis=1), df["label"]
+    pipeline.fit(X, y)
+    return pipeline, X, y
@@ -0,0 +1,115 @@
+"""Baca banyak file upload sekaligus: CSV, CSV ter-gzip, Parquet/Arrow, dan arsip zip.
+
+Setiap file (termasuk setiap CSV di dalam zip) didekompresi dan di-parse
+di thread pool; parser C pandas dan zlib melepas GIL sehingga beberapa
+file diproses bersamaan. Fungsi ``prepare`` opsional (mis. normalisasi
+kolom) dijalankan per file di worker yang sama. File yang gagal dicatat
+beserta pesannya tanpa menghentikan file lain.
+"""
+import gzip
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import columnar
+import metrics
+
+UPLOAD_TYPES = ['csv', 'gz', 'zip'] + columnar.UPLOAD_TYPES
+READABLE_SUFFIXES = ('.csv', '.csv.gz') + columnar.PARQUET_SUFFIXES + columnar.ARROW_SUFFIXES
+
+# Pesan untuk file dengan header tetapi tanpa baris (juga dipakai mode streaming)
+EMPTY_FILE_MESSAGE = "file tidak berisi baris data"
+
+# Batas thread parse (I/O + parser C; tidak perlu lebih banyak dari jumlah file)
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+class UploadError(ValueError):
+    """Satu file upload tidak bisa dibaca; ``name`` adalah nama file/anggota zip."""
+
+    def __init__(self, name, message):
+        super().__init__(f"{name}: {message}")
+        self.name = name
+        self.message = message
+
+
+def expand_uploads(files):
+    """(nama, bytes) per file upload -> (nama, fungsi pembuka) per file data.
+
+    Anggota zip diberi nama ``arsip.zip/anggota.csv``; anggota yang bukan
+    CSV/Parquet/Arrow dilewati. Dekompresi ditunda ke worker (fungsi pembuka).
+    """
+    sources, errors = [], []
+    for name, data in files:
+        lower = name.lower()
+        if lower.endswith('.zip'):
+            try:
+                with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                    members = [info.filename for info in archive.infolist()
+                               if not info.is_dir()
+                               and not info.filename.startswith('__MACOSX/')
+                               and info.filename.lower().endswith(READABLE_SUFFIXES)]
+            except zipfile.BadZipFile as e:
+                errors.append(UploadError(name, f"arsip zip tidak valid ({e})"))
+                continue
+            if not members:
+                errors.append(UploadError(name, "arsip tidak berisi file data"))
+            for member in members:
+                sources.append((f"{name}/{member}", _zip_opener(data, member)))
+        else:
+            sources.append((name, _bytes_opener(data)))
+    return sources, errors
+
+
+def _zip_opener(archive_bytes, member):
+    def open_member():
+        # ZipFile sendiri per worker (handle ZipFile tidak thread-safe);
+        # BytesIO atas bytes tidak menyalin isi arsip
+        with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+            data = archive.read(member)
+        return gzip.decompress(data) if member.lower().endswith('.gz') else data
+    return open_member
+
+
+def _bytes_opener(data):
+    def open_file():
+        return gzip.decompress(data) if data[:2] == b'\x1f\x8b' else data
+    return open_file
+
+
+def _parse(name, opener, prepare):
+    try:
+        fmt = columnar.file_format(name)
+        with metrics.timed('csv_parse' if fmt == 'csv' else 'columnar_read') as timer:
+            frame = columnar.read_frame(opener(), fmt)
+            timer.rows = len(frame)
+        if frame.empty:
+            raise ValueError(EMPTY_FILE_MESSAGE)
+        return frame if prepare is None else prepare(frame)
+    except Exception as e:
+        # Pesan per file; file lain tetap diproses
+        raise UploadError(name, str(e)) from e
+
+
+def read_uploads(files, prepare=None, workers=None):
+    """Parse semua file upload secara paralel.
+
+    ``files`` adalah iterable (nama, bytes). Mengembalikan list (nama, DataFrame)
+    sesuai urutan upload (anggota zip sesuai urutan arsip) dan list
+    ``UploadError`` untuk file yang gagal.
+    """
+    sources, errors = expand_uploads(files)
+    frames = []
+    if not sources:
+        return frames, errors
+
+    workers = workers or min(MAX_WORKERS, len(sources))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='upload-parse') as pool:
+        futures = [(name, pool.submit(_parse, name, opener, prepare)) for name, opener in sources]
+        for name, future in futures:
+            try:
+                frames.append((name, future.result()))
+            except UploadError as e:
+                errors.append(e)
+    return frames, errors
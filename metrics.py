@@ -0,0 +1,159 @@
+"""Instrumentasi ringan jalur prediksi dan riwayat (format teks Prometheus).
+
+Registry per proses (dibagi semua sesi Streamlit):
+
+    hiring_stage_seconds{stage}          histogram latensi per tahap
+    hiring_stage_rows_total{stage}       jumlah baris yang diproses per tahap
+    hiring_cache_requests_total{cache,result}  hit/miss cache hasil
+
+Pemakaian::
+
+    with metrics.timed('csv_parse') as timer:
+        raw_df = pd.read_csv(...)
+        timer.rows = len(raw_df)
+
+``serve(port)`` mengekspor ``GET /metrics`` di thread latar.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 9108
+
+# Batas atas bucket histogram (detik)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_stages = {}   # stage -> {'buckets': [...], 'sum': detik, 'count': n, 'rows': n}
+_cache = {}    # (cache, 'hit'|'miss') -> n
+
+
+class _Timer:
+    __slots__ = ('rows',)
+
+    def __init__(self, rows):
+        self.rows = rows
+
+
+@contextmanager
+def timed(stage, rows=0):
+    """Catat durasi (dan ``rows`` opsional) satu tahap; tahap yang gagal tidak dicatat."""
+    timer = _Timer(rows)
+    started = time.perf_counter()
+    yield timer
+    observe(stage, time.perf_counter() - started, timer.rows)
+
+
+def observe(stage, seconds, rows=0):
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0,
+                                      'rows': 0}
+        index = bisect.bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            entry['buckets'][index] += 1
+        entry['sum'] += seconds
+        entry['count'] += 1
+        entry['rows'] += rows
+
+
+def count_cache(cache, hit):
+    key = (cache, 'hit' if hit else 'miss')
+    with _lock:
+        _cache[key] = _cache.get(key, 0) + 1
+
+
+def snapshot():
+    """Ringkasan untuk panel admin: per tahap dan hit rate per cache."""
+    with _lock:
+        stages = {stage: dict(entry, buckets=list(entry['buckets']))
+                  for stage, entry in _stages.items()}
+        cache = dict(_cache)
+
+    summary = {}
+    for stage, entry in stages.items():
+        summary[stage] = {
+            'count': entry['count'],
+            'rows': entry['rows'],
+            'mean_ms': entry['sum'] / entry['count'] * 1000,
+            'p95_ms': _quantile(entry, 0.95) * 1000,
+        }
+    hit_rates = {}
+    for name in {name for name, _ in cache}:
+        hits, misses = cache.get((name, 'hit'), 0), cache.get((name, 'miss'), 0)
+        hit_rates[name] = {'hits': hits, 'misses': misses,
+                           'hit_rate': hits / (hits + misses) if hits + misses else 0.0}
+    return summary, hit_rates
+
+
+def _quantile(entry, q):
+    """Batas atas bucket yang memuat kuantil ``q`` (perkiraan kasar)."""
+    target = q * entry['count']
+    cumulative = 0
+    for bound, n in zip(BUCKETS, entry['buckets']):
+        cumulative += n
+        if cumulative >= target:
+            return bound
+    return float('inf')
+
+
+def render():
+    """Seluruh metrik dalam format teks Prometheus (text/plain; version=0.0.4)."""
+    with _lock:
+        stages = sorted((stage, dict(entry, buckets=list(entry['buckets'])))
+                        for stage, entry in _stages.items())
+        cache = sorted(_cache.items())
+
+    lines = ['# HELP hiring_stage_seconds Latensi per tahap prediksi/riwayat.',
+             '# TYPE hiring_stage_seconds histogram']
+    for stage, entry in stages:
+        cumulative = 0
+        for bound, n in zip(BUCKETS, entry['buckets']):
+            cumulative += n
+            lines.append(f'hiring_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'hiring_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {entry["count"]}')
+        lines.append(f'hiring_stage_seconds_sum{{stage="{stage}"}} {entry["sum"]}')
+        lines.append(f'hiring_stage_seconds_count{{stage="{stage}"}} {entry["count"]}')
+
+    lines += ['# HELP hiring_stage_rows_total Jumlah baris yang diproses per tahap.',
+              '# TYPE hiring_stage_rows_total counter']
+    lines += [f'hiring_stage_rows_total{{stage="{stage}"}} {entry["rows"]}'
+              for stage, entry in stages]
+
+    lines += ['# HELP hiring_cache_requests_total Hit/miss cache.',
+              '# TYPE hiring_cache_requests_total counter']
+    lines += [f'hiring_cache_requests_total{{cache="{name}",result="{result}"}} {n}'
+              for (name, result), n in cache]
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _cache.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=DEFAULT_PORT, host='127.0.0.1'):
+    """Jalankan endpoint ``/metrics`` di thread daemon; kembalikan server-nya."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
@@ -0,0 +1,177 @@
+"""Hot reload model tanpa restart server Streamlit.
+
+``ModelWatcher`` memegang ``ModelBundle`` yang sedang dilayani dan sebuah
+thread latar yang memeriksa mtime/ukuran file artefak. Jika berubah (mis.
+setelah retrain.py), bundle baru dimuat dan divalidasi di thread tersebut,
+lalu referensi bundle aktif diganti dalam satu assignment. Prediksi
+yang sedang berjalan tetap memakai bundle lama yang sudah dipegangnya;
+request berikutnya otomatis memakai versi baru.
+
+Muat awal juga berjalan di thread latar, sehingga aplikasi bisa merender
+halaman pertama sementara sklearn diimpor dan artefak di-unpickle; akses
+``watcher.bundle`` baru menunggu jika model belum siap.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+import artifacts
+import scoring
+import startup
+from calibration import CALIBRATION_PATH
+from decision_table import DECISION_TABLE_PATH, DecisionTable
+from flat_forest import FLAT_FOREST_PATH, check_parity
+
+DEFAULT_INTERVAL = 2.0
+
+
+def validate_bundle(bundle):
+    """Scoring satu kandidat contoh; raise ValueError jika hasilnya tidak wajar."""
+    probe = dict({col: 1.0 for col in scoring.REQUIRED_COLUMNS},
+                 EducationLevel=1, RecruitmentStrategy=1)
+    X = scoring.transform(bundle, probe)
+    proba = bundle.model.predict_proba(X)
+    if proba.shape != (1, len(bundle.model.classes_)) or not np.all(np.isfinite(proba)):
+        raise ValueError(f"Output predict_proba tidak valid: {proba!r}")
+    if not np.isclose(proba.sum(), 1.0):
+        raise ValueError(f"Probabilitas tidak berjumlah 1: {proba!r}")
+    if bundle.flat_forest is not None:
+        # Termasuk baris contoh berisi NaN (perutean nilai hilang)
+        try:
+            check_parity(bundle.flat_forest, bundle.model, X)
+        except AssertionError as e:
+            raise ValueError(f"FlatForest tidak cocok dengan model: {e}") from e
+    if bundle.decision_table is not None:
+        found = bundle.decision_table.lookup(probe)
+        if found is None or not np.allclose(found[1], proba[0], atol=1e-6):
+            raise ValueError("Tabel keputusan tidak cocok dengan model")
+    if bundle.calibrator is not None:
+        calibrated = bundle.calibrate(np.array([0.0, proba[0, bundle.positive_index], 1.0]))
+        if not np.all((calibrated >= 0) & (calibrated <= 1)):
+            raise ValueError(f"Output calibrator tidak valid: {calibrated!r}")
+
+
+class ModelWatcher:
+    """Bundle aktif + thread latar yang memuat ulang artefak saat file berubah."""
+
+    def __init__(self, path=artifacts.PIPELINE_PATH, model_path=artifacts.MODEL_PATH,
+                 scaler_path=artifacts.SCALER_PATH, features_path=artifacts.FEATURES_PATH,
+                 interval=DEFAULT_INTERVAL, start=True, build_table=False):
+        self._load_kwargs = dict(path=path, model_path=model_path, scaler_path=scaler_path,
+                                 features_path=features_path)
+        self.table_path = os.path.join(os.path.dirname(path), DECISION_TABLE_PATH)
+        self.paths = [path, os.path.join(os.path.dirname(path), FLAT_FOREST_PATH),
+                      self.table_path, os.path.join(os.path.dirname(path), CALIBRATION_PATH),
+                      model_path, scaler_path, features_path]
+        self.build_table = build_table
+        self.interval = interval
+        self.reloads = 0
+        self.last_error = None
+        self._bundle = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._stamp = self._file_stamp()
+
+        self._thread = None
+        if start:
+            self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+            self._thread.start()
+        else:
+            self._initial_load()
+
+    @property
+    def bundle(self):
+        """Bundle aktif; menunggu muat awal selesai, raise jika muat awal gagal."""
+        self._ready.wait()
+        if self._bundle is None:
+            raise RuntimeError(self.last_error)
+        return self._bundle
+
+    @property
+    def version(self):
+        """Versi bundle aktif tanpa menunggu; None jika belum (atau gagal) dimuat."""
+        bundle = self._bundle
+        return bundle.version if bundle is not None else None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def _initial_load(self):
+        started = time.perf_counter()
+        try:
+            self._bundle = self._load()
+        except Exception as e:
+            # Dicoba lagi oleh check() setelah file artefak berubah
+            self.last_error = f"{type(e).__name__}: {e}"
+        else:
+            startup.record('artifact_load', time.perf_counter() - started)
+        finally:
+            self._ready.set()
+
+    def _load(self):
+        bundle = artifacts.load_bundle(**self._load_kwargs)
+        validate_bundle(bundle)
+        return bundle
+
+    def _file_stamp(self):
+        stamp = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamp)
+
+    def check(self):
+        """Muat ulang jika file artefak berubah; kembalikan True jika bundle diganti."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        try:
+            bundle = self._load()
+        except Exception as e:
+            # Bundle lama tetap dilayani; dicoba lagi setelah file berubah lagi
+            self.last_error = f"{type(e).__name__}: {e}"
+            self._stamp = stamp
+            return False
+
+        self._bundle = bundle
+        self._stamp = stamp
+        self.last_error = None
+        self.reloads += 1
+        return True
+
+    def _ensure_table(self):
+        """Bangun tabel keputusan untuk bundle aktif jika diminta dan belum ada.
+
+        File baru terdeteksi oleh check() berikutnya, yang memuat ulang bundle
+        beserta tabelnya.
+        """
+        bundle = self._bundle
+        if (not self.build_table or bundle is None or bundle.decision_table is not None
+                or bundle.version == 'legacy'):
+            return
+        if DecisionTable.stored_version(self.table_path) == bundle.version:
+            # Sudah dibangun worker lain atau retrain.py; dimuat oleh check() berikutnya
+            return
+        try:
+            DecisionTable.build(bundle).save(self.table_path)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+
+    def _run(self):
+        self._initial_load()
+        self._ensure_table()
+        while not self._stop.wait(self.interval):
+            if self.check():
+                self._ensure_table()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
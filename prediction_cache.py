@@ -0,0 +1,47 @@
+"""Cache LRU + TTL untuk hasil prediksi per kandidat (dibagi antar sesi).
+
+Dipakai mode "Input Manual": ruang input kecil (slider 0-10, 0-20 tahun,
+4 pendidikan, 3 strategi) sehingga kombinasi yang sama sering muncul lagi
+di rerun berikutnya atau di sesi lain.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Mapping terbatas ``maxsize`` entri; entri kedaluwarsa setelah ``ttl`` detik."""
+
+    def __init__(self, maxsize=4096, ttl=3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Nilai untuk ``key`` atau None jika tidak ada / sudah kedaluwarsa."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
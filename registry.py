@@ -0,0 +1,265 @@
+"""Registry model lokal: beberapa artefak berversi yang bisa dimuat berdampingan.
+
+Struktur direktori::
+
+    model/registry/registry.json                 manifest (entri, model live, shadow)
+    model/registry/<nama>/<versi>/hiring_pipeline.joblib   (+ flat_forest/calibration)
+
+Setiap ``add`` menulis versi baru di direktori sendiri; manifest menunjuk
+versi terakhir per nama. Model live tetap dilayani dari ``PIPELINE_PATH``
+yang dipantau ``ModelWatcher``: ``promote`` menyalin artefak entri ke
+sana sehingga watcher memuat ulang tanpa restart server. Entri yang
+ditandai shadow dimuat ``load_shadows`` dan men-scoring batch yang sama
+dengan model live di thread latar (lihat shadow.py).
+
+    python registry.py add forest --from model/hiring_pipeline.joblib
+    python registry.py add logreg --model logreg --calibrate sigmoid
+    python registry.py shadow logreg nb
+    python registry.py list
+    python registry.py promote logreg
+"""
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+
+import artifacts
+import calibration
+from atomic import atomic_path
+from calibration import CALIBRATION_PATH
+from decision_table import DECISION_TABLE_PATH
+from flat_forest import FLAT_FOREST_PATH, FlatForest
+
+REGISTRY_DIR = os.path.join(artifacts.ARTIFACT_DIR, 'registry')
+MANIFEST_NAME = 'registry.json'
+
+# File pendamping yang ikut disalin bersama artefak pipeline (dicek versinya saat dimuat)
+COMPANION_FILES = [FLAT_FOREST_PATH, DECISION_TABLE_PATH, CALIBRATION_PATH]
+
+# Model kandidat dari Hypertuning.ipynb (parameter default notebook)
+CANDIDATE_MODELS = ['rf', 'logreg', 'svc', 'knn', 'nb', 'tree']
+
+_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+
+def build_candidate(kind):
+    """Estimator belum di-fit untuk ``kind`` (lihat ``CANDIDATE_MODELS``)."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.svm import SVC
+    from sklearn.tree import DecisionTreeClassifier
+
+    candidates = {
+        'rf': lambda: RandomForestClassifier(random_state=42),
+        'logreg': lambda: LogisticRegression(max_iter=1000),
+        'svc': lambda: SVC(probability=True, random_state=42),
+        'knn': KNeighborsClassifier,
+        'nb': GaussianNB,
+        'tree': lambda: DecisionTreeClassifier(random_state=42),
+    }
+    if kind not in candidates:
+        raise ValueError(f"Model tidak dikenal: {kind} (pilihan: {', '.join(CANDIDATE_MODELS)})")
+    return candidates[kind]()
+
+
+class ModelRegistry:
+    """Manifest JSON + direktori artefak per (nama, versi)."""
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+
+    def _read(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'live': None, 'shadows': [], 'models': {}}
+
+    def _write(self, manifest):
+        os.makedirs(self.root, exist_ok=True)
+        # Tulis ke file sementara lalu rename agar pembaca tidak melihat manifest setengah jadi
+        with atomic_path(self.manifest_path) as tmp_path:
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+    def entries(self):
+        """{nama: {'version', 'path', 'model', 'created'}} untuk semua entri."""
+        return self._read()['models']
+
+    @property
+    def live(self):
+        return self._read()['live']
+
+    @property
+    def shadows(self):
+        return list(self._read()['shadows'])
+
+    def path(self, name):
+        """Path artefak pipeline versi terakhir ``name``; KeyError jika tidak terdaftar."""
+        entries = self.entries()
+        if name not in entries:
+            raise KeyError(f"Model tidak terdaftar di registry: {name}")
+        return entries[name]['path']
+
+    def _add_entry(self, name, version, path, model_name):
+        manifest = self._read()
+        manifest['models'][name] = {
+            'version': version,
+            'path': path,
+            'model': model_name,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        }
+        self._write(manifest)
+
+    def _entry_dir(self, name, version):
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Nama model tidak valid: {name!r}")
+        return os.path.join(self.root, name, version)
+
+    def register(self, name, pipeline, calibrator=None):
+        """Simpan pipeline ter-fit sebagai versi baru ``name``; kembalikan versinya."""
+        version = artifacts.new_version()
+        directory = self._entry_dir(name, version)
+        os.makedirs(directory, exist_ok=True)
+
+        if calibrator is not None:
+            calibrator.version = version
+            calibrator.save(os.path.join(directory, CALIBRATION_PATH))
+        model = pipeline.named_steps['model']
+        if hasattr(model, 'estimators_'):
+            FlatForest.from_model(model, version=version).save(
+                os.path.join(directory, FLAT_FOREST_PATH))
+        path = os.path.join(directory, artifacts.PIPELINE_FILE)
+        artifacts.save_artifact(pipeline, path, version=version)
+        self._add_entry(name, version, path, type(model).__name__)
+        return version
+
+    def register_artifact(self, name, source_path):
+        """Daftarkan artefak yang sudah ada (mis. model live) beserta file pendampingnya."""
+        bundle = artifacts.load_bundle(source_path, mmap_mode=None)
+        if bundle.version == 'legacy':
+            raise ValueError(f"{source_path} bukan artefak pipeline berversi")
+        directory = self._entry_dir(name, bundle.version)
+        os.makedirs(directory, exist_ok=True)
+        _copy_artifact(source_path, directory)
+        path = os.path.join(directory, artifacts.PIPELINE_FILE)
+        self._add_entry(name, bundle.version, path, type(bundle.model).__name__)
+        return bundle.version
+
+    def load(self, name, mmap_mode='r'):
+        return artifacts.load_bundle(self.path(name), mmap_mode=mmap_mode)
+
+    def set_shadows(self, names):
+        """Ganti daftar model shadow (nama harus terdaftar)."""
+        manifest = self._read()
+        unknown = [name for name in names if name not in manifest['models']]
+        if unknown:
+            raise KeyError(f"Model tidak terdaftar di registry: {', '.join(unknown)}")
+        manifest['shadows'] = list(dict.fromkeys(names))
+        self._write(manifest)
+
+    def load_shadows(self, mmap_mode='r'):
+        """{nama: ModelBundle} untuk semua model shadow."""
+        return {name: self.load(name, mmap_mode) for name in self.shadows}
+
+    def promote(self, name, target_path=artifacts.PIPELINE_PATH):
+        """Jadikan ``name`` model live: salin artefaknya ke ``target_path``.
+
+        Model yang dipromosikan dikeluarkan dari daftar shadow.
+        """
+        source_path = self.path(name)
+        directory = os.path.dirname(target_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        _copy_artifact(source_path, directory, os.path.basename(target_path))
+
+        manifest = self._read()
+        manifest['live'] = name
+        manifest['shadows'] = [shadow for shadow in manifest['shadows'] if shadow != name]
+        self._write(manifest)
+
+
+def _copy_artifact(source_path, directory, target_name=artifacts.PIPELINE_FILE):
+    """Salin file pendamping lalu artefak pipeline (terakhir, atomik) ke ``directory``.
+
+    Urutan ini sama dengan retrain.py: watcher yang melihat artefak baru
+    sudah menemukan file pendamping versi yang sama.
+    """
+    source_dir = os.path.dirname(source_path)
+    for companion in COMPANION_FILES:
+        source = os.path.join(source_dir, companion)
+        if os.path.exists(source):
+            _atomic_copy(source, os.path.join(directory, companion))
+    _atomic_copy(source_path, os.path.join(directory, target_name))
+
+
+def _atomic_copy(source, target):
+    if os.path.abspath(source) == os.path.abspath(target):
+        return
+    with atomic_path(target) as tmp_path:
+        shutil.copyfile(source, tmp_path)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Registry model lokal (live + shadow)")
+    parser.add_argument('--root', default=REGISTRY_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="Latih model kandidat atau daftarkan artefak")
+    add.add_argument('name')
+    source = add.add_mutually_exclusive_group(required=True)
+    source.add_argument('--model', choices=CANDIDATE_MODELS,
+                        help="Latih model ini pada --data (pipeline sama dengan retrain.py)")
+    source.add_argument('--from', dest='source', metavar='ARTIFACT',
+                        help="Daftarkan artefak pipeline yang sudah ada")
+    add.add_argument('--data', default='model/training_data.csv',
+                     help="Data training CSV, Parquet, atau Arrow")
+    add.add_argument('--calibrate', choices=calibration.CALIBRATION_METHODS,
+                     help="Fit calibrator pada probabilitas out-of-fold")
+
+    commands.add_parser('list', help="Tampilkan entri registry")
+    shadow = commands.add_parser('shadow', help="Tetapkan model shadow (tanpa nama: nonaktif)")
+    shadow.add_argument('names', nargs='*')
+    promote = commands.add_parser('promote', help="Jadikan model live (salin ke artefak live)")
+    promote.add_argument('name')
+    promote.add_argument('--target', default=artifacts.PIPELINE_PATH)
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'add':
+        if args.source:
+            version = registry.register_artifact(args.name, args.source)
+        else:
+            import columnar
+
+            df = columnar.read_frame(args.data)
+            X, y = df.drop('label', axis=1), df['label']
+            pipeline = artifacts.build_pipeline(X.columns.tolist(),
+                                                model=build_candidate(args.model))
+            pipeline.fit(X, y)
+            calibrator = None
+            if args.calibrate:
+                proba = calibration.out_of_fold_proba(pipeline, X, y)
+                calibrator = calibration.Calibrator.fit(proba, y, args.calibrate)
+            version = registry.register(args.name, pipeline, calibrator)
+        print(f"{args.name} versi {version} didaftarkan di {registry.path(args.name)}")
+    elif args.command == 'list':
+        live, shadows = registry.live, registry.shadows
+        for name, entry in registry.entries().items():
+            role = 'live' if name == live else 'shadow' if name in shadows else ''
+            print(f"{name:<16} {entry['version']:<16} {entry['model']:<28} {role}")
+    elif args.command == 'shadow':
+        registry.set_shadows(args.names)
+        print(f"Model shadow: {', '.join(args.names) or '-'}")
+    else:
+        registry.promote(args.name, args.target)
+        print(f"{args.name} dipromosikan ke {args.target}")
+
+
+if __name__ == '__main__':
+    main()
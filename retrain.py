@@ -1,24 +1,195 @@
 # model/retrain.py
+#
+#   python retrain.py                    # latih Random Forest default
+#   python retrain.py --search           # hyperparameter search paralel (lihat tuning.py)
+#   python retrain.py --search --models rf,svc,knn --workers 8 --smote
+#   python retrain.py --calibrate sigmoid  # + calibrator probabilitas & laporan threshold
+#   python retrain.py --incremental hasil_rekrutmen.csv   # tambah pohon dari data berlabel baru
+
+import argparse
 
-import pandas as pd
 import joblib
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-
-# 1. Load data
-df = pd.read_csv("model/training_data.csv")
-X = df.drop("label", axis=1)
-y = df["label"]
-
-# 2. Scaling
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
-
-# 3. Training
-model = RandomForestClassifier(random_state=42)
-model.fit(X_scaled, y)
-
-# 4. Simpan model dan scaler
-joblib.dump(model, "model/random_forest_model.pkl")
-joblib.dump(scaler, "model/scaler.pkl")
-joblib.dump(X.columns.tolist(), "model/feature_names.pkl")
+
+import artifacts
+import calibration
+import columnar
+from decision_table import DECISION_TABLE_PATH, DecisionTable
+from flat_forest import FLAT_FOREST_PATH, FlatForest, check_parity
+
+TRAINING_DATA = "model/training_data.csv"
+SEARCH_CACHE_DIR = "model/search_cache"
+THRESHOLD_REPORT = "model/threshold_report.csv"
+
+
+def export_artifacts(pipeline, X, decision_table=False, calibrator=None):
+    """Simpan artefak pipeline berversi, calibrator dan tabel keputusan (opsional),
+    FlatForest, dan pickle lama."""
+    version = artifacts.new_version()
+    if calibrator is not None:
+        # Ditulis sebelum artefak agar watcher tidak memuat versi baru tanpa calibrator
+        calibrator.version = version
+        calibrator.save(artifacts.artifact_path(calibration.CALIBRATION_PATH))
+        print(f"Calibrator {calibrator.method} disimpan")
+
+    # Simpan artefak pipeline berversi (satu file, bisa di-mmap)
+    artifacts.save_artifact(pipeline, artifacts.PIPELINE_PATH, version=version)
+    print(f"Artefak pipeline versi {version} disimpan")
+
+    if decision_table:
+        bundle = artifacts.ModelBundle(pipeline, version, None, None)
+        DecisionTable.build(bundle).save(artifacts.artifact_path(DECISION_TABLE_PATH))
+        print("Tabel keputusan input manual disimpan")
+
+    # Ekspor forest ke array node datar + cek parity dengan predict_proba
+    model = pipeline.named_steps['model']
+    if hasattr(model, 'estimators_'):
+        flat = FlatForest.from_model(model, version=version)
+        X_scaled = pipeline[:-1].transform(X)
+        max_diff = check_parity(flat, model, X_scaled)
+        flat.save(artifacts.artifact_path(FLAT_FOREST_PATH))
+        print(f"FlatForest parity OK pada {len(X_scaled)} baris (selisih maks {max_diff:.3g})")
+    else:
+        print(f"{type(model).__name__} bukan forest, FlatForest tidak diekspor")
+
+    # Simpan model, scaler, dan fitur terpisah (kompatibilitas)
+    joblib.dump(model, artifacts.artifact_path(artifacts.MODEL_PATH))
+    joblib.dump(pipeline.named_steps['scaler'], artifacts.artifact_path(artifacts.SCALER_PATH))
+    joblib.dump(X.columns.tolist(), artifacts.artifact_path(artifacts.FEATURES_PATH))
+    return version
+
+
+def fit_calibrator(pipeline, X, y, method, proba=None):
+    """Calibrator dari probabilitas out-of-fold + laporan sweep threshold.
+
+    ``proba`` diberikan jika probabilitas out-of-fold sudah dihitung dengan
+    cara lain (mis. forest yang ditambah pohon, lihat incremental.py).
+    """
+    if proba is None:
+        proba = calibration.out_of_fold_proba(pipeline, X, y)
+    calibrator = calibration.Calibrator.fit(proba, y, method)
+    calibrated = calibrator.transform(proba)
+    print(f"Brier score out-of-fold: mentah {calibration.brier_score(proba, y):.4f}, "
+          f"{method} {calibration.brier_score(calibrated, y):.4f}")
+
+    report = calibration.threshold_sweep(calibrated, y)
+    report.to_csv(THRESHOLD_REPORT, index=False)
+    print(report.to_string(index=False, float_format='%.3f'))
+    print(f"Laporan threshold disimpan ke {THRESHOLD_REPORT}")
+    return calibrator
+
+
+def retrain_incremental(args):
+    import incremental
+
+    bundle = artifacts.load_bundle(
+        artifacts.PIPELINE_PATH, mmap_mode=None,
+        model_path=artifacts.artifact_path(artifacts.MODEL_PATH),
+        scaler_path=artifacts.artifact_path(artifacts.SCALER_PATH),
+        features_path=artifacts.artifact_path(artifacts.FEATURES_PATH))
+    X_new, y_new = incremental.load_labeled(args.incremental, bundle.encoder)
+    calibrator, proba = bundle.calibrator, None
+
+    if args.window:
+        incremental.append_training_data(args.data, X_new, y_new)
+        pipeline, X, y = incremental.refit_window(bundle.pipeline, args.data, args.window)
+        print(f"Pipeline versi {bundle.version} dilatih ulang pada {len(X)} baris terakhir")
+    else:
+        X, y = X_new, y_new
+        if calibrator is not None:
+            # Rata-rata forest berubah karena pohon baru: calibrator lama tidak lagi
+            # cocok, fit ulang pada probabilitas out-of-fold forest yang ditambah pohon
+            if y.value_counts().min() < calibration.CV_SPLITS:
+                print(f"PERINGATAN: data baru terlalu sedikit untuk kalibrasi ulang "
+                      f"(min. {calibration.CV_SPLITS} baris per kelas); "
+                      f"calibrator {calibrator.method} tidak dipakai untuk versi baru")
+                calibrator = None
+            else:
+                proba = incremental.grown_out_of_fold_proba(
+                    bundle.pipeline, X, y, args.new_trees, calibration.CV_SPLITS)
+
+        # Data baru baru dicatat setelah pohon baru berhasil dilatih
+        pipeline = incremental.grow_forest(bundle.pipeline, X_new, y_new, args.new_trees)
+        incremental.append_training_data(args.data, X_new, y_new)
+        print(f"Pipeline versi {bundle.version} ditambah {args.new_trees} pohon "
+              f"(total {len(pipeline.named_steps['model'].estimators_)})")
+    print(f"{len(X_new)} baris berlabel baru ditambahkan ke {args.data}")
+
+    # File pendamping versi lama dibuat ulang untuk versi baru; tanpa itu aplikasi
+    # diam-diam beralih ke probabilitas mentah / tanpa tabel keputusan
+    if calibrator is not None:
+        calibrator = fit_calibrator(pipeline, X, y, calibrator.method, proba)
+    export_artifacts(pipeline, X, args.decision_table or bundle.decision_table is not None,
+                     calibrator)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latih ulang model rekrutmen")
+    parser.add_argument('--data', default=TRAINING_DATA,
+                        help="Data training CSV, Parquet (.parquet), atau Arrow (.arrow/.feather)")
+    parser.add_argument('--search', action='store_true',
+                        help="Cari hyperparameter (successive halving, process pool)")
+    parser.add_argument('--models', default='rf',
+                        help="Model yang dicari, dipisah koma: rf, svc, knn")
+    parser.add_argument('--n-candidates', type=int, default=30)
+    parser.add_argument('--factor', type=int, default=3,
+                        help="Hanya 1/factor kandidat terbaik yang lanjut ke rung berikutnya")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Jumlah proses (default: jumlah CPU)")
+    parser.add_argument('--cache-dir', default=SEARCH_CACHE_DIR,
+                        help="Cache fold dan skor CV; jalankan ulang untuk melanjutkan")
+    parser.add_argument('--smote', action='store_true',
+                        help="Oversampling SMOTE pada data latih tiap fold (butuh imbalanced-learn)")
+    parser.add_argument('--decision-table', action='store_true',
+                        help="Scoring grid input manual dan simpan sebagai tabel lookup")
+    parser.add_argument('--calibrate', choices=calibration.CALIBRATION_METHODS,
+                        help="Fit calibrator probabilitas pada prediksi out-of-fold "
+                             "dan tulis laporan sweep threshold (hanya retrain penuh)")
+    parser.add_argument('--incremental', metavar='CSV',
+                        help="Data berlabel baru; model yang ada diperbarui, bukan dilatih ulang penuh")
+    parser.add_argument('--new-trees', type=int, default=20,
+                        help="Jumlah pohon baru per retrain inkremental")
+    parser.add_argument('--window', type=int, default=None,
+                        help="Dengan --incremental: latih ulang hanya pada N baris terakhir")
+    args = parser.parse_args()
+
+    if args.incremental:
+        retrain_incremental(args)
+        return
+
+    # 1. Load data
+    df = columnar.read_frame(args.data)
+    X = df.drop("label", axis=1)
+    y = df["label"]
+
+    # 2. Pipeline: encoder -> scaling -> model (default Random Forest)
+    model = None
+    if args.search:
+        import tuning
+
+        model_name, params, score = tuning.search(
+            X, y, X.columns, models=args.models.split(','), n_candidates=args.n_candidates,
+            factor=args.factor, workers=args.workers, cache_dir=args.cache_dir,
+            smote=args.smote)
+        print(f"Kandidat terbaik: {model_name} {params} (F1 CV {score:.4f})")
+        model = tuning.build_estimator(model_name, params)
+    pipeline = artifacts.build_pipeline(X.columns.tolist(), model=model)
+
+    # 3. Training (SMOTE setelah scaling, sama seperti saat evaluasi CV)
+    if args.search and args.smote:
+        from imblearn.over_sampling import SMOTE
+
+        X_scaled = pipeline[:-1].fit_transform(X, y)
+        pipeline.named_steps['model'].fit(
+            *SMOTE(random_state=tuning.RANDOM_STATE).fit_resample(X_scaled, y))
+    else:
+        pipeline.fit(X, y)
+
+    # 4. Kalibrasi probabilitas (opsional; CV pipeline tanpa SMOTE)
+    calibrator = fit_calibrator(pipeline, X, y, args.calibrate) if args.calibrate else None
+
+    # 5. Simpan artefak
+    export_artifacts(pipeline, X, args.decision_table, calibrator)
+
+
+if __name__ == '__main__':
+    main()
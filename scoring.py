@@ -0,0 +1,468 @@
+"""Scoring batch kandidat tanpa ketergantungan ke Streamlit.
+
+Dipakai oleh FINALBANGET.py dan finalstrim.py dengan ``artifacts.ModelBundle``.
+Hasil scoring CSV di-memo berdasarkan hash isi file + fingerprint artefak
+model, sehingga rerun
+Streamlit (klik tombol, ganti filter) tidak men-scoring ulang file yang sama.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import columnar
+import ingest
+import metrics
+from prediction_cache import PredictionCache
+
+# Standarisasi nama kolom
+COLUMN_MAPPING = {
+    'name': 'CandidateName',
+    'nama': 'CandidateName',
+    'Nama': 'CandidateName',
+    'nama_kandidat': 'CandidateName',
+    'NamaKandidat': 'CandidateName'
+}
+
+REQUIRED_COLUMNS = ['SkillScore', 'InterviewScore', 'PersonalityScore', 'ExperienceYears']
+
+# Jumlah hasil scoring yang disimpan di memori (dibagi antar sesi)
+MAX_CACHED_RESULTS = 8
+
+# Jumlah baris per chunk pada mode streaming
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Cache prediksi satu kandidat (input manual): jumlah entri, umur (detik), dan
+# pembulatan vektor fitur untuk kunci (lebih halus dari step slider 0.01)
+MAX_CACHED_PREDICTIONS = 4096
+PREDICTION_CACHE_TTL = 3600
+QUANTIZE_DECIMALS = 4
+
+_results_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_prediction_cache = PredictionCache(MAX_CACHED_PREDICTIONS, PREDICTION_CACHE_TTL)
+
+# ShadowScorer aktif (lihat shadow.py); None = tanpa model shadow
+_shadow = None
+
+
+def content_hash(data):
+    """Hash isi file upload (bytes)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def set_shadow(scorer):
+    """Aktifkan (atau matikan dengan None) shadow scoring untuk semua jalur scoring."""
+    global _shadow
+    _shadow = scorer
+
+
+def submit_shadow(data, labels, probability, started):
+    """Teruskan batch yang baru di-scoring model live ke model shadow (tanpa menunggu).
+
+    ``started`` adalah ``time.perf_counter()`` sebelum encoding model live.
+    """
+    scorer = _shadow
+    if scorer is not None:
+        scorer.submit(data, labels, probability, time.perf_counter() - started)
+
+
+def scale_features(scaler, X):
+    """StandardScaler.transform in-place pada matriks float hasil encoder.
+
+    Melewati validasi input sklearn per panggilan; ``X`` ikut berubah.
+    """
+    if scaler.with_mean:
+        X -= scaler.mean_
+    if scaler.with_std:
+        X /= scaler.scale_
+    return X
+
+
+def transform(bundle, data):
+    """DataFrame / dict kandidat -> matriks fitur yang sudah di-scaling."""
+    with metrics.timed('encode') as timer:
+        X = bundle.encoder.transform(data)
+        timer.rows = len(X)
+    with metrics.timed('scale', rows=len(X)):
+        return scale_features(bundle.scaler, X)
+
+
+def predict_cached(bundle, data):
+    """(prediksi, probabilitas per kelas) untuk satu kandidat (dict).
+
+    Jika bundle punya tabel keputusan dan input tepat di grid-nya, hasil
+    diambil langsung dari tabel. Selain itu di-cache per (vektor fitur
+    terkuantisasi sebelum scaling, fingerprint model); input yang sudah
+    pernah di-scoring tidak menyentuh model. Array probabilitas dibagi
+    antar pemanggil, jangan dimodifikasi.
+    """
+    if bundle.decision_table is not None:
+        found = bundle.decision_table.lookup(data)
+        metrics.count_cache('decision_table', found is not None)
+        if found is not None:
+            # Label tabel (argmax mentah) diganti keputusan dari probabilitas terkalibrasi
+            return int(bundle.decide(found[1])[0]), found[1]
+
+    started = time.perf_counter()
+    with metrics.timed('encode', rows=1):
+        X = bundle.encoder.transform(data)
+    # + 0.0 menyamakan -0.0 dengan 0.0
+    key = (bundle.fingerprint, (np.round(X[0], QUANTIZE_DECIMALS) + 0.0).tobytes())
+    cached = _prediction_cache.get(key)
+    metrics.count_cache('prediction', cached is not None)
+    if cached is not None:
+        return cached
+
+    with metrics.timed('scale', rows=1):
+        X = scale_features(bundle.scaler, X)
+    with metrics.timed('predict', rows=1):
+        proba = bundle.predict_proba(X)[0]
+    proba.flags.writeable = False
+    label, probability = bundle.decide(proba)
+    result = (int(label), proba)
+    _prediction_cache.put(key, result)
+    # Salinan dict: pemanggil boleh menambah kolom (mis. Prediction) setelahnya
+    submit_shadow(dict(data), [result[0]], [probability], started)
+    return result
+
+
+def what_if(bundle, data, column, values):
+    """(nilai, probabilitas DITERIMA) saat ``column`` diisi ``values``, input lain tetap.
+
+    Nilai yang ada di grid tabel keputusan dibaca dari tabel; sisanya
+    (atau semuanya, tanpa tabel) di-scoring model dalam satu batch.
+    Terkalibrasi jika bundle punya calibrator.
+    """
+    values = np.asarray(values)
+    proba = np.full(len(values), np.nan)
+    missing = np.ones(len(values), dtype=bool)
+    if bundle.decision_table is not None:
+        curve = bundle.decision_table.what_if(data, column, values)
+        metrics.count_cache('decision_table', curve is not None)
+        if curve is not None:
+            proba, found = curve
+            missing = ~found
+
+    if missing.any():
+        frame = pd.DataFrame([data] * int(missing.sum()))
+        frame[column] = values[missing]
+        proba[missing] = bundle.predict_proba(transform(bundle, frame))[:, bundle.positive_index]
+    return values, bundle.calibrate(proba)
+
+
+def prepare_frame(raw_df, timestamp=None, start=0):
+    """Normalisasi kolom CSV mentah: nama kolom, kolom wajib, nama, timestamp.
+
+    ``start`` adalah offset baris (untuk penomoran Kandidat_N antar chunk).
+    Raise ValueError jika kolom wajib tidak ditemukan.
+    """
+    with metrics.timed('column_mapping', rows=len(raw_df)):
+        return _prepare_frame(raw_df, timestamp, start)
+
+
+def normalize_columns(raw_df):
+    """Alias nama kolom -> nama standar; raise ValueError jika kolom wajib tidak ada."""
+    raw_df = raw_df.rename(columns=COLUMN_MAPPING)
+
+    # Cek kolom wajib
+    missing_cols = [col for col in REQUIRED_COLUMNS if col not in raw_df.columns]
+    if missing_cols:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(missing_cols)}")
+    return raw_df
+
+
+def _prepare_frame(raw_df, timestamp, start):
+    raw_df = normalize_columns(raw_df)
+
+    # Handle kolom nama
+    if 'CandidateName' not in raw_df.columns:
+        raw_df['CandidateName'] = [f"Kandidat_{i+1}" for i in range(start, start + len(raw_df))]
+
+    # Tambahkan timestamp
+    raw_df['Timestamp'] = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return raw_df
+
+
+def score_frame(input_df, bundle, sort=True):
+    """Scoring DataFrame hasil prepare_frame, urut berdasarkan kelayakan.
+
+    Kolom ``Probability`` (probabilitas DITERIMA, terkalibrasi jika bundle
+    punya calibrator) berasal dari satu panggilan predict_proba; label
+    diturunkan darinya (``ModelBundle.decide``).
+    Dengan ``sort=False`` urutan baris input dipertahankan (mode streaming).
+    """
+    n_rows = len(input_df)
+    started = time.perf_counter()
+    with metrics.timed('encode', rows=n_rows):
+        X = bundle.encoder.transform(input_df)
+        features = bundle.encoder.to_frame(X)
+
+    # Scaling fitur + prediksi langsung pada matriks NumPy
+    with metrics.timed('scale', rows=n_rows):
+        X = scale_features(bundle.scaler, X)
+    with metrics.timed('predict', rows=n_rows):
+        predictions, probability = bundle.decide(bundle.predict_proba(X))
+    submit_shadow(input_df, predictions, probability, started)
+
+    with metrics.timed('assemble', rows=n_rows):
+        # Gabungkan hasil prediksi dengan metadata
+        results_df = pd.DataFrame({
+            'CandidateName': input_df['CandidateName'].to_numpy(),
+            'Timestamp': input_df['Timestamp'].to_numpy(),
+            'Prediction': np.where(predictions == 1, "DITERIMA", "TIDAK DITERIMA"),
+            'Probability': probability,
+            'TotalScore': features[REQUIRED_COLUMNS].sum(axis=1),
+        })
+        results_df = pd.concat([results_df, features], axis=1)
+
+        # Urutkan berdasarkan kelayakan
+        if sort:
+            results_df = results_df.sort_values(by=['Prediction', 'TotalScore'],
+                                                ascending=[False, False])
+        results_df.insert(0, 'No', range(1, len(results_df)+1))
+    return results_df
+
+
+def score_csv(data, bundle):
+    """Scoring isi file CSV (bytes), di-memo per (hash file, fingerprint model).
+
+    DataFrame yang dikembalikan dibagi antar pemanggil, jangan dimodifikasi.
+    """
+    key = (content_hash(data), bundle.fingerprint)
+    with _cache_lock:
+        hit = key in _results_cache
+        metrics.count_cache('score_csv', hit)
+        if hit:
+            _results_cache.move_to_end(key)
+            return _results_cache[key]
+
+    with metrics.timed('csv_parse') as timer:
+        raw_df = pd.read_csv(io.BytesIO(data))
+        timer.rows = len(raw_df)
+    results_df = score_frame(prepare_frame(raw_df), bundle)
+
+    with _cache_lock:
+        _results_cache[key] = results_df
+        while len(_results_cache) > MAX_CACHED_RESULTS:
+            _results_cache.popitem(last=False)
+    return results_df
+
+
+def score_uploads(files, bundle, workers=None):
+    """Scoring banyak file upload (CSV, .csv.gz, zip) sebagai satu batch.
+
+    ``files`` adalah list (nama, bytes). File di-parse dan dinormalisasi
+    paralel (lihat ingest.py), digabung, lalu di-scoring sekali. Kembalikan
+    (results_df, list ``ingest.UploadError``); file yang gagal tidak ikut
+    di-scoring tetapi tidak menghentikan file lain. Di-memo seperti
+    ``score_csv``; DataFrame yang dikembalikan jangan dimodifikasi.
+    """
+    digest = hashlib.sha256()
+    for name, data in files:
+        digest.update(f"{name}\0{content_hash(data)}\0".encode())
+    key = ('uploads', digest.hexdigest(), bundle.fingerprint)
+    with _cache_lock:
+        hit = key in _results_cache
+        metrics.count_cache('score_csv', hit)
+        if hit:
+            _results_cache.move_to_end(key)
+            return _results_cache[key]
+
+    frames, errors = ingest.read_uploads(files, prepare=normalize_columns, workers=workers)
+    if not frames:
+        return None, errors
+
+    # Nama default Kandidat_N dan timestamp diberikan berurutan lintas file
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    prepared, start = [], 0
+    for _, frame in frames:
+        prepared.append(prepare_frame(frame, timestamp=timestamp, start=start))
+        start += len(frame)
+    input_df = prepared[0] if len(prepared) == 1 else pd.concat(prepared, ignore_index=True)
+    result = (score_frame(input_df, bundle), errors)
+
+    with _cache_lock:
+        _results_cache[key] = result
+        while len(_results_cache) > MAX_CACHED_RESULTS:
+            _results_cache.popitem(last=False)
+    return result
+
+
+def read_chunks(source, chunksize=DEFAULT_CHUNK_SIZE, compression='infer', name=None):
+    """DataFrame per chunk dari CSV atau Parquet/Arrow (format dari ``name``/path)."""
+    name = name or (source if isinstance(source, (str, os.PathLike)) else '')
+    fmt = columnar.file_format(name)
+    if fmt == 'csv':
+        return pd.read_csv(source, chunksize=chunksize, compression=compression)
+    return columnar.iter_frames(source, fmt, chunksize)
+
+
+def score_csv_stream(source, output, bundle, chunksize=DEFAULT_CHUNK_SIZE, timestamp=None,
+                     compression='infer', name=None):
+    """Scoring CSV per chunk dan tulis hasil secara bertahap ke ``output``.
+
+    ``source`` adalah path atau file-like (CSV, atau Parquet/Arrow menurut
+    ekstensi path/``name``); ``compression`` diteruskan ke ``pd.read_csv``
+    (file-like tidak di-infer). ``output`` adalah file teks terbuka atau
+    ``columnar.TableWriter``. Hanya satu chunk yang berada di memori pada satu waktu; hasil ditulis
+    dengan urutan baris input (tidak diurutkan berdasarkan kelayakan).
+    Generator ini menghasilkan dict progres setelah setiap chunk selesai.
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    started = time.perf_counter()
+    rows_done = 0
+
+    parse_started = time.perf_counter()
+    for chunk in read_chunks(source, chunksize, compression, name):
+        metrics.observe('csv_parse', time.perf_counter() - parse_started, len(chunk))
+        chunk_df = prepare_frame(chunk, timestamp=timestamp, start=rows_done)
+        results_df = score_frame(chunk_df, bundle, sort=False)
+        results_df['No'] += rows_done
+        with metrics.timed('to_csv', rows=len(results_df)):
+            if isinstance(output, columnar.TableWriter):
+                output.write(results_df)
+            else:
+                results_df.to_csv(output, index=False, header=rows_done == 0)
+        rows_done += len(results_df)
+
+        elapsed = time.perf_counter() - started
+        yield {
+            'rows': rows_done,
+            'accepted': int((results_df['Prediction'] == "DITERIMA").sum()),
+            'elapsed': elapsed,
+            'rows_per_sec': rows_done / elapsed if elapsed > 0 else 0.0,
+            'preview': results_df if rows_done == len(results_df) else None,
+        }
+        parse_started = time.perf_counter()
+
+
+def _top_k(probability, total_score, k):
+    """Index ``k`` baris teratas berdasarkan (probabilitas, TotalScore), tanpa sort penuh.
+
+    argpartition pada probabilitas; baris yang seri di batas dipilih berdasarkan
+    TotalScore (juga dengan argpartition). Hasil belum terurut.
+    """
+    if len(probability) <= k:
+        return np.arange(len(probability))
+    boundary = probability[np.argpartition(-probability, k - 1)[k - 1]]
+    above = np.flatnonzero(probability > boundary)
+    tied = np.flatnonzero(probability == boundary)
+    need = k - len(above)
+    if need < len(tied):
+        tied = tied[np.argpartition(-total_score[tied], need - 1)[:need]]
+    return np.concatenate([above, tied])
+
+
+def shortlist_csv_stream(source, bundle, k, chunksize=DEFAULT_CHUNK_SIZE, timestamp=None,
+                         compression='infer', name=None):
+    """Top-K kandidat berdasarkan probabilitas DITERIMA sambil membaca CSV per chunk.
+
+    Memori O(K + chunksize): setiap chunk di-scoring, digabung dengan K
+    kandidat terbaik sejauh ini, lalu dipangkas kembali ke K baris dengan
+    seleksi parsial. Generator menghasilkan dict progres per chunk; dict
+    terakhir berisi ``results`` (K baris, urut probabilitas lalu TotalScore,
+    kolom sama dengan ``score_frame``).
+    """
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    started = time.perf_counter()
+    rows_done = 0
+    best = None
+
+    for chunk in read_chunks(source, chunksize, compression, name):
+        chunk_df = prepare_frame(chunk, timestamp=timestamp, start=rows_done)
+        scoring_started = time.perf_counter()
+        with metrics.timed('encode', rows=len(chunk_df)):
+            X = bundle.encoder.transform(chunk_df)
+            features = bundle.encoder.to_frame(X)
+        with metrics.timed('scale', rows=len(chunk_df)):
+            X = scale_features(bundle.scaler, X)
+        with metrics.timed('predict', rows=len(chunk_df)):
+            predictions, probability = bundle.decide(bundle.predict_proba(X))
+            accepted = predictions == 1
+        submit_shadow(chunk_df, predictions, probability, scoring_started)
+
+        with metrics.timed('shortlist_select', rows=len(chunk_df)):
+            total_score = features[REQUIRED_COLUMNS].sum(axis=1).to_numpy()
+            # Pangkas chunk dulu agar frame yang digabung hanya memuat <= 2K baris
+            keep = _top_k(probability, total_score, k)
+            scored = pd.concat([pd.DataFrame({
+                'CandidateName': chunk_df['CandidateName'].to_numpy()[keep],
+                'Timestamp': chunk_df['Timestamp'].to_numpy()[keep],
+                'Prediction': np.where(accepted[keep], "DITERIMA", "TIDAK DITERIMA"),
+                'Probability': probability[keep],
+                'TotalScore': total_score[keep],
+            }), features.iloc[keep].reset_index(drop=True)], axis=1)
+            if best is not None:
+                scored = pd.concat([best, scored], ignore_index=True)
+            keep = _top_k(scored['Probability'].to_numpy(), scored['TotalScore'].to_numpy(), k)
+            best = scored.iloc[keep].reset_index(drop=True)
+        rows_done += len(chunk_df)
+
+        elapsed = time.perf_counter() - started
+        yield {
+            'rows': rows_done,
+            'elapsed': elapsed,
+            'rows_per_sec': rows_done / elapsed if elapsed > 0 else 0.0,
+            'results': None,
+        }
+
+    if best is None:
+        raise ValueError("File CSV tidak berisi data kandidat")
+
+    # Hanya K baris yang diurutkan
+    best = best.sort_values(['Probability', 'TotalScore'], ascending=[False, False],
+                            ignore_index=True)
+    best.insert(0, 'No', range(1, len(best) + 1))
+    elapsed = time.perf_counter() - started
+    yield {
+        'rows': rows_done,
+        'elapsed': elapsed,
+        'rows_per_sec': rows_done / elapsed if elapsed > 0 else 0.0,
+        'results': best,
+    }
+
+
+def clear_cache():
+    with _cache_lock:
+        _results_cache.clear()
+    _prediction_cache.clear()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    import artifacts
+
+    parser = argparse.ArgumentParser(description="Scoring CSV kandidat secara streaming")
+    parser.add_argument('input', help="Data kandidat (CSV, Parquet, atau Arrow)")
+    parser.add_argument('output', help="Hasil prediksi (format dari ekstensi: CSV/Parquet/Arrow)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--artifact', default=artifacts.PIPELINE_PATH)
+    parser.add_argument('--top-k', type=int, default=None,
+                        help="Hanya tulis K kandidat dengan probabilitas DITERIMA tertinggi")
+    args = parser.parse_args()
+
+    bundle = artifacts.load_bundle(args.artifact)
+
+    if args.top_k:
+        for progress in shortlist_csv_stream(args.input, bundle, args.top_k,
+                                             chunksize=args.chunksize):
+            print(f"{progress['rows']:>12,} baris | {progress['rows_per_sec']:,.0f} baris/detik")
+        columnar.write_frame(progress['results'], args.output)
+        raise SystemExit
+
+    if columnar.is_columnar(args.output):
+        schema = columnar.results_schema(bundle.feature_names)
+        out = columnar.TableWriter(args.output, schema)
+    else:
+        out = open(args.output, 'w', newline='')
+    with out:
+        for progress in score_csv_stream(args.input, out, bundle, chunksize=args.chunksize):
+            print(f"{progress['rows']:>12,} baris | {progress['rows_per_sec']:,.0f} baris/detik")
@@ -0,0 +1,296 @@
+"""Layanan HTTP scoring lokal (asyncio) dengan micro-batching.
+
+Endpoint:
+    POST /predict        satu kandidat (objek JSON)
+    POST /predict/batch  banyak kandidat ({"candidates": [...]} atau list JSON)
+    GET  /stats          jumlah request, ukuran batch, latensi p50/p99 (+ shadow)
+    GET  /health         versi model yang dilayani
+
+Request yang datang bersamaan dikumpulkan selama ``--window-ms`` (atau
+sampai ``--max-batch`` kandidat) lalu di-scoring dengan satu panggilan
+``predict_proba``. Field kandidat sama dengan kolom CSV upload; kategori
+boleh mentah (``EducationLevel``: 1-4, ``RecruitmentStrategy``: 1-3) atau
+one-hot.
+
+Dengan ``--shadow`` model shadow dari registry.py ikut men-scoring setiap
+batch di thread latar; perbandingannya dengan model live ada di ``/stats``.
+
+Jalankan:  python service.py --port 8502
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import artifacts
+import scoring
+import shadow
+
+DEFAULT_WINDOW_MS = 5.0
+DEFAULT_MAX_BATCH = 1024
+
+# Jumlah sampel latensi terakhir yang dipakai untuk p50/p99
+LATENCY_SAMPLES = 10_000
+
+# Level valid kolom kategori mentah (sama dengan form input manual)
+CATEGORY_LEVELS = {'EducationLevel': (1, 2, 3, 4), 'RecruitmentStrategy': (1, 2, 3)}
+
+
+class LatencyStats:
+    """Penghitung request dan latensi (detik) dalam jendela sampel terbatas."""
+
+    def __init__(self, maxlen=LATENCY_SAMPLES):
+        self.latencies = deque(maxlen=maxlen)
+        self.batch_sizes = deque(maxlen=maxlen)
+        self.requests = 0
+        self.candidates = 0
+        self.errors = 0
+
+    def observe(self, seconds, n_candidates):
+        self.latencies.append(seconds)
+        self.requests += 1
+        self.candidates += n_candidates
+
+    def snapshot(self):
+        latencies = np.fromiter(self.latencies, dtype=np.float64)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000 if len(latencies) else (0.0, 0.0)
+        return {
+            'requests': self.requests,
+            'candidates': self.candidates,
+            'errors': self.errors,
+            'batches': len(self.batch_sizes),
+            'mean_batch_size': float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0,
+            'latency_ms': {'p50': float(p50), 'p99': float(p99)},
+        }
+
+
+class MicroBatcher:
+    """Gabungkan kandidat dari request bersamaan menjadi satu batch scoring."""
+
+    def __init__(self, bundle, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH,
+                 stats=None):
+        self.bundle = bundle
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.stats = stats or LatencyStats()
+        self._queue = asyncio.Queue()
+
+    async def score(self, records):
+        """Scoring list dict kandidat; hasil berurutan sesuai input."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.window
+
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            records = [record for batch, _ in pending for record in batch]
+            try:
+                # predict_proba dijalankan di thread agar event loop tetap menerima request
+                proba = await loop.run_in_executor(None, self._predict_proba, records)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats.batch_sizes.append(len(records))
+            start = 0
+            for batch, future in pending:
+                if not future.done():
+                    future.set_result(proba[start:start + len(batch)])
+                start += len(batch)
+
+    def _predict_proba(self, records):
+        started = time.perf_counter()
+        frame = pd.DataFrame.from_records(records)
+        bundle = self.bundle
+        proba = bundle.predict_proba(scoring.transform(bundle, frame))
+        scoring.submit_shadow(frame, *bundle.decide(proba), started)
+        return proba
+
+
+def _number(value):
+    """Nilai JSON -> float terbatas; None jika bukan angka (termasuk bool dan NaN)."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if np.isfinite(number) else None
+
+
+def validate_records(records):
+    """Cek kolom wajib, nilai numerik, dan level kategori per kandidat.
+
+    Dijalankan sebelum kandidat masuk batch bersama request lain: nilai yang
+    tidak valid akan diubah encoder menjadi NaN atau indikator kosong dan
+    tetap menghasilkan prediksi, jadi ditolak di sini (HTTP 400).
+    """
+    for i, record in enumerate(records):
+        missing_cols = [col for col in scoring.REQUIRED_COLUMNS if col not in record]
+        if missing_cols:
+            raise ValueError(f"Kandidat ke-{i+1}: kolom wajib tidak ditemukan: "
+                             f"{', '.join(missing_cols)}")
+        for col in scoring.REQUIRED_COLUMNS:
+            if _number(record[col]) is None:
+                raise ValueError(f"Kandidat ke-{i+1}: {col} harus berupa angka, "
+                                 f"bukan {record[col]!r}")
+        for col, levels in CATEGORY_LEVELS.items():
+            if col in record and _number(record[col]) not in levels:
+                raise ValueError(f"Kandidat ke-{i+1}: {col} harus salah satu dari "
+                                 f"{', '.join(map(str, levels))}, bukan {record[col]!r}")
+
+
+def format_results(bundle, records, proba):
+    labels, probability = bundle.decide(proba)
+    results = []
+    for record, p, label in zip(records, probability, labels):
+        results.append({
+            'CandidateName': record.get('CandidateName'),
+            'Prediction': "DITERIMA" if label == 1 else "TIDAK DITERIMA",
+            'Probability': round(float(p), 6),
+        })
+    return results
+
+
+class ScoringServer:
+    def __init__(self, bundle, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH,
+                 shadow_scorer=None):
+        self.bundle = bundle
+        self.shadow_scorer = shadow_scorer
+        self.stats = LatencyStats()
+        self.batcher = MicroBatcher(bundle, window_ms, max_batch, self.stats)
+
+    async def handle(self, method, path, body):
+        """Kembalikan (status, payload JSON) untuk satu request."""
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok', 'model_version': self.bundle.version}
+        if method == 'GET' and path == '/stats':
+            stats = self.stats.snapshot()
+            if self.shadow_scorer is not None:
+                stats['shadow'] = self.shadow_scorer.snapshot()
+                stats['shadow_dropped'] = self.shadow_scorer.dropped
+            return 200, stats
+        if method != 'POST' or path not in ('/predict', '/predict/batch'):
+            return 404, {'error': f"Endpoint tidak ditemukan: {method} {path}"}
+
+        started = time.perf_counter()
+        try:
+            payload = json.loads(body or b'null')
+            if path == '/predict':
+                if not isinstance(payload, dict):
+                    raise ValueError("Body harus berupa objek JSON kandidat")
+                records = [payload]
+            else:
+                records = payload.get('candidates') if isinstance(payload, dict) else payload
+                if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                    raise ValueError("Body harus berupa list kandidat atau {\"candidates\": [...]}")
+                if not records:
+                    return 200, {'results': [], 'model_version': self.bundle.version}
+            validate_records(records)
+            proba = await self.batcher.score(records)
+        except ValueError as e:
+            self.stats.errors += 1
+            return 400, {'error': str(e)}
+
+        results = format_results(self.bundle, records, proba)
+        self.stats.observe(time.perf_counter() - started, len(records))
+        if path == '/predict':
+            return 200, dict(results[0], model_version=self.bundle.version)
+        return 200, {'results': results, 'model_version': self.bundle.version}
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                try:
+                    status, payload = await self.handle(method, path.split('?')[0], body)
+                except Exception as e:
+                    self.stats.errors += 1
+                    status, payload = 500, {'error': str(e)}
+
+                data = json.dumps(payload).encode()
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        batcher_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        print(f"Scoring service model {self.bundle.version} di http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan HTTP scoring kandidat")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_WINDOW_MS,
+                        help="Jendela pengumpulan micro-batch (milidetik)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--artifact', default=artifacts.PIPELINE_PATH)
+    parser.add_argument('--shadow', action='store_true',
+                        help="Scoring bayangan dengan model shadow dari registry")
+    parser.add_argument('--registry', default=shadow.REGISTRY_DIR)
+    args = parser.parse_args()
+
+    shadow_scorer = shadow.start_from_registry(args.registry) if args.shadow else None
+    server = ScoringServer(artifacts.load_bundle(args.artifact), args.window_ms, args.max_batch,
+                           shadow_scorer)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""Shadow scoring: model kandidat men-scoring batch yang sama dengan model live.
+
+Setelah model live selesai men-scoring satu batch (upload CSV, chunk
+streaming, input manual, atau micro-batch service.py), ``ShadowScorer``
+menjadwalkan batch yang sama untuk setiap model shadow di thread pool
+terpisah. Hasil live dikembalikan tanpa menunggu shadow; shadow hanya
+mencatat statistik pembanding:
+
+    agreement        proporsi baris dengan label sama dengan model live
+    mean_abs_diff    rata-rata |probabilitas DITERIMA shadow - live|
+    p50/p95 latensi  per batch (encode + scaling + predict), shadow vs live
+
+Jika antrean shadow penuh (``max_pending`` batch), batch baru dilewati
+dan dihitung sebagai ``dropped`` agar shadow tidak pernah menahan model
+live. Latensi juga dicatat ke metrics.py sebagai tahap ``shadow_<nama>``.
+
+Model shadow diambil dari registry.py (``python registry.py shadow ...``)
+saat proses dimulai; ubah daftar shadow lalu restart untuk menerapkannya.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import metrics
+import scoring
+from registry import REGISTRY_DIR, ModelRegistry
+
+DEFAULT_WORKERS = 2
+
+# Batch yang boleh menunggu di antrean shadow (semua model); selebihnya dilewati
+MAX_PENDING = 8
+
+# Jumlah sampel latensi terakhir per model untuk p50/p95
+LATENCY_SAMPLES = 1_000
+
+
+class _ModelStats:
+    __slots__ = ('batches', 'rows', 'agree', 'abs_diff', 'accepted', 'seconds', 'latencies',
+                 'errors', 'last_error')
+
+    def __init__(self):
+        self.batches = 0
+        self.rows = 0
+        self.agree = 0
+        self.abs_diff = 0.0
+        self.accepted = 0
+        self.seconds = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.errors = 0
+        self.last_error = None
+
+    def observe(self, seconds, rows, agree=0, abs_diff=0.0, accepted=0):
+        self.batches += 1
+        self.rows += rows
+        self.agree += agree
+        self.abs_diff += abs_diff
+        self.accepted += accepted
+        self.seconds += seconds
+        self.latencies.append(seconds)
+
+
+class ShadowScorer:
+    """Thread pool + statistik pembanding untuk model shadow ``{nama: ModelBundle}``."""
+
+    def __init__(self, bundles, workers=DEFAULT_WORKERS, max_pending=MAX_PENDING):
+        self.bundles = dict(bundles)
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._live = _ModelStats()
+        self._stats = {name: _ModelStats() for name in self.bundles}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='shadow')
+
+    def add(self, name, bundle):
+        """Tambahkan model shadow; batch berikutnya ikut di-scoring olehnya."""
+        with self._lock:
+            self.bundles = dict(self.bundles, **{name: bundle})
+            self._stats.setdefault(name, _ModelStats())
+
+    def submit(self, data, live_labels, live_probability, live_seconds):
+        """Jadwalkan ``data`` (DataFrame/dict kandidat) untuk semua model shadow.
+
+        ``live_labels`` (kelas 0/1) dan ``live_probability`` (DITERIMA,
+        terkalibrasi) adalah hasil model live untuk baris yang sama;
+        ``live_seconds`` durasi encode + scaling + predict model live.
+        Tidak menunggu; kembalikan False jika batch dilewati (antrean penuh).
+        """
+        bundles = self.bundles
+        if not bundles:
+            return False
+        live_labels = np.asarray(live_labels)
+        live_probability = np.asarray(live_probability, dtype=np.float64)
+        with self._lock:
+            self._live.observe(live_seconds, len(live_labels),
+                               accepted=int((live_labels == 1).sum()))
+            if self._pending + len(bundles) > self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending += len(bundles)
+        for name, bundle in bundles.items():
+            self._pool.submit(self._score, name, bundle, data, live_labels, live_probability)
+        return True
+
+    def _score(self, name, bundle, data, live_labels, live_probability):
+        try:
+            started = time.perf_counter()
+            X = scoring.scale_features(bundle.scaler, bundle.encoder.transform(data))
+            labels, probability = bundle.decide(bundle.predict_proba(X))
+            seconds = time.perf_counter() - started
+            metrics.observe(f'shadow_{name}', seconds, len(labels))
+            with self._lock:
+                self._stats[name].observe(
+                    seconds, len(labels), agree=int((labels == live_labels).sum()),
+                    abs_diff=float(np.abs(probability - live_probability).sum()),
+                    accepted=int((labels == 1).sum()))
+        except Exception as e:
+            # Shadow yang gagal hanya dicatat; model live tidak terpengaruh
+            with self._lock:
+                self._stats[name].errors += 1
+                self._stats[name].last_error = f"{type(e).__name__}: {e}"
+        finally:
+            with self._lock:
+                self._pending -= 1
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def snapshot(self):
+        """Ringkasan per model (baris ``live`` + tiap shadow) untuk panel admin / /stats."""
+        with self._lock:
+            stats = {'live': self._live, **self._stats}
+            summary = {}
+            for name, entry in stats.items():
+                latencies = np.fromiter(entry.latencies, dtype=np.float64)
+                p50, p95 = (np.percentile(latencies, [50, 95]) * 1000 if len(latencies)
+                            else (0.0, 0.0))
+                rows = entry.rows or 1
+                summary[name] = {
+                    'version': (self.bundles[name].version if name in self.bundles
+                                else None),
+                    'batches': entry.batches,
+                    'rows': entry.rows,
+                    'agreement': entry.agree / rows if name in self.bundles else 1.0,
+                    'mean_abs_diff': entry.abs_diff / rows,
+                    'accepted_rate': entry.accepted / rows,
+                    'p50_ms': float(p50),
+                    'p95_ms': float(p95),
+                    'us_per_row': entry.seconds / rows * 1e6,
+                    'errors': entry.errors,
+                    'last_error': entry.last_error,
+                }
+        return summary
+
+    def wait(self):
+        """Tunggu semua batch shadow yang sedang antre (untuk CLI/pengujian)."""
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+
+def start_from_registry(root=REGISTRY_DIR, workers=DEFAULT_WORKERS):
+    """Aktifkan shadow scoring di scoring.py dengan model shadow dari registry.
+
+    Bundle shadow dimuat di thread latar (tidak menahan render pertama);
+    batch yang di-scoring sebelum model shadow siap tidak ikut dibandingkan.
+    Tanpa registry/model shadow, scorer tetap kosong dan ``submit`` tidak
+    melakukan apa-apa.
+    """
+    scorer = ShadowScorer({}, workers)
+
+    def load():
+        try:
+            for name, bundle in ModelRegistry(root).load_shadows().items():
+                scorer.add(name, bundle)
+        except Exception as e:
+            scorer.last_error = f"{type(e).__name__}: {e}"
+
+    threading.Thread(target=load, name='shadow-load', daemon=True).start()
+    scoring.set_shadow(scorer)
+    return scorer
@@ -0,0 +1,48 @@
+"""Profil waktu startup aplikasi Streamlit, sekali per proses.
+
+Modul ini sengaja ringan (tanpa pandas/sklearn) dan diimpor paling awal
+oleh entry point. Setiap fase (imports, artifact_load, first_render)
+hanya dicatat pada kemunculan pertamanya, sehingga rerun Streamlit tidak
+menimpa angka cold start. Setiap fase ditulis ke stderr, mis.::
+
+    [startup] imports: 812 ms (+812 ms sejak start)
+"""
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+STARTED = time.perf_counter()
+
+_phases = {}
+_lock = threading.Lock()
+
+
+def record(name, seconds):
+    """Catat durasi fase ``name``; diabaikan jika fase sudah pernah dicatat."""
+    with _lock:
+        if name in _phases:
+            return
+        _phases[name] = seconds
+    elapsed = time.perf_counter() - STARTED
+    print(f"[startup] {name}: {seconds * 1000:.0f} ms (+{elapsed * 1000:.0f} ms sejak start)",
+          file=sys.stderr, flush=True)
+
+
+@contextmanager
+def phase(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def mark(name):
+    """Catat waktu sejak start sebagai fase ``name`` (mis. first_render)."""
+    record(name, time.perf_counter() - STARTED)
+
+
+def phases():
+    with _lock:
+        return dict(_phases)
@@ -0,0 +1,120 @@
+"""Tampilan tabel hasil/riwayat yang cepat untuk batch berapa pun besarnya.
+
+Pengganti ``df.style.applymap(lambda ...)``: penanda DITERIMA / TIDAK
+DITERIMA dihitung sekali per kolom dengan ``np.where`` dan diserahkan ke
+``st.dataframe`` sebagai teks biasa + ``column_config`` (tanpa Styler,
+tanpa HTML per sel). Hanya satu halaman (``page_size`` baris) yang
+dikirim ke browser; frame penuh tetap di server.
+
+``history_page`` menavigasi riwayat di ``HistoryStore`` per halaman dengan
+keyset pagination (pertama / sebelumnya / berikutnya / terakhir), sehingga
+halaman terakhir riwayat jutaan baris sama cepatnya dengan halaman pertama.
+"""
+import numpy as np
+import streamlit as st
+
+import metrics
+
+DEFAULT_PAGE_SIZE = 100
+PAGE_SIZES = [50, 100, 500, 1000]
+
+PREDICTION_LABELS = {'DITERIMA': "🟢 DITERIMA", 'TIDAK DITERIMA': "🔴 TIDAK DITERIMA"}
+
+
+def prediction_view(frame):
+    """Salinan ``frame`` dengan kolom Prediction diberi penanda warna (vektor)."""
+    if 'Prediction' not in frame.columns:
+        return frame
+    prediction = frame['Prediction'].to_numpy()
+    labels = np.where(prediction == 'DITERIMA', PREDICTION_LABELS['DITERIMA'],
+                      np.where(prediction == 'TIDAK DITERIMA',
+                               PREDICTION_LABELS['TIDAK DITERIMA'], prediction))
+    return frame.assign(Prediction=labels)
+
+
+def column_config(columns):
+    """Format kolom yang dikenal (probabilitas sebagai bar, skor 1 desimal)."""
+    config = {
+        'No': st.column_config.NumberColumn("No", width='small'),
+        'Prediction': st.column_config.TextColumn("Prediction"),
+        'Probability': st.column_config.ProgressColumn(
+            "Probability", min_value=0.0, max_value=1.0, format="%.2f"),
+        'TotalScore': st.column_config.NumberColumn("TotalScore", format="%.1f"),
+    }
+    return {name: value for name, value in config.items() if name in columns}
+
+
+def page_bounds(n_rows, page, page_size):
+    """(offset awal, offset akhir) halaman ``page`` (mulai 1), dibatasi ke data."""
+    offset = (page - 1) * page_size
+    return offset, min(offset + page_size, n_rows)
+
+
+def render(frame, key, page_size=None):
+    """Tampilkan ``frame`` per halaman dengan penanda prediksi; kembalikan halaman yang tampil.
+
+    ``key`` membedakan state widget paging antar tabel. Tanpa ``page_size``
+    pengguna bisa memilih ukuran halaman.
+    """
+    n_rows = len(frame)
+    if page_size is None:
+        page_size = DEFAULT_PAGE_SIZE
+        if n_rows > PAGE_SIZES[0]:
+            page_size = st.selectbox("Baris per halaman", PAGE_SIZES,
+                                     index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+                                     key=f"{key}_page_size")
+
+    page = 1
+    n_pages = max(1, -(-n_rows // page_size))
+    if n_pages > 1:
+        page = st.number_input(f"Halaman (dari {n_pages:,}, {n_rows:,} baris)",
+                               min_value=1, max_value=n_pages, value=1, step=1,
+                               # Ukuran data/halaman berubah -> kembali ke halaman 1
+                               key=f"{key}_page_{n_rows}_{page_size}")
+    start, stop = page_bounds(n_rows, page, page_size)
+    view = prediction_view(frame.iloc[start:stop])
+    st.dataframe(view, column_config=column_config(view.columns), hide_index=True)
+    return view
+
+
+def _move_history_page(state_key, page, move):
+    st.session_state[state_key].update(page=page, move=move)
+
+
+def history_page(store, key, prediction=None, sort='newest', page_size=DEFAULT_PAGE_SIZE,
+                 columns=None):
+    """Satu halaman riwayat + tombol navigasi; kembalikan (frame, offset baris pertama).
+
+    Posisi (nomor halaman + cursor, lihat ``HistoryStore.page``) disimpan
+    per ``key`` di session state dan kembali ke halaman pertama saat
+    filter, urutan, atau isi riwayat berubah.
+    """
+    with metrics.timed('history_count'):
+        n_rows = store.count(prediction)
+    n_pages = max(1, -(-n_rows // page_size))
+
+    state_key = f"{key}_nav"
+    view = (prediction, sort, page_size, store.revision())
+    nav = st.session_state.get(state_key)
+    if nav is None or nav['view'] != view:
+        nav = st.session_state[state_key] = {'view': view, 'page': 1, 'move': {}}
+    page = nav['page']
+
+    # Langkah yang menghasilkan halaman ini diulang setiap rerun (hasil sama per revisi)
+    limit = n_rows - (n_pages - 1) * page_size if 'last' in nav['move'] else page_size
+    with metrics.timed('history_query') as timer:
+        frame, first, last = store.page(prediction, sort, limit, columns=columns, **nav['move'])
+        timer.rows = len(frame)
+
+    cols = st.columns([1, 1, 1, 1, 4])
+    at_start, at_end = page <= 1, page >= n_pages
+    cols[0].button("⏮️", key=f"{key}_first", disabled=at_start,
+                   on_click=_move_history_page, args=(state_key, 1, {}))
+    cols[1].button("◀️", key=f"{key}_prev", disabled=at_start,
+                   on_click=_move_history_page, args=(state_key, page - 1, {'before': first}))
+    cols[2].button("▶️", key=f"{key}_next", disabled=at_end,
+                   on_click=_move_history_page, args=(state_key, page + 1, {'after': last}))
+    cols[3].button("⏭️", key=f"{key}_last", disabled=at_end,
+                   on_click=_move_history_page, args=(state_key, n_pages, {'last': True}))
+    cols[4].caption(f"Halaman {page:,} dari {n_pages:,} ({n_rows:,} record)")
+    return frame, (page - 1) * page_size
@@ -0,0 +1,40 @@
+import threading
+
+import joblib
+import numpy as np
+import pytest
+
+import atomic
+
+
+def test_concurrent_writers_publish_a_complete_file(tmp_path):
+    path = str(tmp_path / 'decision_table.joblib')
+    payloads = [np.full(200_000, i, dtype=np.float64) for i in range(8)]
+
+    def write(payload):
+        with atomic.atomic_path(path) as tmp:
+            joblib.dump(payload, tmp, compress=0)
+
+    writers = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    result = joblib.load(path)
+    assert any(np.array_equal(result, payload) for payload in payloads)
+    assert [p.name for p in tmp_path.iterdir()] == ['decision_table.joblib']
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / 'calibration.joblib'
+    path.write_text('lama')
+
+    with pytest.raises(RuntimeError):
+        with atomic.atomic_path(str(path)) as tmp:
+            with open(tmp, 'w') as f:
+                f.write('setengah')
+            raise RuntimeError('gagal')
+
+    assert path.read_text() == 'lama'
+    assert [p.name for p in tmp_path.iterdir()] == ['calibration.joblib']
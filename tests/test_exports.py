@@ -0,0 +1,28 @@
+import gc
+import os
+import time
+
+import exports
+
+
+def test_session_file_removed_with_its_session(tmp_path):
+    session_state = {'stream_result': {'file': exports.SessionFile('.csv', str(tmp_path))}}
+    path = session_state['stream_result']['file'].path
+    assert os.path.exists(path)
+
+    # Streamlit membuang session state sesi yang ditutup/kedaluwarsa
+    del session_state
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def test_remove_stale_files_keeps_recent_files(tmp_path):
+    stale, recent = tmp_path / 'lama.csv', tmp_path / 'baru.csv'
+    stale.write_text('a')
+    recent.write_text('b')
+    old = time.time() - exports.STREAM_OUTPUT_MAX_AGE - 60
+    os.utime(stale, (old, old))
+
+    assert exports.remove_stale_files(str(tmp_path)) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ['baru.csv']
+    assert exports.remove_stale_files(str(tmp_path / 'tidak_ada')) == 0
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+import flat_forest
+from flat_forest import FlatForest, check_parity, with_missing
+
+
+def fit_forest(missing_rate=0.0, seed=0):
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(600, 6))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, len(X)) > 0).astype(int)
+    if missing_rate:
+        X[rng.random(X.shape) < missing_rate] = np.nan
+    model = RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0).fit(X, y)
+    return model, X
+
+
+@pytest.mark.parametrize('missing_rate', [0.0, 0.1])
+def test_predict_proba_matches_sklearn(missing_rate):
+    model, X = fit_forest(missing_rate)
+    flat = FlatForest.from_model(model)
+
+    assert flat.supports_missing
+    np.testing.assert_allclose(flat.predict_proba(X), model.predict_proba(X), atol=1e-9)
+    assert check_parity(flat, model, X) <= 1e-9
+
+
+@pytest.mark.parametrize('missing_rate', [0.0, 0.1])
+def test_nan_rows_match_sklearn(missing_rate):
+    model, X = fit_forest(missing_rate)
+    flat = FlatForest.from_model(model)
+    X_missing = with_missing(np.nan_to_num(X))
+
+    assert np.isnan(X_missing).any(axis=1).all()
+    np.testing.assert_allclose(flat.predict_proba(X_missing), model.predict_proba(X_missing),
+                               atol=1e-9)
+    np.testing.assert_array_equal(flat.predict(X_missing), model.predict(X_missing))
+
+
+def test_single_row_matches_sklearn():
+    model, X = fit_forest(0.1)
+    flat = FlatForest.from_model(model)
+
+    for row in (X[:1], X[0], with_missing(np.nan_to_num(X[:1]))):
+        expected = model.predict_proba(np.atleast_2d(row))
+        actual = flat.predict_proba(row)
+        assert actual.shape == (1, 2)
+        np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+
+def test_saved_forest_keeps_parity(tmp_path):
+    model, X = fit_forest(0.1)
+    path = str(tmp_path / flat_forest.FLAT_FOREST_PATH)
+    FlatForest.from_model(model, version='v1').save(path)
+
+    loaded = FlatForest.load(path)
+    assert loaded.version == 'v1' and loaded.supports_missing
+    check_parity(loaded, model, X)
+
+
+def test_check_parity_detects_mismatch():
+    model, X = fit_forest()
+    other, _ = fit_forest(seed=1)
+
+    with pytest.raises(AssertionError):
+        check_parity(FlatForest.from_model(other), model, X)
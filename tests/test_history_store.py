@@ -0,0 +1,133 @@
+import threading
+
+import numpy as np
+import pytest
+
+import history_store
+
+
+def record(name):
+    return {'CandidateName': name, 'Timestamp': '2024-01-01 00:00:00', 'Prediction': 'DITERIMA',
+            'SkillScore': 5.0, 'InterviewScore': 50.0, 'PersonalityScore': 50.0,
+            'ExperienceYears': 2.0}
+
+
+def test_frame_does_not_duplicate_rows_appended_during_read(tmp_path, monkeypatch):
+    store = history_store.HistoryStore(str(tmp_path / 'riwayat.db'), legacy_csv=None)
+    store.append([record('a')])
+    assert len(store.frame()) == 1
+
+    # Append lain terjadi antara revision() dan SELECT di frame()
+    store.append([record('b')])
+    stale = store.revision()
+    store.append([record('c')])
+    with monkeypatch.context() as patch:
+        patch.setattr(store, 'revision', lambda: stale)
+        assert store.frame()['CandidateName'].tolist() == ['a', 'b']
+
+    assert store.frame()['CandidateName'].tolist() == ['a', 'b', 'c']
+    assert len(store.frame()) == store.count() == 3
+
+
+def test_full_reload_is_bounded_by_revision(tmp_path, monkeypatch):
+    store = history_store.HistoryStore(str(tmp_path / 'riwayat.db'), legacy_csv=None)
+    store.append([record('a')])
+    stale = store.revision()
+    store.append([record('b')])
+    with monkeypatch.context() as patch:
+        patch.setattr(store, 'revision', lambda: stale)
+        assert len(store.frame()) == 1
+    assert store.frame()['CandidateName'].tolist() == ['a', 'b']
+
+
+def test_stale_revision_does_not_rewind_frame(tmp_path, monkeypatch):
+    store = history_store.HistoryStore(str(tmp_path / 'riwayat.db'), legacy_csv=None)
+    store.append([record('a')])
+    stale = store.revision()
+    store.append([record('b'), record('c')])
+    assert store.frame()['CandidateName'].tolist() == ['a', 'b', 'c']
+
+    # Panggilan lambat dengan revisi lama selesai setelah frame yang lebih baru
+    with monkeypatch.context() as patch:
+        patch.setattr(store, 'revision', lambda: stale)
+        assert store.frame()['CandidateName'].tolist() == ['a', 'b', 'c']
+
+    assert store.frame()['CandidateName'].tolist() == ['a', 'b', 'c']
+    assert len(store.frame()) == store.count() == 3
+
+
+def test_concurrent_frames_match_count(tmp_path):
+    store = history_store.HistoryStore(str(tmp_path / 'riwayat.db'), legacy_csv=None)
+    names = [str(i) for i in range(200)]
+
+    def read():
+        for _ in range(50):
+            store.frame()
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for name in names:
+        store.append([record(name)])
+    for reader in readers:
+        reader.join()
+
+    assert store.frame()['CandidateName'].tolist() == names
+    assert store.count() == len(names)
+
+
+def paged_records(n):
+    rng = np.random.default_rng(0)
+    records = []
+    for i in range(n):
+        records.append({
+            'CandidateName': f'k{i}',
+            # Nilai kembar dan NULL (riwayat CSV lama) menguji tie-breaker dan bagian NULL
+            'Timestamp': None if i % 7 == 0 else f'2024-01-{1 + i % 5:02d} 00:00:00',
+            'Prediction': None if i % 11 == 0 else rng.choice(['DITERIMA', 'TIDAK DITERIMA']),
+            'SkillScore': float(i % 4), 'InterviewScore': 1.0, 'PersonalityScore': 1.0,
+            'ExperienceYears': 1.0,
+        })
+    return records
+
+
+@pytest.mark.parametrize('sort', list(history_store.SORT_KEYS))
+@pytest.mark.parametrize('prediction', [None, 'DITERIMA'])
+def test_keyset_pages_match_offset_pages(tmp_path, sort, prediction):
+    store = history_store.HistoryStore(str(tmp_path / 'riwayat.db'), legacy_csv=None)
+    store.append(paged_records(103))
+    size = 10
+    expected = store.query(prediction, sort)['CandidateName'].tolist()
+    n_pages = -(-store.count(prediction) // size)
+    pages = [expected[i:i + size] for i in range(0, len(expected), size)]
+
+    # Maju dari halaman pertama sampai terakhir
+    frame, first, last = store.page(prediction, sort, size)
+    forward = [frame['CandidateName'].tolist()]
+    for _ in range(n_pages - 1):
+        frame, first, last = store.page(prediction, sort, size, after=last)
+        forward.append(frame['CandidateName'].tolist())
+    assert forward == pages
+
+    # Mundur dari halaman terakhir sampai pertama
+    frame, first, last = store.page(prediction, sort, len(pages[-1]), last=True)
+    backward = [frame['CandidateName'].tolist()]
+    for _ in range(n_pages - 1):
+        frame, first, last = store.page(prediction, sort, size, before=first)
+        backward.append(frame['CandidateName'].tolist())
+    assert backward[::-1] == pages
+
+
+def test_count_cached_per_revision(tmp_path):
+    store = history_store.HistoryStore(str(tmp_path / 'riwayat.db'), legacy_csv=None)
+    assert store.count() == 0
+    store.append([record('a'), record('b')])
+    assert store.count() == store.count('DITERIMA') == 2
+
+    queries = []
+    store.conn.set_trace_callback(queries.append)
+    assert store.count('DITERIMA') == 2
+    assert not any('COUNT' in sql for sql in queries)
+
+    store.append([record('c')])
+    assert store.count('DITERIMA') == 3
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+import artifacts
+import incremental
+
+FEATURES = ['SkillScore', 'ExperienceYears', 'InterviewScore', 'PersonalityScore',
+            'EducationLevel_2', 'EducationLevel_3', 'RecruitmentStrategy_2']
+
+
+def make_data(n, rng, shift=0.0):
+    X = pd.DataFrame({
+        'SkillScore': rng.uniform(0, 100, n) + shift,
+        'ExperienceYears': rng.integers(0, 15, n).astype(float),
+        'InterviewScore': rng.uniform(0, 100, n) + shift,
+        'PersonalityScore': rng.uniform(0, 100, n),
+        'EducationLevel_2': rng.integers(0, 2, n),
+        'EducationLevel_3': rng.integers(0, 2, n),
+        'RecruitmentStrategy_2': rng.integers(0, 2, n),
+    })
+    y = pd.Series((X['SkillScore'] + X['InterviewScore'] + rng.normal(0, 20, n) > 100 + shift)
+                  .astype(int), name='label')
+    return X, y
+
+
+def test_grow_forest_keeps_old_tree_predictions():
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(0)
+    X, y = make_data(3000, rng)
+    pipeline = artifacts.build_pipeline(
+        FEATURES, model=RandomForestClassifier(n_estimators=30, random_state=42)).fit(X, y)
+    n_old = len(pipeline.named_steps['model'].estimators_)
+
+    def old_tree_proba():
+        X_scaled = pipeline[:-1].transform(X)
+        trees = pipeline.named_steps['model'].estimators_[:n_old]
+        return np.mean([tree.predict_proba(X_scaled) for tree in trees], axis=0)
+
+    before = old_tree_proba()
+    # Data baru dengan distribusi bergeser (statistik scaler akan berbeda)
+    X_new, y_new = make_data(500, rng, shift=15.0)
+    incremental.grow_forest(pipeline, X_new, y_new, n_new_trees=10)
+
+    assert len(pipeline.named_steps['model'].estimators_) == n_old + 10
+    np.testing.assert_array_equal(old_tree_proba(), before)
+
+
+def test_grown_out_of_fold_proba_leaves_pipeline_untouched():
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(1)
+    X, y = make_data(1000, rng)
+    pipeline = artifacts.build_pipeline(
+        FEATURES, model=RandomForestClassifier(n_estimators=10, random_state=42)).fit(X, y)
+    X_new, y_new = make_data(200, rng, shift=15.0)
+
+    proba = incremental.grown_out_of_fold_proba(pipeline, X_new, y_new, n_new_trees=5)
+
+    assert proba.shape == (len(X_new),)
+    assert np.all((proba >= 0) & (proba <= 1))
+    assert len(pipeline.named_steps['model'].estimators_) == 10
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+
+import service
+
+VALID = {'SkillScore': 7, 'InterviewScore': 60, 'PersonalityScore': 55, 'ExperienceYears': 3,
+         'EducationLevel': 2, 'RecruitmentStrategy': 1}
+
+
+def handle(body):
+    server = service.ScoringServer(bundle=None)
+    return asyncio.run(server.handle('POST', '/predict/batch', json.dumps(body).encode()))
+
+
+def test_valid_record_passes():
+    service.validate_records([VALID, dict(VALID, EducationLevel=4.0, SkillScore="7.5")])
+
+
+@pytest.mark.parametrize('field, value', [
+    ('SkillScore', 'abc'),
+    ('InterviewScore', None),
+    ('PersonalityScore', True),
+    ('ExperienceYears', 'NaN'),
+    ('SkillScore', 'inf'),
+])
+def test_non_numeric_value_rejected(field, value):
+    with pytest.raises(ValueError, match=field):
+        service.validate_records([dict(VALID, **{field: value})])
+
+
+@pytest.mark.parametrize('field, value', [
+    ('EducationLevel', 9),
+    ('EducationLevel', 0),
+    ('EducationLevel', 2.5),
+    ('EducationLevel', 'S1'),
+    ('RecruitmentStrategy', 4),
+])
+def test_out_of_range_category_rejected(field, value):
+    with pytest.raises(ValueError, match=field):
+        service.validate_records([dict(VALID, **{field: value})])
+
+
+def test_invalid_record_returns_400_before_batching():
+    status, payload = handle([VALID, dict(VALID, SkillScore='abc')])
+    assert status == 400
+    assert 'Kandidat ke-2' in payload['error']
+
+    status, payload = handle({'candidates': [dict(VALID, EducationLevel=9)]})
+    assert status == 400
+    assert 'EducationLevel' in payload['error']
+
+
+def test_prediction_label_follows_calibrated_probability():
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    import artifacts
+    import calibration
+
+    pipeline = SimpleNamespace(named_steps={'model': SimpleNamespace(classes_=np.array([0, 1]))})
+    # Calibrator menggeser probabilitas turun: mentah 0.6 -> di bawah 0.5
+    calibrator = calibration.Calibrator('sigmoid', {'coef': 1.0, 'intercept': -1.0})
+    bundle = artifacts.ModelBundle(pipeline, 'v1', None, None, calibrator=calibrator)
+    proba = np.array([[0.4, 0.6], [0.05, 0.95]])
+
+    results = service.format_results(bundle, [{'CandidateName': 'a'}, {'CandidateName': 'b'}],
+                                     proba)
+
+    for result in results:
+        accepted = result['Probability'] >= calibration.DECISION_THRESHOLD
+        assert result['Prediction'] == ("DITERIMA" if accepted else "TIDAK DITERIMA")
+    assert [r['Prediction'] for r in results] == ["TIDAK DITERIMA", "DITERIMA"]
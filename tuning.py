@@ -0,0 +1,194 @@
+"""Hyperparameter search paralel dan bisa dilanjutkan untuk retrain.py.
+
+Ruang pencarian diambil dari Hypertuning.ipynb (RandomizedSearchCV, skor F1,
+StratifiedKFold 5 fold). Kandidat dievaluasi dengan successive halving:
+rung pertama memakai subsampel kecil data, hanya 1/``factor`` kandidat
+terbaik yang naik ke rung berikutnya dengan data ``factor`` kali lebih
+banyak, rung terakhir memakai seluruh data. Setiap pasangan (kandidat, rung,
+fold) dijalankan di process pool dan skornya ditulis ke cache di disk,
+sehingga pencarian yang terputus dilanjutkan tanpa mengulang fold yang
+sudah selesai. SMOTE (opsional, butuh ``imbalanced-learn``) hanya diterapkan
+ke data latih tiap fold.
+"""
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from encoder import FeatureEncoder
+
+# Ruang pencarian dari Hypertuning.ipynb
+SEARCH_SPACES = {
+    'rf': (RandomForestClassifier(random_state=42, n_jobs=1), {
+        'n_estimators': [100, 200, 300, 400],
+        'max_depth': [None, 5, 10, 20, 30],
+        'min_samples_split': [2, 5, 10],
+        'min_samples_leaf': [1, 2, 4],
+    }),
+    'svc': (SVC(probability=True, random_state=42), {
+        'C': [0.1, 1, 10, 100],
+        'kernel': ['linear', 'rbf', 'poly'],
+        'gamma': ['scale', 'auto'],
+    }),
+    'knn': (KNeighborsClassifier(), {
+        'n_neighbors': [3, 5, 7, 9, 11],
+        'weights': ['uniform', 'distance'],
+        'p': [1, 2],
+    }),
+}
+
+N_SPLITS = 5
+RANDOM_STATE = 42
+
+_worker_data = {}
+
+
+def data_hash(X, y):
+    digest = hashlib.sha256(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def candidate_key(model_name, params):
+    return f"{model_name}:{json.dumps(params, sort_keys=True)}"
+
+
+def sample_candidates(models, n_candidates):
+    """Kandidat acak (model, params) merata dari ruang pencarian tiap model."""
+    candidates = []
+    per_model = max(1, n_candidates // len(models))
+    for model_name in models:
+        _, space = SEARCH_SPACES[model_name]
+        for params in ParameterSampler(space, per_model, random_state=RANDOM_STATE):
+            candidates.append((model_name, params))
+    # Ruang pencarian kecil bisa menghasilkan kandidat kembar
+    return list({candidate_key(*c): c for c in candidates}.values())
+
+
+def build_estimator(model_name, params):
+    return clone(SEARCH_SPACES[model_name][0]).set_params(**params)
+
+
+class SearchCache:
+    """Cache fold split dan skor CV per (kandidat, rung, fold) di satu direktori."""
+
+    def __init__(self, cache_dir, data_key):
+        self.cache_dir = cache_dir
+        self.data_key = data_key
+        os.makedirs(cache_dir, exist_ok=True)
+        self.scores_path = os.path.join(cache_dir, f"scores_{data_key}.jsonl")
+        self.scores = {}
+        if os.path.exists(self.scores_path):
+            with open(self.scores_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # baris terakhir bisa terpotong jika proses dihentikan
+                    self.scores[(entry['candidate'], entry['rung'], entry['fold'])] = entry['score']
+
+    def splits(self, y, rung, n_samples):
+        """Indeks subsampel + fold StratifiedKFold untuk satu rung (dibuat sekali)."""
+        path = os.path.join(self.cache_dir, f"folds_{self.data_key}_r{rung}.joblib")
+        if os.path.exists(path):
+            return joblib.load(path)
+
+        rng = np.random.default_rng(RANDOM_STATE + rung)
+        if n_samples < len(y):
+            # Subsampel bertingkat agar proporsi kelas tetap
+            subset = np.concatenate([
+                rng.choice(idx, max(N_SPLITS, round(len(idx) * n_samples / len(y))), replace=False)
+                for idx in (np.flatnonzero(y == label) for label in np.unique(y))
+            ])
+        else:
+            subset = np.arange(len(y))
+        folds = list(StratifiedKFold(N_SPLITS, shuffle=True, random_state=RANDOM_STATE)
+                     .split(subset, y[subset]))
+        splits = [(subset[train], subset[test]) for train, test in folds]
+        joblib.dump(splits, path)
+        return splits
+
+    def add(self, candidate, rung, fold, score):
+        self.scores[(candidate, rung, fold)] = score
+        with open(self.scores_path, 'a') as f:
+            f.write(json.dumps({'candidate': candidate, 'rung': rung, 'fold': fold,
+                                'score': score}) + '\n')
+
+
+def _init_worker(X, y, smote):
+    _worker_data.update(X=X, y=y, smote=smote)
+
+
+def _fit_fold(model_name, params, train_idx, test_idx):
+    X, y = _worker_data['X'], _worker_data['y']
+    scaler = StandardScaler().fit(X[train_idx])
+    X_train, y_train = scaler.transform(X[train_idx]), y[train_idx]
+    if _worker_data['smote']:
+        from imblearn.over_sampling import SMOTE
+        X_train, y_train = SMOTE(random_state=RANDOM_STATE).fit_resample(X_train, y_train)
+    estimator = build_estimator(model_name, params).fit(X_train, y_train)
+    return float(f1_score(y[test_idx], estimator.predict(scaler.transform(X[test_idx]))))
+
+
+def search(X_raw, y, feature_names, models=('rf',), n_candidates=30, factor=3,
+           min_samples=None, workers=None, cache_dir='model/search_cache', smote=False,
+           log=print):
+    """Jalankan successive halving; kembalikan (model_name, params, skor F1 rata-rata)."""
+    if smote:
+        try:
+            import imblearn  # noqa: F401
+        except ImportError:
+            raise ImportError("Opsi SMOTE membutuhkan paket imbalanced-learn") from None
+
+    X = FeatureEncoder(list(feature_names)).fit().transform(X_raw)
+    y = np.asarray(y)
+    cache = SearchCache(cache_dir, data_hash(X, y) + ('-smote' if smote else ''))
+
+    candidates = sample_candidates(models, n_candidates)
+    n_rungs = max(1, math.ceil(math.log(len(candidates), factor)))
+    min_samples = min_samples or max(N_SPLITS * 20, len(y) // factor ** (n_rungs - 1))
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(X, y, smote)) as pool:
+        for rung in range(n_rungs):
+            n_samples = len(y) if rung == n_rungs - 1 else min(len(y), min_samples * factor ** rung)
+            splits = cache.splits(y, rung, n_samples)
+
+            jobs = {}
+            for model_name, params in candidates:
+                key = candidate_key(model_name, params)
+                for fold, (train_idx, test_idx) in enumerate(splits):
+                    if (key, rung, fold) not in cache.scores:
+                        future = pool.submit(_fit_fold, model_name, params, train_idx, test_idx)
+                        jobs[future] = (key, fold)
+            log(f"rung {rung + 1}/{n_rungs}: {len(candidates)} kandidat, {n_samples:,} baris, "
+                f"{len(jobs)} fold baru ({len(candidates) * N_SPLITS - len(jobs)} dari cache)")
+
+            for future in as_completed(jobs):
+                key, fold = jobs[future]
+                cache.add(key, rung, fold, future.result())
+
+            ranked = sorted(
+                candidates,
+                key=lambda c: np.mean([cache.scores[(candidate_key(*c), rung, fold)]
+                                       for fold in range(N_SPLITS)]),
+                reverse=True)
+            if rung < n_rungs - 1:
+                candidates = ranked[:max(1, math.ceil(len(ranked) / factor))]
+            else:
+                candidates = ranked
+
+    model_name, params = candidates[0]
+    best_score = np.mean([cache.scores[(candidate_key(model_name, params), n_rungs - 1, fold)]
+                          for fold in range(N_SPLITS)])
+    return model_name, params, float(best_score)